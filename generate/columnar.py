@@ -0,0 +1,867 @@
+"""
+Columnar data layout for generated dashboards
+Dictionary-encodes repeated issue fields so the browser can hold them in typed arrays
+"""
+
+import hashlib
+import json
+import re
+
+from issue_views import ISSUE_VIEWS_JS
+from search_index import TRIGRAM_JS
+
+# Fields stored as integer codes into a per-field dictionary table
+# ('file' is coded too, but against the path trie instead of a flat table)
+DICTIONARY_FIELDS = ('severity', 'id')
+
+# Fields stored as plain integer columns (0 means "not set")
+NUMERIC_FIELDS = ('line', 'column')
+
+# Fields that never end up in the per-issue "extras" side table
+CORE_FIELDS = set(DICTIONARY_FIELDS) | set(NUMERIC_FIELDS) | {'file', 'message', 'code_context'}
+
+# Parameter slots inside cppcheck messages: quoted names, standalone numbers and
+# a trailing value after ": " (e.g. "Uninitialized variable: x")
+PARAM_RE = re.compile(r"'([^']*)'|\b(\d+)\b|(?<=: )(\S+)$")
+
+# Rows per encoded block; blocks are the unit of embedding and streaming
+BLOCK_SIZE = 5000
+
+FORMAT_VERSION = 1
+
+
+def to_int(value):
+    """Convert a line/column value (int or numeric string) to int, 0 if unusable"""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def split_message(message):
+    """Split a message into literal segments and the parameter values between them
+
+    ''.join(s + p for s, p in zip(segments, params)) + segments[-1] == message
+    """
+    segments = []
+    params = []
+    pos = 0
+    for match in PARAM_RE.finditer(message):
+        start, end = match.span(match.lastindex)
+        segments.append(message[pos:start])
+        params.append(match.group(match.lastindex))
+        pos = end
+    segments.append(message[pos:])
+    return segments, params
+
+
+def fill_template(segments, params):
+    """Inverse of split_message"""
+    parts = [segments[0]]
+    for param, segment in zip(params, segments[1:]):
+        parts.append(param)
+        parts.append(segment)
+    return ''.join(parts)
+
+
+def script_json(value):
+    """Serialize value as JSON that is safe to embed inside a <script> element"""
+    return json.dumps(value, separators=(',', ':')).replace('<', '\\u003c')
+
+
+def content_hash(*parts):
+    """Short SHA-256 digest of the data a page decodes, used as its cache key"""
+    digest = hashlib.sha256()
+    for part in parts:
+        data = part.encode('utf-8')
+        digest.update(len(data).to_bytes(8, 'little'))
+        digest.update(data)
+    return digest.hexdigest()[:32]
+
+
+class PathTrie:
+    """File paths stored as a prefix trie of parallel parent-index and segment lists
+
+    A node's path is its ancestors' segments joined with '/'. Parents always get
+    lower indices than their children, so one forward pass rebuilds every path
+    and one backward pass rolls counts up into directories.
+    """
+
+    def __init__(self):
+        self.parents = []
+        self.segments = []
+        self._children = {}
+
+    def add(self, path):
+        """Insert path and return the node id of its last segment"""
+        node = -1
+        for segment in path.split('/'):
+            child = self._children.get((node, segment))
+            if child is None:
+                child = self._children[(node, segment)] = len(self.segments)
+                self.parents.append(node)
+                self.segments.append(segment)
+            node = child
+        return node
+
+    def paths(self):
+        """Full path of every node, indexed by node id"""
+        paths = []
+        for parent, segment in zip(self.parents, self.segments):
+            paths.append(segment if parent < 0 else paths[parent] + '/' + segment)
+        return paths
+
+    def rollup(self, counts):
+        """Add per-node counts into every ancestor directory"""
+        totals = list(counts) + [0] * (len(self.parents) - len(counts))
+        for node in range(len(self.parents) - 1, -1, -1):
+            parent = self.parents[node]
+            if parent >= 0:
+                totals[parent] += totals[node]
+        return totals
+
+    def to_json(self):
+        return {'parent': self.parents, 'segment': self.segments}
+
+    @classmethod
+    def from_json(cls, data):
+        trie = cls()
+        trie.parents = list(data['parent'])
+        trie.segments = list(data['segment'])
+        return trie
+
+
+class ColumnarIssues:
+    """Dictionary-encoded, column-oriented view of a list of issues"""
+
+    def __init__(self, issues):
+        self.count = len(issues)
+        self.paths = PathTrie()
+        self.dicts = {field: [] for field in DICTIONARY_FIELDS}
+        self.codes = {field: [] for field in ('file',) + DICTIONARY_FIELDS}
+        self.numbers = {field: [] for field in NUMERIC_FIELDS}
+        self.templates = []
+        self.template_codes = []
+        self.params = []
+        self.extras = []
+
+        lookup = {field: {} for field in DICTIONARY_FIELDS}
+        # Identical messages are split once; templates are shared across
+        # issues (and check ids) with the same literal text
+        template_lookup = {}
+        message_memo = {}
+        for row, issue in enumerate(issues):
+            self.codes['file'].append(self.paths.add(str(issue.get('file') or '')))
+            for field in DICTIONARY_FIELDS:
+                value = str(issue.get(field) or '')
+                code = lookup[field].get(value)
+                if code is None:
+                    code = lookup[field][value] = len(self.dicts[field])
+                    self.dicts[field].append(value)
+                self.codes[field].append(code)
+
+            for field in NUMERIC_FIELDS:
+                self.numbers[field].append(to_int(issue.get(field)))
+
+            message = issue.get('message') or ''
+            encoded = message_memo.get(message)
+            if encoded is None:
+                segments, params = split_message(message)
+                template = template_lookup.get(tuple(segments))
+                if template is None:
+                    template = template_lookup[tuple(segments)] = len(self.templates)
+                    self.templates.append(segments)
+                encoded = message_memo[message] = (template, params)
+            self.template_codes.append(encoded[0])
+            self.params.append(encoded[1])
+
+            extra = {k: v for k, v in issue.items() if k not in CORE_FIELDS}
+            if extra:
+                self.extras.append([row, extra])
+
+    def header(self):
+        """Dictionary tables and sizes; must be decoded before any block"""
+        return {
+            'format': 'columnar',
+            'version': FORMAT_VERSION,
+            'count': self.count,
+            'paths': self.paths.to_json(),
+            'dicts': self.dicts,
+            'templates': self.templates
+        }
+
+    def blocks(self, block_size=BLOCK_SIZE):
+        """Yield the rows as consecutive column blocks of at most block_size rows"""
+        extra_pos = 0
+        for start in range(0, self.count, block_size):
+            end = min(self.count, start + block_size)
+            block = {'start': start}
+            for field in ('file',) + DICTIONARY_FIELDS:
+                block[field] = self.codes[field][start:end]
+            for field in NUMERIC_FIELDS:
+                block[field] = self.numbers[field][start:end]
+            block['template'] = self.template_codes[start:end]
+            block['params'] = self.params[start:end]
+
+            extras = []
+            while extra_pos < len(self.extras) and self.extras[extra_pos][0] < end:
+                extras.append(self.extras[extra_pos])
+                extra_pos += 1
+            if extras:
+                block['extras'] = extras
+
+            yield block
+
+    def lines(self, block_size=BLOCK_SIZE):
+        """Header followed by blocks, one JSON document per line"""
+        yield script_json(self.header())
+        for block in self.blocks(block_size):
+            yield script_json(block)
+
+
+def decode_lines(lines):
+    """Rebuild plain issue dicts from columnar lines (inverse of ColumnarIssues.lines)"""
+    lines = iter(lines)
+    header = json.loads(next(lines))
+    dicts = header['dicts']
+    file_paths = PathTrie.from_json(header['paths']).paths()
+    templates = header['templates']
+    for line in lines:
+        if not line.strip():
+            continue
+        block = json.loads(line)
+        extras = dict((row, extra) for row, extra in block.get('extras', []))
+        for i in range(len(block['file'])):
+            issue = dict(extras.get(block['start'] + i, {}))
+            issue['file'] = file_paths[block['file'][i]]
+            issue['line'] = block['line'][i]
+            if block['column'][i]:
+                issue['column'] = block['column'][i]
+            issue['severity'] = dicts['severity'][block['severity'][i]]
+            issue['message'] = fill_template(templates[block['template'][i]], block['params'][i])
+            issue['id'] = dicts['id'][block['id'][i]]
+            yield issue
+
+
+def load_issues(path):
+    """Issues from an analysis JSON file or a columnar dashboard issues.jsonl
+    (messages rebuilt from their templates)"""
+    with open(path) as f:
+        if path.endswith('.jsonl'):
+            return list(decode_lines(f))
+        return json.load(f).get('issues', [])
+
+
+# Browser-side counterparts of PathTrie and ColumnarIssues. Plain strings (not
+# f-strings) so they can be dropped into the generators' f-string templates.
+PATH_TRIE_JS = """
+        // Path trie: rebuild every node's full path in one forward pass
+        function decodePathTrie(trie) {
+            const paths = new Array(trie.segment.length);
+            for (let node = 0; node < paths.length; node++) {
+                const parent = trie.parent[node];
+                paths[node] = parent < 0 ? trie.segment[node] : paths[parent] + '/' + trie.segment[node];
+            }
+            return paths;
+        }
+
+        // Roll per-node counts up into every ancestor directory (children
+        // always come after their parent, so one backward pass is enough)
+        function rollupPathCounts(trie, counts) {
+            const totals = Uint32Array.from(counts);
+            for (let node = totals.length - 1; node >= 0; node--) {
+                const parent = trie.parent[node];
+                if (parent >= 0) totals[parent] += totals[node];
+            }
+            return totals;
+        }
+"""
+
+# Row offsets for the variable-height virtual scrollers (page only; the filter
+# worker never lays out rows)
+HEIGHT_INDEX_JS = """
+        // Fenwick tree over the pixel heights of a row list: offset of a
+        // position and position at an offset in O(log n), single-row height
+        // updates in O(log n). Positions past length hold height 0.
+        class HeightIndex {
+            constructor() {
+                this.length = 0;
+                this.values = new Float64Array(0);
+                this.tree = new Float64Array(1);
+            }
+
+            // Start over with count positions, heightOf(position) each; the
+            // tree is rebuilt, never added to, so no old sums survive
+            reset(count, heightOf) {
+                this.values = new Float64Array(Math.max(count, 1));
+                for (let i = 0; i < count; i++) this.values[i] = heightOf(i);
+                this.length = count;
+                this.build();
+            }
+
+            // Grow to count positions; only the new ones call heightOf
+            append(count, heightOf) {
+                const start = this.length;
+                if (count > this.values.length) {
+                    const values = new Float64Array(Math.max(count, this.values.length * 2));
+                    values.set(this.values.subarray(0, start));
+                    this.values = values;
+                    for (let i = start; i < count; i++) values[i] = heightOf(i);
+                    this.length = count;
+                    this.build();
+                    return;
+                }
+                if (this.tree.length !== this.values.length + 1) this.build();
+                for (let i = start; i < count; i++) {
+                    this.values[i] = heightOf(i);
+                    this.add(i, this.values[i]);
+                }
+                this.length = Math.max(count, start);
+            }
+
+            // O(n) construction: each node hands its sum to its parent
+            build() {
+                const tree = new Float64Array(this.values.length + 1);
+                for (let i = 1; i < tree.length; i++) {
+                    tree[i] += this.values[i - 1];
+                    const parent = i + (i & -i);
+                    if (parent < tree.length) tree[parent] += tree[i];
+                }
+                this.tree = tree;
+            }
+
+            add(position, delta) {
+                for (let i = position + 1; i < this.tree.length; i += i & -i) this.tree[i] += delta;
+            }
+
+            set(position, height) {
+                const delta = height - this.values[position];
+                if (delta === 0) return;
+                this.values[position] = height;
+                this.add(position, delta);
+            }
+
+            // Total height of positions before position
+            offsetOf(position) {
+                let sum = 0;
+                for (let i = Math.min(position, this.length); i > 0; i -= i & -i) sum += this.tree[i];
+                return sum;
+            }
+
+            total() {
+                return this.offsetOf(this.length);
+            }
+
+            // Position whose rows span offset (clamped to the last position)
+            indexAt(offset) {
+                let position = 0;
+                let step = 1;
+                while (step * 2 < this.tree.length) step *= 2;
+                for (; step > 0; step >>= 1) {
+                    const next = position + step;
+                    if (next < this.tree.length && this.tree[next] <= offset) {
+                        position = next;
+                        offset -= this.tree[next];
+                    }
+                }
+                return Math.max(0, Math.min(position, this.length - 1));
+            }
+        }
+"""
+
+# IndexedDB cache of decoded dashboard data (page only). Bumping
+# DATA_CACHE_VERSION drops every entry, e.g. when IssueStore.snapshot() changes.
+DATA_CACHE_JS = """
+        const DATA_CACHE_VERSION = 1;
+        const DATA_CACHE_MAX_BYTES = 512 * 1024 * 1024;
+        const DATA_CACHE_MAX_AGE_MS = 30 * 24 * 60 * 60 * 1000;
+
+        // Decoded dashboard data in IndexedDB, keyed by the content hash the
+        // generator stamps into the page. Expired entries are dropped, then
+        // least recently used ones until the (approximate) total fits in
+        // DATA_CACHE_MAX_BYTES. Any failure (no IndexedDB, private mode,
+        // quota) just means "not cached".
+        class DataCache {
+            constructor(name = 'cppcheck-studio-dashboard') {
+                this.name = name;
+                this.db = null;
+            }
+
+            open() {
+                if (!this.db) {
+                    this.db = new Promise((resolve, reject) => {
+                        const request = indexedDB.open(this.name, DATA_CACHE_VERSION);
+                        request.onupgradeneeded = () => {
+                            const db = request.result;
+                            Array.from(db.objectStoreNames).forEach(name => db.deleteObjectStore(name));
+                            db.createObjectStore('data');
+                            db.createObjectStore('meta');
+                        };
+                        request.onsuccess = () => resolve(request.result);
+                        request.onerror = () => reject(request.error);
+                        request.onblocked = () => reject(new Error('cache upgrade blocked by another tab'));
+                    });
+                }
+                return this.db;
+            }
+
+            // Cached value for hash, or null
+            async get(hash) {
+                if (!hash) return null;
+                try {
+                    const db = await this.open();
+                    const tx = db.transaction(['data', 'meta'], 'readwrite');
+                    const data = tx.objectStore('data');
+                    const meta = tx.objectStore('meta');
+                    const [value, entry] = await Promise.all([idbRequest(data.get(hash)), idbRequest(meta.get(hash))]);
+                    if (value === undefined || !entry) return null;
+                    const now = Date.now();
+                    if (now - entry.storedAt > DATA_CACHE_MAX_AGE_MS) {
+                        data.delete(hash);
+                        meta.delete(hash);
+                        return null;
+                    }
+                    entry.usedAt = now;
+                    meta.put(entry, hash);
+                    return value;
+                } catch (error) {
+                    console.warn('Dashboard cache unavailable:', error);
+                    return null;
+                }
+            }
+
+            // Store value (about size bytes) under hash, evicting to make room
+            async put(hash, value, size) {
+                if (!hash || size > DATA_CACHE_MAX_BYTES) return false;
+                try {
+                    const db = await this.open();
+                    const tx = db.transaction(['data', 'meta'], 'readwrite');
+                    const data = tx.objectStore('data');
+                    const meta = tx.objectStore('meta');
+                    const entries = [];
+                    await new Promise((resolve, reject) => {
+                        const cursor = meta.openCursor();
+                        cursor.onsuccess = () => {
+                            const current = cursor.result;
+                            if (!current) return resolve();
+                            if (current.key !== hash) entries.push(Object.assign({ hash: current.key }, current.value));
+                            current.continue();
+                        };
+                        cursor.onerror = () => reject(cursor.error);
+                    });
+
+                    const now = Date.now();
+                    let total = entries.reduce((sum, entry) => sum + entry.size, size);
+                    entries.sort((a, b) => a.usedAt - b.usedAt).forEach(entry => {
+                        if (now - entry.storedAt > DATA_CACHE_MAX_AGE_MS || total > DATA_CACHE_MAX_BYTES) {
+                            data.delete(entry.hash);
+                            meta.delete(entry.hash);
+                            total -= entry.size;
+                        }
+                    });
+                    data.put(value, hash);
+                    meta.put({ size, storedAt: now, usedAt: now }, hash);
+                    await new Promise((resolve, reject) => {
+                        tx.oncomplete = () => resolve();
+                        tx.onerror = tx.onabort = () => reject(tx.error);
+                    });
+                    return true;
+                } catch (error) {
+                    console.warn('Could not cache dashboard data:', error);
+                    return false;
+                }
+            }
+        }
+
+        function idbRequest(request) {
+            return new Promise((resolve, reject) => {
+                request.onsuccess = () => resolve(request.result);
+                request.onerror = () => reject(request.error);
+            });
+        }
+"""
+
+COLUMNAR_JS = PATH_TRIE_JS + ISSUE_VIEWS_JS + TRIGRAM_JS + """
+        // Columnar issue store: dictionary tables + typed-array code columns
+        function codeArrayType(dictSize) {
+            if (dictSize <= 0x100) return Uint8Array;
+            if (dictSize <= 0x10000) return Uint16Array;
+            return Uint32Array;
+        }
+
+        class IssueStore {
+            constructor(header) {
+                const size = header.count;
+                this.size = size;
+                this.count = 0;
+                this.paths = header.paths;
+                this.filePaths = decodePathTrie(header.paths);
+                this.dicts = header.dicts;
+                this.templates = header.templates;
+                this.fileCodes = new (codeArrayType(this.filePaths.length))(size);
+                this.severityCodes = new (codeArrayType(header.dicts.severity.length))(size);
+                this.idCodes = new (codeArrayType(header.dicts.id.length))(size);
+                this.lines = new Uint32Array(size);
+                this.columns = new Uint32Array(size);
+                this.templateCodes = new (codeArrayType(header.templates.length))(size);
+                this.params = new Array(size);
+                this.messageCache = new Map();
+                this.extras = new Map();
+                this.searchIndex = null;
+            }
+
+            // Decoded columns as a structured-cloneable object, for IndexedDB
+            // and for handing a loaded store to the filter worker
+            snapshot() {
+                return {
+                    header: { count: this.size, paths: this.paths, dicts: this.dicts, templates: this.templates },
+                    count: this.count,
+                    fileCodes: this.fileCodes,
+                    severityCodes: this.severityCodes,
+                    idCodes: this.idCodes,
+                    lines: this.lines,
+                    columns: this.columns,
+                    templateCodes: this.templateCodes,
+                    params: this.params,
+                    extras: this.extras
+                };
+            }
+
+            static fromSnapshot(snapshot) {
+                const store = new IssueStore(snapshot.header);
+                ['fileCodes', 'severityCodes', 'idCodes', 'lines', 'columns', 'templateCodes', 'params', 'extras']
+                    .forEach(name => { store[name] = snapshot[name]; });
+                store.count = snapshot.count;
+                return store;
+            }
+
+            appendBlock(block) {
+                const start = block.start;
+                const length = block.file.length;
+                this.fileCodes.set(block.file, start);
+                this.severityCodes.set(block.severity, start);
+                this.idCodes.set(block.id, start);
+                this.lines.set(block.line, start);
+                this.columns.set(block.column, start);
+                this.templateCodes.set(block.template, start);
+                for (let i = 0; i < length; i++) {
+                    this.params[start + i] = block.params[i];
+                }
+                (block.extras || []).forEach(([row, extra]) => this.extras.set(row, extra));
+                this.count = Math.max(this.count, start + length);
+            }
+
+            file(row) { return this.filePaths[this.fileCodes[row]]; }
+            severity(row) { return this.dicts.severity[this.severityCodes[row]]; }
+            id(row) { return this.dicts.id[this.idCodes[row]]; }
+            line(row) { return this.lines[row]; }
+            // Message text is rebuilt from its template on display; recently
+            // rendered rows are memoized so scrolling back and forth stays cheap
+            message(row) {
+                let text = this.messageCache.get(row);
+                if (text === undefined) {
+                    if (this.messageCache.size >= 4096) this.messageCache.clear();
+                    text = fillTemplate(this.templates[this.templateCodes[row]], this.params[row]);
+                    this.messageCache.set(row, text);
+                }
+                return text;
+            }
+
+            // Materialize one row as a plain issue object (details modal, export)
+            issue(row) {
+                const issue = Object.assign({}, this.extras.get(row) || {});
+                issue.file = this.file(row);
+                issue.line = this.lines[row];
+                if (this.columns[row]) issue.column = this.columns[row];
+                issue.severity = this.severity(row);
+                issue.message = this.message(row);
+                issue.id = this.id(row);
+                return issue;
+            }
+
+            // Row indices matching a severity and a lower-cased search term.
+            // Files and ids are matched once per dictionary entry, not once per row.
+            filter(severity, term) {
+                const filter = this.prepareFilter(severity, term);
+                const rows = new Uint32Array(this.count);
+                return rows.subarray(0, this.filterRows(filter, 0, this.count, rows, 0));
+            }
+
+            // With a trigram index, candidate rows are checked directly and the
+            // per-dictionary scans are skipped
+            prepareFilter(severity, term) {
+                const severityCode = severity === 'all' ? -1 : this.dicts.severity.indexOf(severity);
+                const candidates = term && this.searchIndex ? this.searchIndex.candidates(term) : null;
+                const scan = term && !candidates;
+                return {
+                    empty: severity !== 'all' && severityCode < 0,
+                    severityCode,
+                    term,
+                    candidates,
+                    fileHits: scan ? matchDictionary(this.filePaths, term) : null,
+                    idHits: scan ? matchDictionary(this.dicts.id, term) : null,
+                    templateHits: scan ? matchTemplates(this.templates, term) : null
+                };
+            }
+
+            // Append matching rows in [start, end) to rows from position n;
+            // returns the new length so large scans can be split into chunks
+            filterRows(filter, start, end, rows, n) {
+                if (filter.empty) return n;
+                const candidates = filter.candidates;
+
+                if (candidates) {
+                    let lo = 0, hi = candidates.length;
+                    while (lo < hi) {
+                        const mid = (lo + hi) >>> 1;
+                        if (candidates[mid] < start) lo = mid + 1; else hi = mid;
+                    }
+                    for (let i = lo; i < candidates.length && candidates[i] < end; i++) {
+                        const row = candidates[i];
+                        if (filter.severityCode >= 0 && this.severityCodes[row] !== filter.severityCode) continue;
+                        if (this.textMatches(row, filter.term)) rows[n++] = row;
+                    }
+                    return n;
+                }
+
+                for (let row = start; row < end; row++) {
+                    if (this.rowMatches(filter, row)) rows[n++] = row;
+                }
+                return n;
+            }
+
+            rowMatches(filter, row) {
+                const { severityCode, term, fileHits, idHits, templateHits } = filter;
+                if (severityCode >= 0 && this.severityCodes[row] !== severityCode) return false;
+                return !term || fileHits[this.fileCodes[row]] === 1 || idHits[this.idCodes[row]] === 1 ||
+                    templateHits[this.templateCodes[row]] === 1 || this.paramsMatch(row, term);
+            }
+
+            textMatches(row, term) {
+                return this.file(row).toLowerCase().includes(term) ||
+                    this.id(row).toLowerCase().includes(term) ||
+                    fillTemplate(this.templates[this.templateCodes[row]], this.params[row]).toLowerCase().includes(term);
+            }
+
+            // Only rows with parameters can match outside their template's literal text
+            paramsMatch(row, term) {
+                const params = this.params[row];
+                if (params.length === 0) return false;
+                const text = fillTemplate(this.templates[this.templateCodes[row]], params);
+                return text.toLowerCase().includes(term);
+            }
+        }
+
+        function fillTemplate(segments, params) {
+            let text = segments[0];
+            for (let i = 0; i < params.length; i++) {
+                text += params[i] + segments[i + 1];
+            }
+            return text;
+        }
+
+        // A template matches when any literal segment contains the term
+        function matchTemplates(templates, term) {
+            const hits = new Uint8Array(templates.length);
+            for (let i = 0; i < templates.length; i++) {
+                if (templates[i].some(segment => segment.toLowerCase().includes(term))) hits[i] = 1;
+            }
+            return hits;
+        }
+
+        function matchDictionary(values, term) {
+            const hits = new Uint8Array(values.length);
+            for (let i = 0; i < values.length; i++) {
+                if (values[i].toLowerCase().includes(term)) hits[i] = 1;
+            }
+            return hits;
+        }
+
+        // Build a store from header + block lines (JSONL or embedded)
+        function decodeColumnarLines(lines) {
+            const store = new IssueStore(JSON.parse(lines[0]));
+            for (let i = 1; i < lines.length; i++) {
+                store.appendBlock(JSON.parse(lines[i]));
+            }
+            return store;
+        }
+
+        // Call onLine for each complete line of a fetch() response as the body
+        // streams in (whole-body fallback where streams are unavailable)
+        async function readLines(response, onLine) {
+            if (!response.body || typeof TextDecoder === 'undefined') {
+                (await response.text()).split('\\n').forEach(line => onLine(line));
+                return;
+            }
+            const reader = response.body.getReader();
+            const decoder = new TextDecoder();
+            let pending = '';
+            for (;;) {
+                const { done, value } = await reader.read();
+                pending += done ? decoder.decode() : decoder.decode(value, { stream: true });
+                const lines = pending.split('\\n');
+                pending = lines.pop();
+                lines.forEach(line => onLine(line));
+                if (done) break;
+            }
+            if (pending) onLine(pending);
+        }
+
+        // Non-blank lines of a large text, cut out about chunkChars at a time
+        // in processInSlices() steps; one split() of the whole text would be
+        // a single long task
+        async function splitLinesInSlices(text, chunkChars = 1 << 20) {
+            const lines = [];
+            let start = 0;
+            let newline = -1;
+            await processInSlices(Math.ceil(text.length / chunkChars), step => {
+                const end = Math.min(text.length, (step + 1) * chunkChars);
+                while (start < end) {
+                    if (newline < start) {
+                        newline = text.indexOf('\\n', start);
+                        if (newline === -1) newline = text.length;
+                    }
+                    // A line running past this step is cut out by a later one
+                    if (newline >= end && end < text.length) break;
+                    const line = text.slice(start, newline);
+                    if (line.trim()) lines.push(line);
+                    start = newline + 1;
+                }
+            });
+            return lines;
+        }
+
+        // Call handle(0..count-1) in main-thread slices of at most budgetMs,
+        // run from idle callbacks where available, so large decodes never
+        // block input for long; onSlice(done) runs after every slice
+        function processInSlices(count, handle, onSlice = null, budgetMs = 40) {
+            return new Promise((resolve, reject) => {
+                const schedule = typeof requestIdleCallback === 'function'
+                    ? callback => requestIdleCallback(callback, { timeout: 100 })
+                    : callback => setTimeout(callback, 0);
+                let next = 0;
+                const run = deadline => {
+                    try {
+                        const start = performance.now();
+                        do {
+                            handle(next++);
+                        } while (next < count && performance.now() - start < budgetMs &&
+                                 (!deadline || deadline.didTimeout || deadline.timeRemaining() > 1));
+                        if (onSlice) onSlice(next);
+                        if (next < count) schedule(run);
+                        else resolve();
+                    } catch (error) {
+                        reject(error);
+                    }
+                };
+                if (count > 0) schedule(run);
+                else resolve();
+            });
+        }
+
+        // The search index may be passed as JSON text so it is parsed in the worker
+        function parseIndex(index) {
+            return typeof index === 'string' ? JSON.parse(index) : index;
+        }
+
+        // Runs store filtering in a Web Worker built from workerSource, which
+        // decodes its own copy of the columnar lines (or, with lines null, gets
+        // a structured clone of the already decoded store) and of the optional
+        // trigram index (an object or JSON text). Only the newest query is
+        // answered; superseded queries resolve to null. Falls back to filtering on the main thread when
+        // workers are unavailable.
+        class FilterEngine {
+            constructor(store, lines, workerSource, searchIndex = null) {
+                this.store = store;
+                this.searchIndex = searchIndex;
+                this.query = 0;
+                this.last = null;
+                this.pending = new Map();
+                this.worker = null;
+                try {
+                    const url = URL.createObjectURL(new Blob([workerSource], { type: 'text/javascript' }));
+                    this.worker = new Worker(url);
+                    this.worker.onmessage = event => this.deliver(event.data.query, event.data.rows);
+                    this.worker.onerror = error => this.fallback(error);
+                    const source = lines ? { lines } : { snapshot: store.snapshot() };
+                    this.worker.postMessage(Object.assign({ type: 'load', searchIndex }, source));
+                } catch (error) {
+                    this.fallback(error);
+                }
+            }
+
+            filter(severity, term) {
+                const query = ++this.query;
+                this.last = { query, severity, term };
+                this.pending.forEach(resolve => resolve(null));
+                this.pending.clear();
+                if (!this.worker) return Promise.resolve(this.store.filter(severity, term));
+
+                return new Promise(resolve => {
+                    this.pending.set(query, resolve);
+                    this.worker.postMessage({ type: 'filter', query, severity, term });
+                });
+            }
+
+            // Drop any in-flight query (its promise resolves to null)
+            cancel() {
+                this.query++;
+                this.pending.forEach(resolve => resolve(null));
+                this.pending.clear();
+            }
+
+            deliver(query, rows) {
+                const resolve = this.pending.get(query);
+                if (!resolve) return;
+                this.pending.delete(query);
+                resolve(rows);
+            }
+
+            fallback(error) {
+                console.warn('Filter worker unavailable, filtering on the main thread:', error);
+                if (this.worker) this.worker.terminate();
+                this.worker = null;
+                if (this.searchIndex && !this.store.searchIndex) {
+                    this.store.searchIndex = new TrigramIndex(parseIndex(this.searchIndex));
+                }
+                if (this.last && this.pending.has(this.last.query)) {
+                    this.deliver(this.last.query, this.store.filter(this.last.severity, this.last.term));
+                }
+            }
+        }
+"""
+
+# Source of the filter worker. Newer queries cancel older ones between chunks.
+FILTER_WORKER_JS = COLUMNAR_JS + """
+        const FILTER_CHUNK_ROWS = 20000;
+        let workerStore = null;
+        let latestQuery = 0;
+
+        self.onmessage = event => {
+            const message = event.data;
+            if (message.type === 'load') {
+                workerStore = message.snapshot ? IssueStore.fromSnapshot(message.snapshot)
+                    : decodeColumnarLines(message.lines);
+                if (message.searchIndex) workerStore.searchIndex = new TrigramIndex(parseIndex(message.searchIndex));
+            } else if (message.type === 'filter') {
+                latestQuery = message.query;
+                runFilter(message);
+            }
+        };
+
+        async function runFilter({ query, severity, term }) {
+            const filter = workerStore.prepareFilter(severity, term);
+            const rows = new Uint32Array(workerStore.count);
+            let n = 0;
+            for (let start = 0; start < workerStore.count; start += FILTER_CHUNK_ROWS) {
+                if (start > 0) {
+                    // Yield so queued messages are seen; drop this scan if superseded
+                    await new Promise(resolve => setTimeout(resolve, 0));
+                    if (query !== latestQuery) return;
+                }
+                n = workerStore.filterRows(filter, start, Math.min(start + FILTER_CHUNK_ROWS, workerStore.count), rows, n);
+            }
+            const result = rows.slice(0, n);
+            self.postMessage({ query, rows: result }, [result.buffer]);
+        }
+"""
@@ -31,6 +31,9 @@ from datetime import datetime
 import html
 import hashlib
 
+from columnar import PathTrie, PATH_TRIE_JS
+from issue_views import IssueViews, ISSUE_VIEWS_JS
+
 class OptimizedDashboardGenerator:
     def __init__(self, issues_file):
         with open(issues_file, 'r') as f:
@@ -54,8 +57,13 @@ class OptimizedDashboardGenerator:
             file_path = issue.get('file', 'Unknown')
             self.files_map[file_path].append(issue)
         
-        # Sort files by issue count (most issues first)
-        self.sorted_files = sorted(self.files_map.items(), key=lambda x: len(x[1]), reverse=True)
+        # File paths go into a prefix trie; embedded issues reference a node id
+        self.paths = PathTrie()
+        self.embedded_issues = []
+        for issue in self.issues:
+            embedded = {k: v for k, v in issue.items() if k != 'file'}
+            embedded['fileId'] = self.paths.add(issue.get('file') or 'Unknown')
+            self.embedded_issues.append(embedded)
         
         # Calculate statistics
         self.calculate_stats()
@@ -883,23 +891,23 @@ class OptimizedDashboardGenerator:
             <div class="stats-bar" id="statsBar" style="margin-top: 1rem;">
                 <div class="stat-badge total" onclick="filterBySeverity('all')">
                     <span>Total</span>
-                    <span>{self.stats['total']}</span>
+                    <span data-severity-count="all">{self.stats['total']}</span>
                 </div>
                 <div class="stat-badge error" onclick="filterBySeverity('error')">
                     <span>Errors</span>
-                    <span>{self.stats['error']}</span>
+                    <span data-severity-count="error">{self.stats['error']}</span>
                 </div>
                 <div class="stat-badge warning" onclick="filterBySeverity('warning')">
                     <span>Warnings</span>
-                    <span>{self.stats['warning']}</span>
+                    <span data-severity-count="warning">{self.stats['warning']}</span>
                 </div>
                 <div class="stat-badge style" onclick="filterBySeverity('style')">
                     <span>Style</span>
-                    <span>{self.stats['style']}</span>
+                    <span data-severity-count="style">{self.stats['style']}</span>
                 </div>
                 <div class="stat-badge performance" onclick="filterBySeverity('performance')">
                     <span>Performance</span>
-                    <span>{self.stats['performance']}</span>
+                    <span data-severity-count="performance">{self.stats['performance']}</span>
                 </div>
             </div>
         </div>
@@ -915,7 +923,7 @@ class OptimizedDashboardGenerator:
             </div>
             <div class="control-buttons">
                 <button class="control-btn" onclick="toggleGrouping()">
-                    Group by File
+                    Group by File / Directory
                 </button>
                 <button class="control-btn" onclick="exportData()">
                     Export
@@ -972,18 +980,32 @@ class OptimizedDashboardGenerator:
     <div class="toast" id="toast"></div>
     
     <script>
+        {PATH_TRIE_JS}
+        {ISSUE_VIEWS_JS}
+        
+        // File path trie (parent index + segment per node)
+        const pathTrie = {json.dumps(self.paths.to_json())};
+        const filePaths = decodePathTrie(pathTrie);
+        
         // Global state
         const state = {{
-            issues: {json.dumps(self.issues)},
-            fileGroups: {json.dumps(dict(self.sorted_files))},
+            issues: {json.dumps(self.embedded_issues)},
             currentFilter: 'all',
             searchQuery: '',
-            groupByFile: true,
+            groupMode: 'file',
             viewed: new Set(),
             fixed: new Set(),
             expandedFiles: new Set()
         }};
         
+        // Point every issue at its (shared) path string
+        state.issues.forEach(issue => {{
+            issue.file = filePaths[issue.fileId];
+        }});
+        
+        // Precomputed orderings and severity bitsets (rows index state.issues)
+        const issueViews = new IssueViews({json.dumps(IssueViews(self.issues).to_json())});
+        
         // Fix patterns
         const fixPatterns = {json.dumps(self.fix_patterns)};
         
@@ -1022,7 +1044,7 @@ class OptimizedDashboardGenerator:
                 fixed: [...state.fixed],
                 expandedFiles: [...state.expandedFiles],
                 currentFilter: state.currentFilter,
-                groupByFile: state.groupByFile
+                groupMode: state.groupMode
             }};
             localStorage.setItem('dashboardState', JSON.stringify(stateData));
         }}
@@ -1035,7 +1057,7 @@ class OptimizedDashboardGenerator:
                 state.fixed = new Set(data.fixed || []);
                 state.expandedFiles = new Set(data.expandedFiles || []);
                 state.currentFilter = data.currentFilter || 'all';
-                state.groupByFile = data.groupByFile !== false;
+                state.groupMode = data.groupMode || (data.groupByFile === false ? 'flat' : 'file');
             }}
         }}
         
@@ -1068,7 +1090,7 @@ class OptimizedDashboardGenerator:
             
             document.getElementById('emptyState').style.display = 'none';
             
-            if (state.groupByFile) {{
+            if (state.groupMode !== 'flat') {{
                 renderGroupedIssues(filteredIssues);
             }} else {{
                 renderFlatIssues(filteredIssues);
@@ -1077,28 +1099,38 @@ class OptimizedDashboardGenerator:
         
         function renderGroupedIssues(issues) {{
             const container = document.getElementById('issuesContainer');
-            const fileMap = new Map();
+            const byDirectory = state.groupMode === 'directory';
+            const groupMap = new Map();
             
-            // Group filtered issues by file
+            // Group filtered issues by trie node: the file itself, or its directory
             issues.forEach(issue => {{
-                const file = issue.file || 'Unknown';
-                if (!fileMap.has(file)) {{
-                    fileMap.set(file, []);
+                const node = byDirectory ? pathTrie.parent[issue.fileId] : issue.fileId;
+                if (!groupMap.has(node)) {{
+                    groupMap.set(node, []);
                 }}
-                fileMap.get(file).push(issue);
+                groupMap.get(node).push(issue);
             }});
             
-            // Sort files by issue count
-            const sortedFiles = Array.from(fileMap.entries())
+            // Directory totals include every subdirectory, rolled up through the trie
+            let totals = null;
+            if (byDirectory) {{
+                const counts = new Uint32Array(filePaths.length);
+                issues.forEach(issue => {{ counts[issue.fileId]++; }});
+                totals = rollupPathCounts(pathTrie, counts);
+            }}
+            
+            // Sort groups by issue count
+            const sortedGroups = Array.from(groupMap.entries())
                 .sort((a, b) => b[1].length - a[1].length);
             
-            sortedFiles.forEach(([file, fileIssues]) => {{
-                const fileGroup = createFileGroup(file, fileIssues);
+            sortedGroups.forEach(([node, groupIssues]) => {{
+                const label = node >= 0 ? (filePaths[node] || '/') : '.';
+                const fileGroup = createFileGroup(label, groupIssues, totals && node >= 0 ? totals[node] : 0);
                 container.appendChild(fileGroup);
             }});
         }}
         
-        function createFileGroup(file, issues) {{
+        function createFileGroup(file, issues, subtreeTotal = 0) {{
             const group = document.createElement('div');
             group.className = 'file-group';
             
@@ -1116,6 +1148,9 @@ class OptimizedDashboardGenerator:
             const issueCount = document.createElement('div');
             issueCount.className = 'issue-count';
             issueCount.textContent = `${{issues.length}} issue${{issues.length > 1 ? 's' : ''}}`;
+            if (subtreeTotal > issues.length) {{
+                issueCount.textContent += ` (${{subtreeTotal}} incl. subdirectories)`;
+            }}
             
             const severityDots = document.createElement('div');
             severityDots.className = 'severity-dots';
@@ -1212,6 +1247,7 @@ class OptimizedDashboardGenerator:
             const meta = document.createElement('div');
             meta.className = 'issue-meta';
             meta.innerHTML = `
+                ${{state.groupMode !== 'file' ? `<span>${{escapeHtml(pathTrie.segment[issue.fileId])}}</span>` : ''}}
                 <span>Line ${{issue.line || '?'}}</span>
                 <span>ID: ${{issue.id || 'unknown'}}</span>
                 <span>Column: ${{issue.column || '?'}}</span>
@@ -1365,19 +1401,34 @@ class OptimizedDashboardGenerator:
         
         // Filtering
         function getFilteredIssues() {{
-            let filtered = state.issues;
-            
-            // Filter by severity
-            if (state.currentFilter !== 'all') {{
-                filtered = filtered.filter(issue => issue.severity === state.currentFilter);
+            // Search hits across all severities, kept until the query changes
+            if (state.searchQuery && (!state.searchHits || state.searchHits.query !== state.searchQuery)) {{
+                const rows = [];
+                state.issues.forEach((issue, row) => {{
+                    if (matchesSearch(issue, state.searchQuery)) rows.push(row);
+                }});
+                state.searchHits = {{ query: state.searchQuery, rows: Uint32Array.from(rows) }};
             }}
+            const searchRows = state.searchQuery ? state.searchHits.rows : null;
             
-            // Filter by search
-            if (state.searchQuery) {{
-                filtered = filtered.filter(issue => matchesSearch(issue, state.searchQuery));
-            }}
+            // Severity via its bitset, walking a precomputed order: grouped
+            // views get files by issue count with lines in order
+            const order = state.groupMode === 'flat' ? 'default' : 'fileCount';
+            const result = issueViews.query(searchRows, {{ severity: state.currentFilter }}, order);
+            updateSeverityCounts(result.counts.severity);
             
-            return filtered;
+            return Array.from(result.rows, row => state.issues[row]);
+        }}
+        
+        // Live badge counts for the current search (popcounts of the
+        // search hits against each severity bitset)
+        function updateSeverityCounts(counts) {{
+            let total = 0;
+            counts.forEach(count => {{ total += count; }});
+            document.querySelectorAll('[data-severity-count]').forEach(el => {{
+                const severity = el.dataset.severityCount;
+                el.textContent = severity === 'all' ? total : (counts.get(severity) || 0);
+            }});
         }}
         
         function matchesSearch(issue, query) {{
@@ -1461,10 +1512,11 @@ class OptimizedDashboardGenerator:
         }}
         
         function toggleGrouping() {{
-            state.groupByFile = !state.groupByFile;
+            const modes = ['file', 'directory', 'flat'];
+            state.groupMode = modes[(modes.indexOf(state.groupMode) + 1) % modes.length];
             saveState();
             renderIssues();
-            showToast(state.groupByFile ? 'Grouping by file' : 'Flat view');
+            showToast({{ file: 'Grouping by file', directory: 'Grouping by directory', flat: 'Flat view' }}[state.groupMode]);
         }}
         
         // Progress tracking
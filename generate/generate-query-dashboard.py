@@ -0,0 +1,574 @@
+#!/usr/bin/env python3
+"""
+Query Dashboard Generator
+Dashboard page that embeds no issue data: it pages, filters and searches
+through the local query API (query_api.py), so its size is the same for any
+dataset
+"""
+
+import json
+from pathlib import Path
+
+from query_api import DEFAULT_PAGE_SIZE, DEFAULT_PORT
+
+class QueryDashboardGenerator:
+    def __init__(self, api_url=f'http://localhost:{DEFAULT_PORT}', page_size=DEFAULT_PAGE_SIZE):
+        self.api_url = api_url.rstrip('/')
+        self.page_size = page_size
+
+    def generate(self, output_file):
+        """Generate the query-backed dashboard page"""
+
+        html_content = f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>CPPCheck Studio - Query Dashboard</title>
+
+    <link href="https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700&display=swap" rel="stylesheet">
+    <link href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css" rel="stylesheet">
+
+    <style>
+        {self.generate_styles()}
+    </style>
+</head>
+<body>
+    <div class="container">
+        <header class="header">
+            <h1><i class="fas fa-search"></i> CPPCheck Studio</h1>
+            <div class="header-meta">
+                <span id="issuesCount">Connecting to the query API...</span>
+                <span class="api-url">{self.api_url}</span>
+            </div>
+        </header>
+
+        <div class="controls">
+            <input type="text" class="search-input" id="searchInput" placeholder="Search file, check id or message... (press /)">
+            <input type="text" class="search-input path-input" id="pathInput" placeholder="Path glob, e.g. src/*.cpp">
+            <div class="filter-buttons" id="severityButtons">
+                <button class="filter-btn active" data-severity="all">All</button>
+            </div>
+            <select class="sort-select" id="checkFacet">
+                <option value="all">All checks</option>
+            </select>
+            <select class="sort-select" id="sortOrder">
+                <option value="default">Report order</option>
+                <option value="location">File and line</option>
+                <option value="severity">Severity</option>
+                <option value="check">Check id</option>
+                <option value="fileCount">Most issues per file</option>
+            </select>
+        </div>
+
+        <table class="issues-table">
+            <thead>
+                <tr>
+                    <th class="col-file">File</th>
+                    <th class="col-line">Line</th>
+                    <th class="col-severity">Severity</th>
+                    <th class="col-message">Message</th>
+                    <th class="col-id">ID</th>
+                </tr>
+            </thead>
+            <tbody id="issuesBody"></tbody>
+        </table>
+
+        <div class="pager">
+            <button class="filter-btn" id="prevPage"><i class="fas fa-chevron-left"></i> Previous</button>
+            <span id="pageInfo"></span>
+            <button class="filter-btn" id="nextPage">Next <i class="fas fa-chevron-right"></i></button>
+        </div>
+    </div>
+
+    <!-- Code Modal -->
+    <div id="codeModal" class="modal">
+        <div class="modal-content">
+            <div class="modal-header">
+                <h3 id="modalTitle">Issue Details</h3>
+                <button class="close-btn" onclick="closeModal()">&times;</button>
+            </div>
+            <div class="modal-body" id="modalBody"></div>
+        </div>
+    </div>
+
+    <script>
+        const CONFIG = {{
+            API_URL: {json.dumps(self.api_url)},
+            PAGE_SIZE: {self.page_size},
+            SEARCH_DEBOUNCE: 300
+        }};
+
+        const state = {{
+            severity: 'all',
+            check: 'all',
+            search: '',
+            path: '',
+            sort: 'default',
+            offset: 0,
+            total: 0,
+            issues: [],
+            request: 0
+        }};
+
+        function filterParams() {{
+            const params = new URLSearchParams();
+            if (state.severity !== 'all') params.set('severity', state.severity);
+            if (state.check !== 'all') params.set('id', state.check);
+            if (state.path) params.set('path', state.path);
+            if (state.search) params.set('q', state.search);
+            return params;
+        }}
+
+        async function getJson(path, params) {{
+            const response = await fetch(CONFIG.API_URL + path + (params ? '?' + params : ''));
+            if (!response.ok) throw new Error((await response.json()).error || response.statusText);
+            return response.json();
+        }}
+
+        // Fetch the current page and facet counts; answers to superseded
+        // requests are dropped
+        async function loadPage() {{
+            const request = ++state.request;
+            const params = filterParams();
+            const pageParams = new URLSearchParams(params);
+            pageParams.set('sort', state.sort);
+            pageParams.set('offset', state.offset);
+            pageParams.set('limit', CONFIG.PAGE_SIZE);
+            try {{
+                const [page, facets] = await Promise.all([
+                    getJson('/api/issues', pageParams),
+                    getJson('/api/facets', params)
+                ]);
+                if (request !== state.request) return;
+                state.total = page.total;
+                state.issues = page.issues;
+                renderRows();
+                renderFacets(facets.facets);
+            }} catch (error) {{
+                if (request !== state.request) return;
+                console.error('Query failed:', error);
+                document.getElementById('issuesCount').textContent = 'Query failed: ' + error.message;
+            }}
+        }}
+
+        function renderRows() {{
+            const tbody = document.getElementById('issuesBody');
+            const fragment = document.createDocumentFragment();
+            state.issues.forEach(issue => {{
+                const row = document.createElement('tr');
+                row.className = 'issue-row';
+                row.innerHTML =
+                    '<td class="file-cell"><i class="fas ' + (issue.hasContext ? 'fa-code' : 'fa-file-code') + '"></i> <span></span></td>' +
+                    '<td class="line-cell"></td>' +
+                    '<td><span class="severity-badge"></span></td>' +
+                    '<td class="message-cell"></td>' +
+                    '<td class="id-cell"></td>';
+                const cells = row.children;
+                cells[0].title = issue.file || '';
+                cells[0].lastChild.textContent = getFileName(issue.file);
+                cells[1].textContent = issue.line || '-';
+                cells[2].firstChild.className = 'severity-badge ' + (issue.severity || 'unknown');
+                cells[2].firstChild.textContent = (issue.severity || 'UNKNOWN').toUpperCase();
+                cells[3].textContent = issue.message || 'No message';
+                cells[4].textContent = issue.id || 'N/A';
+                row.onclick = () => showIssueDetails(issue);
+                fragment.appendChild(row);
+            }});
+            tbody.replaceChildren(fragment);
+
+            const first = state.total ? state.offset + 1 : 0;
+            const last = state.offset + state.issues.length;
+            document.getElementById('issuesCount').textContent = `${{state.total}} matching issues`;
+            document.getElementById('pageInfo').textContent = `${{first}}-${{last}} of ${{state.total}}`;
+            document.getElementById('prevPage').disabled = state.offset === 0;
+            document.getElementById('nextPage').disabled = last >= state.total;
+        }}
+
+        // Severity buttons and the check list, with counts against the other filters
+        function renderFacets(facets) {{
+            const buttons = document.getElementById('severityButtons');
+            const severities = Object.keys(facets.severity).sort();
+            if (state.severity !== 'all' && !severities.includes(state.severity)) severities.push(state.severity);
+            buttons.replaceChildren(...['all'].concat(severities).map(severity => {{
+                const button = document.createElement('button');
+                button.className = 'filter-btn' + (severity === state.severity ? ' active' : '');
+                button.dataset.severity = severity;
+                const count = severity === 'all'
+                    ? Object.values(facets.severity).reduce((sum, n) => sum + n, 0)
+                    : facets.severity[severity] || 0;
+                button.textContent = (severity === 'all' ? 'All' : severity) + ' (' + count + ')';
+                button.onclick = () => setFilter('severity', severity);
+                return button;
+            }}));
+
+            const select = document.getElementById('checkFacet');
+            const checks = Object.entries(facets.check).sort((a, b) => b[1] - a[1] || a[0].localeCompare(b[0]));
+            const options = [new Option('All checks', 'all')].concat(
+                checks.map(([check, count]) => new Option(check + ' (' + count + ')', check)));
+            if (state.check !== 'all' && !facets.check[state.check]) options.push(new Option(state.check + ' (0)', state.check));
+            select.replaceChildren(...options);
+            select.value = state.check;
+        }}
+
+        function setFilter(name, value) {{
+            state[name] = value;
+            state.offset = 0;
+            loadPage();
+        }}
+
+        async function showIssueDetails(issue) {{
+            const modal = document.getElementById('codeModal');
+            document.getElementById('modalTitle').innerHTML = '<i class="fas fa-file-code"></i> ' +
+                escapeHtml(getFileName(issue.file)) + ':' + (issue.line || '?');
+
+            let codeContext = null;
+            if (issue.hasContext) {{
+                try {{
+                    codeContext = (await getJson('/api/issues/' + issue.row + '/context')).code_context;
+                }} catch (error) {{
+                    console.error('Failed to load code context:', error);
+                }}
+            }}
+
+            let content = '<div class="issue-details">';
+            content += '<p><strong>File:</strong> <code>' + escapeHtml(issue.file || 'Unknown') + '</code></p>';
+            content += '<p><strong>Severity:</strong> <span class="severity-badge ' + (issue.severity || 'unknown') + '">' +
+                (issue.severity || 'UNKNOWN').toUpperCase() + '</span> <strong>ID:</strong> <code>' + escapeHtml(issue.id || 'N/A') + '</code></p>';
+            content += '<div class="message-box">' + escapeHtml(issue.message || 'No message available') + '</div>';
+            if (codeContext && codeContext.lines && codeContext.lines.length > 0) {{
+                content += '<div class="code-preview"><pre><code>';
+                codeContext.lines.forEach(line => {{
+                    const text = String(line.number || 0).padStart(4, ' ') + ': ' + escapeHtml(line.content || '');
+                    content += line.is_target === true ? '<span class="highlight-line">' + text + '</span>\\n' : text + '\\n';
+                }});
+                content += '</code></pre></div>';
+            }} else {{
+                content += '<p class="no-code-message">Code context not available for this issue.</p>';
+            }}
+            content += '</div>';
+            document.getElementById('modalBody').innerHTML = content;
+            modal.style.display = 'block';
+        }}
+
+        function closeModal() {{
+            document.getElementById('codeModal').style.display = 'none';
+        }}
+
+        function escapeHtml(text) {{
+            const div = document.createElement('div');
+            div.textContent = text;
+            return div.innerHTML;
+        }}
+
+        function getFileName(path) {{
+            if (!path) return 'Unknown';
+            const parts = path.split('/');
+            return parts[parts.length - 1];
+        }}
+
+        function debounce(func, wait) {{
+            let timeout;
+            return function executedFunction(...args) {{
+                clearTimeout(timeout);
+                timeout = setTimeout(() => func(...args), wait);
+            }};
+        }}
+
+        document.getElementById('searchInput').addEventListener('input', debounce(event => {{
+            setFilter('search', event.target.value.trim().toLowerCase());
+        }}, CONFIG.SEARCH_DEBOUNCE));
+        document.getElementById('pathInput').addEventListener('input', debounce(event => {{
+            setFilter('path', event.target.value.trim());
+        }}, CONFIG.SEARCH_DEBOUNCE));
+        document.getElementById('checkFacet').addEventListener('change', event => setFilter('check', event.target.value));
+        document.getElementById('sortOrder').addEventListener('change', event => setFilter('sort', event.target.value));
+        document.getElementById('prevPage').addEventListener('click', () => {{
+            state.offset = Math.max(0, state.offset - CONFIG.PAGE_SIZE);
+            loadPage();
+        }});
+        document.getElementById('nextPage').addEventListener('click', () => {{
+            state.offset += CONFIG.PAGE_SIZE;
+            loadPage();
+        }});
+        document.addEventListener('keydown', event => {{
+            if (event.key === 'Escape') closeModal();
+            if (event.key === '/' && document.activeElement.tagName !== 'INPUT') {{
+                event.preventDefault();
+                document.getElementById('searchInput').focus();
+            }}
+        }});
+
+        loadPage();
+    </script>
+</body>
+</html>"""
+
+        with open(output_file, 'w', encoding='utf-8') as f:
+            f.write(html_content)
+
+        print(f"✅ Query dashboard generated: {output_file}")
+        print(f"   Query API: {self.api_url}")
+        print(f"   Page size: {self.page_size} issues")
+        print(f"   HTML size: {Path(output_file).stat().st_size / 1024:.1f} KB")
+        print(f"   Start the API with: python3 generate/query_api.py <analysis.json>")
+
+    def generate_styles(self):
+        return """
+        * {
+            margin: 0;
+            padding: 0;
+            box-sizing: border-box;
+        }
+
+        body {
+            font-family: 'Inter', -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif;
+            background: #f5f7fa;
+            color: #2d3748;
+        }
+
+        .container {
+            max-width: 1560px;
+            margin: 0 auto;
+            padding: 20px;
+        }
+
+        .header {
+            display: flex;
+            justify-content: space-between;
+            align-items: center;
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            color: white;
+            padding: 20px 30px;
+            border-radius: 8px;
+            margin-bottom: 20px;
+        }
+
+        .header-meta {
+            display: flex;
+            flex-direction: column;
+            align-items: flex-end;
+            gap: 4px;
+        }
+
+        .api-url {
+            font-family: 'Monaco', 'Consolas', monospace;
+            font-size: 0.8em;
+            opacity: 0.8;
+        }
+
+        .controls {
+            display: flex;
+            flex-wrap: wrap;
+            gap: 10px;
+            align-items: center;
+            margin-bottom: 20px;
+        }
+
+        .search-input {
+            flex: 1;
+            min-width: 240px;
+            padding: 10px 15px;
+            border: 2px solid #e2e8f0;
+            border-radius: 8px;
+            font-size: 0.95em;
+        }
+
+        .path-input {
+            flex: 0 1 240px;
+        }
+
+        .search-input:focus {
+            outline: none;
+            border-color: #667eea;
+        }
+
+        .filter-buttons {
+            display: flex;
+            flex-wrap: wrap;
+            gap: 6px;
+        }
+
+        .filter-btn, .sort-select {
+            padding: 8px 14px;
+            border: 2px solid #e2e8f0;
+            background: white;
+            border-radius: 6px;
+            cursor: pointer;
+            font-size: 0.85em;
+        }
+
+        .filter-btn.active {
+            background: #667eea;
+            border-color: #667eea;
+            color: white;
+        }
+
+        .filter-btn:disabled {
+            opacity: 0.5;
+            cursor: default;
+        }
+
+        .issues-table {
+            width: 100%;
+            border-collapse: collapse;
+            table-layout: fixed;
+            background: white;
+            border-radius: 8px;
+            box-shadow: 0 2px 4px rgba(0,0,0,0.05);
+        }
+
+        .issues-table th {
+            padding: 12px 15px;
+            text-align: left;
+            font-size: 0.85em;
+            text-transform: uppercase;
+            color: #4a5568;
+            background: #f7fafc;
+            border-bottom: 2px solid #e2e8f0;
+        }
+
+        .col-file { width: 25%; }
+        .col-line { width: 80px; }
+        .col-severity { width: 120px; }
+        .col-id { width: 140px; }
+
+        .issue-row {
+            border-bottom: 1px solid #e2e8f0;
+            cursor: pointer;
+        }
+
+        .issue-row:hover {
+            background: #f7fafc;
+        }
+
+        .issue-row td {
+            padding: 10px 15px;
+            font-size: 0.85em;
+            vertical-align: top;
+            overflow-wrap: anywhere;
+        }
+
+        .file-cell {
+            overflow: hidden;
+            text-overflow: ellipsis;
+            white-space: nowrap;
+        }
+
+        .id-cell {
+            font-family: 'Monaco', 'Consolas', monospace;
+            color: #718096;
+        }
+
+        .severity-badge {
+            display: inline-block;
+            padding: 3px 10px;
+            border-radius: 12px;
+            font-size: 0.75em;
+            font-weight: 600;
+            color: white;
+            background: #a0aec0;
+        }
+
+        .severity-badge.error { background: #e53e3e; }
+        .severity-badge.warning { background: #dd6b20; }
+        .severity-badge.style { background: #3182ce; }
+        .severity-badge.performance { background: #38a169; }
+        .severity-badge.portability { background: #805ad5; }
+        .severity-badge.information { background: #718096; }
+
+        .pager {
+            display: flex;
+            justify-content: center;
+            align-items: center;
+            gap: 15px;
+            margin-top: 20px;
+        }
+
+        .modal {
+            display: none;
+            position: fixed;
+            inset: 0;
+            background: rgba(0,0,0,0.5);
+            z-index: 1000;
+        }
+
+        .modal-content {
+            background: white;
+            margin: 5% auto;
+            width: 90%;
+            max-width: 1000px;
+            max-height: 85vh;
+            overflow: auto;
+            border-radius: 8px;
+        }
+
+        .modal-header {
+            display: flex;
+            justify-content: space-between;
+            padding: 15px 20px;
+            border-bottom: 1px solid #e2e8f0;
+        }
+
+        .close-btn {
+            border: none;
+            background: none;
+            font-size: 1.5em;
+            cursor: pointer;
+        }
+
+        .modal-body {
+            padding: 20px;
+        }
+
+        .issue-details p {
+            margin-bottom: 10px;
+        }
+
+        .message-box {
+            padding: 12px;
+            background: #f7fafc;
+            border-left: 4px solid #667eea;
+            margin-bottom: 15px;
+        }
+
+        .code-preview pre {
+            background: #1a202c;
+            color: #e2e8f0;
+            padding: 15px;
+            border-radius: 6px;
+            overflow-x: auto;
+            font-size: 0.85em;
+        }
+
+        .highlight-line {
+            background: rgba(229, 62, 62, 0.3);
+            display: block;
+        }
+
+        .no-code-message {
+            color: #718096;
+        }
+        """
+
+if __name__ == '__main__':
+    import argparse
+    import sys
+
+    # Named options: the page embeds no data, so unlike the other generators
+    # it takes no analysis file, and a positional argument would be one
+    parser = argparse.ArgumentParser(
+        description='Generate a dashboard that pages issues from the query API (query_api.py)',
+        usage='generate-query-dashboard.py [--api-url URL] [--output FILE.html]')
+    parser.add_argument('--api-url', default=f'http://localhost:{DEFAULT_PORT}',
+                        help=f'query API base URL (default: http://localhost:{DEFAULT_PORT})')
+    parser.add_argument('--output', default='query-dashboard.html',
+                        help='output HTML file (default: query-dashboard.html)')
+    args = parser.parse_args()
+
+    if not args.output.endswith('.html'):
+        print(f"Error: output must be an .html file, got {args.output}", file=sys.stderr)
+        sys.exit(1)
+
+    generator = QueryDashboardGenerator(args.api_url)
+    generator.generate(args.output)
@@ -6,23 +6,21 @@ Split Dashboard Generator - Separates code context into external file
 import json
 from pathlib import Path
 from datetime import datetime
-import hashlib
+
+from issue_loader import load_issues
+from service_worker import register_js, service_worker_name, version_file, write_service_worker
 
 class SplitDashboardGenerator:
     def __init__(self, issues_file):
-        with open(issues_file) as f:
-            data = json.load(f)
-        self.issues = data.get('issues', [])
+        self.issues = load_issues(issues_file)
         self.timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        
-        # Generate unique IDs for each issue
-        for i, issue in enumerate(self.issues):
-            if 'id' not in issue:
-                id_str = f"{issue.get('file', '')}:{issue.get('line', '')}:{issue.get('message', '')}"
-                issue['id'] = hashlib.md5(id_str.encode()).hexdigest()[:8].upper()
     
-    def generate(self, output_file):
-        """Generate dashboard with separate files"""
+    def generate(self, output_file, service_worker=False):
+        """Generate dashboard with separate files
+        
+        With service_worker, the data files get content-hashed names and a
+        service worker that precaches them with the page is written next to it.
+        """
         
         # Calculate statistics
         stats = self.calculate_stats()
@@ -53,6 +51,10 @@ class SplitDashboardGenerator:
         with open(context_file, 'w') as f:
             json.dump(code_contexts, f)
         
+        if service_worker:
+            issues_file = version_file(issues_file).name
+            context_file = version_file(context_file).name
+        
         # Generate HTML that loads data separately
         html_content = f"""<!DOCTYPE html>
 <html lang="en">
@@ -513,12 +515,16 @@ class SplitDashboardGenerator:
                 document.getElementById('searchInput').focus();
             }}
         }});
+        {register_js(service_worker_name(output_file)) if service_worker else ''}
     </script>
 </body>
 </html>"""
         
         with open(output_file, 'w', encoding='utf-8') as f:
             f.write(html_content)
+        
+        if service_worker:
+            worker_path = write_service_worker(output_file, [issues_file, context_file])
             
         print(f"✅ Split dashboard generated: {output_file}")
         print(f"   Total issues: {len(self.issues)}")
@@ -527,6 +533,8 @@ class SplitDashboardGenerator:
         print(f"     - {output_file} (HTML)")
         print(f"     - {issues_file} (Issues JSON)")
         print(f"     - {context_file} (Code context JSON)")
+        if service_worker:
+            print(f"     - {worker_path} (Service worker)")
         print(f"   HTML size: {Path(output_file).stat().st_size / 1024:.1f} KB")
         
     def calculate_stats(self):
@@ -1260,12 +1268,13 @@ class SplitDashboardGenerator:
 if __name__ == '__main__':
     import sys
     
-    if len(sys.argv) < 2:
-        print("Usage: generate-split-dashboard.py <analysis.json> [output.html]")
+    args = [arg for arg in sys.argv[1:] if arg != '--service-worker']
+    if not args:
+        print("Usage: generate-split-dashboard.py <analysis.json> [output.html] [--service-worker]")
         sys.exit(1)
         
-    input_file = sys.argv[1]
-    output_file = sys.argv[2] if len(sys.argv) > 2 else 'split-dashboard.html'
+    input_file = args[0]
+    output_file = args[1] if len(args) > 1 else 'split-dashboard.html'
     
     generator = SplitDashboardGenerator(input_file)
-    generator.generate(output_file)
\ No newline at end of file
+    generator.generate(output_file, service_worker='--service-worker' in sys.argv)
\ No newline at end of file
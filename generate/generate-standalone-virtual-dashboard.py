@@ -7,20 +7,24 @@ Embeds JSONL data as JavaScript to avoid CORS issues
 import json
 from pathlib import Path
 from datetime import datetime
-import hashlib
+
+from columnar import ColumnarIssues, COLUMNAR_JS, DATA_CACHE_JS, FILTER_WORKER_JS, HEIGHT_INDEX_JS, content_hash, script_json
+from issue_loader import load_issues
+from issue_views import IssueViews
+from prerender import PRERENDER_ROWS, placeholder_height, prerender_rows
+from search_index import TrigramIndex
+from virtual_rows import VIRTUAL_ROWS_JS
+
+# Rows per embedded block; each block is one JSON.parse on the main thread
+EMBED_BLOCK_SIZE = 1000
+
+# Height (px) assumed for rows that have not been measured yet
+ROW_HEIGHT = 50
 
 class StandaloneVirtualDashboardGenerator:
     def __init__(self, issues_file):
-        with open(issues_file) as f:
-            data = json.load(f)
-        self.issues = data.get('issues', [])
+        self.issues = load_issues(issues_file)
         self.timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        
-        # Generate unique IDs for each issue
-        for i, issue in enumerate(self.issues):
-            if 'id' not in issue:
-                id_str = f"{issue.get('file', '')}:{issue.get('line', '')}:{issue.get('message', '')}"
-                issue['id'] = hashlib.md5(id_str.encode()).hexdigest()[:8].upper()
     
     def generate(self, output_file):
         """Generate standalone dashboard with embedded data"""
@@ -28,28 +32,35 @@ class StandaloneVirtualDashboardGenerator:
         # Calculate statistics
         stats = self.calculate_stats()
         
-        # Prepare data
-        issues_without_context = []
+        # Prepare data: issues go into the columnar layout, code context is
+        # stored separately and keyed by row index
         code_context_map = {}
         
-        for issue in self.issues:
-            # Create issue without code context
-            issue_copy = {k: v for k, v in issue.items() if k != 'code_context'}
-            issues_without_context.append(issue_copy)
-            
-            # Store code context separately
-            if 'code_context' in issue and issue.get('id'):
-                code_context_map[issue['id']] = issue['code_context']
+        for row, issue in enumerate(self.issues):
+            if 'code_context' in issue:
+                code_context_map[row] = issue['code_context']
         
         # Count issues with code context
         with_context = len(code_context_map)
         
-        # Generate JSONL strings with placeholder to avoid JavaScript parsing issues
-        issues_jsonl = '__NEWLINE__'.join(json.dumps(issue) for issue in issues_without_context)
-        code_jsonl_entries = []
-        for issue_id, context in code_context_map.items():
-            code_jsonl_entries.append(json.dumps({'id': issue_id, 'code_context': context}))
-        code_jsonl = '__NEWLINE__'.join(code_jsonl_entries)
+        # One JSON document per line: columnar header followed by column blocks,
+        # small enough to decode one per idle slice
+        issues_jsonl = '\n'.join(ColumnarIssues(self.issues).lines(EMBED_BLOCK_SIZE))
+        code_jsonl = '\n'.join(
+            script_json({'row': row, 'code_context': context})
+            for row, context in code_context_map.items()
+        )
+        search_index = script_json(TrigramIndex(self.issues).to_json())
+        # Views as a skeleton plus one line per order and facet value
+        views = '\n'.join(script_json(item) for item in IssueViews(self.issues).to_json_lines())
+        # The page caches what it decodes from these under this key
+        data_hash = content_hash(issues_jsonl, search_index, views)
+        
+        # Shown with the prerendered rows until the data is loaded
+        if len(self.issues) > PRERENDER_ROWS:
+            first_page_count = f'Showing first {PRERENDER_ROWS} of {len(self.issues)} issues (loading...)'
+        else:
+            first_page_count = f'Showing all {len(self.issues)} issues'
         
         # Generate HTML
         html_content = f"""<!DOCTYPE html>
@@ -121,30 +132,45 @@ class StandaloneVirtualDashboardGenerator:
             
             <div class="filter-buttons">
                 <button class="filter-btn active" onclick="setSeverityFilter('all', this)">
-                    <i class="fas fa-list"></i> All ({stats['total']})
+                    <i class="fas fa-list"></i> All (<span data-severity-count="all">{stats['total']}</span>)
                 </button>
                 <button class="filter-btn" onclick="setSeverityFilter('error', this)">
-                    <i class="fas fa-exclamation-circle"></i> Errors ({stats['errors']})
+                    <i class="fas fa-exclamation-circle"></i> Errors (<span data-severity-count="error">{stats['errors']}</span>)
                 </button>
                 <button class="filter-btn" onclick="setSeverityFilter('warning', this)">
-                    <i class="fas fa-exclamation-triangle"></i> Warnings ({stats['warnings']})
+                    <i class="fas fa-exclamation-triangle"></i> Warnings (<span data-severity-count="warning">{stats['warnings']}</span>)
                 </button>
                 <button class="filter-btn" onclick="setSeverityFilter('style', this)">
-                    <i class="fas fa-palette"></i> Style ({stats['style']})
+                    <i class="fas fa-palette"></i> Style (<span data-severity-count="style">{stats['style']}</span>)
                 </button>
                 <button class="filter-btn" onclick="setSeverityFilter('performance', this)">
-                    <i class="fas fa-tachometer-alt"></i> Performance ({stats['performance']})
+                    <i class="fas fa-tachometer-alt"></i> Performance (<span data-severity-count="performance">{stats['performance']}</span>)
                 </button>
                 <button class="filter-btn" onclick="setSeverityFilter('information', this)">
-                    <i class="fas fa-info-circle"></i> Info
+                    <i class="fas fa-info-circle"></i> Info (<span data-severity-count="information">{stats.get('information', 0)}</span>)
                 </button>
-            </div>
+            </div>            
+            <select class="sort-select" id="directoryFacet" onchange="setFacetFilter('directory', this.value)" title="Directory">
+                <option value="all" data-label="All directories">All directories</option>
+            </select>
+            
+            <select class="sort-select" id="checkFacet" onchange="setFacetFilter('check', this.value)" title="Check ID">
+                <option value="all" data-label="All checks">All checks</option>
+            </select>
+            
+            <select class="sort-select" id="sortSelect" onchange="setSortOrder(this.value)" title="Sort order">
+                <option value="default">Original order</option>
+                <option value="location">File &amp; line</option>
+                <option value="severity">Severity</option>
+                <option value="check">Check ID</option>
+                <option value="fileCount">Most issues per file</option>
+            </select>
         </div>
         
         <!-- Issues Count and Loading Status -->
         <div class="status-bar">
             <div class="issues-count">
-                <span id="issuesCount">Loading...</span>
+                <span id="issuesCount">{first_page_count}</span>
             </div>
             <div class="loading-status" id="loadingStatus" style="display: none;">
                 <i class="fas fa-spinner fa-spin"></i> <span id="loadingText">Loading...</span>
@@ -171,10 +197,11 @@ class StandaloneVirtualDashboardGenerator:
                     <div class="virtual-scroll-spacer" id="spacerTop"></div>
                     <table class="issues-table">
                         <tbody id="issuesBody">
-                            <!-- Virtual rows will be rendered here -->
+                            <!-- First rows are prerendered; the virtual scroller takes them over -->
+                            {prerender_rows(self.issues)}
                         </tbody>
                     </table>
-                    <div class="virtual-scroll-spacer" id="spacerBottom"></div>
+                    <div class="virtual-scroll-spacer" id="spacerBottom" style="height: {placeholder_height(len(self.issues), ROW_HEIGHT)}px;"></div>
                 </div>
             </div>
         </div>
@@ -202,20 +229,43 @@ class StandaloneVirtualDashboardGenerator:
 {code_jsonl}
     </script>
     
+    <script id="searchIndexData" type="application/json">
+{search_index}
+    </script>
+    
+    <script id="viewsData" type="application/x-ndjson">
+{views}
+    </script>
+    
+    <!-- Search/filter worker source, started from a Blob URL -->
+    <script id="filterWorkerSource" type="text/js-worker">
+        {FILTER_WORKER_JS}
+    </script>
+    
     <script>
+        {COLUMNAR_JS}
+        {HEIGHT_INDEX_JS}
+        {DATA_CACHE_JS}
+        
         // Configuration
         const CONFIG = {{
-            ROW_HEIGHT: 50,
+            ROW_HEIGHT: {ROW_HEIGHT}, // estimate for rows not yet measured
             VISIBLE_BUFFER: 5,
-            SCROLL_DEBOUNCE: 10,
             SEARCH_DEBOUNCE: 300,
-            BATCH_SIZE: 50
+            BATCH_SIZE: 50,
+            DATA_HASH: '{data_hash}'
         }};
         
         // Global state
         const state = {{
-            allIssues: [],
-            filteredIssues: [],
+            store: null,
+            filterEngine: null,
+            views: null,
+            searchRows: null,
+            directoryFilter: 'all',
+            checkFilter: 'all',
+            sortOrder: 'default',
+            filteredRows: new Uint32Array(0),
             codeContextMap: new Map(),
             currentFilter: 'all',
             currentSearch: '',
@@ -223,32 +273,38 @@ class StandaloneVirtualDashboardGenerator:
             visibleEnd: 0,
             isLoading: false,
             scrollTop: 0,
-            containerHeight: 0
+            containerHeight: 0,
+            rowPool: [],
+            rowHeights: new Uint16Array(0),
+            heightIndex: new HeightIndex(),
+            heightRows: null,
+            renderFrame: 0
         }};
         
         // Initialize
-        function initialize() {{
+        async function initialize() {{
             try {{
                 console.log('🚀 Dashboard initializing...');
                 showLoadingStatus('Loading issues data...');
                 
-                // Load issues from embedded JSONL
-                loadEmbeddedData();
-                console.log('📊 Loaded ' + state.allIssues.length + ' issues');
-                
-                // Set up virtual scrolling
+                // Set up virtual scrolling first so the first block can render
+                // while the rest of the embedded data is decoded
                 setupVirtualScroll();
                 
+                // Load issues from embedded JSONL
+                await loadEmbeddedData();
+                console.log('📊 Loaded ' + state.store.count + ' issues');
+                
                 // Initial render - CRITICAL FOR SCROLLING
-                filterData();
-                console.log('🎯 Filtered ' + state.filteredIssues.length + ' issues');
+                await filterData();
+                console.log('🎯 Filtered ' + state.filteredRows.length + ' issues');
                 
                 // Multiple recovery attempts to ensure rendering
                 const attemptRender = (attempt = 1) => {{
                     renderVisibleRows();
                     const tbody = document.getElementById('issuesBody');
                     
-                    if (state.filteredIssues.length > 0 && tbody && tbody.children.length === 0) {{
+                    if (state.filteredRows.length > 0 && tbody && tbody.children.length === 0) {{
                         console.warn('⚠️ Attempt ' + attempt + ': No rows rendered, retrying...');
                         
                         // Force container height recalculation
@@ -283,49 +339,121 @@ class StandaloneVirtualDashboardGenerator:
             }}
         }}
         
-        // Load embedded JSONL data
-        function loadEmbeddedData() {{
+        // Load embedded JSONL data: the first block is decoded and rendered
+        // at once, the rest in idle-time slices with progress shown. Decoded
+        // data is cached in IndexedDB, so reopening the same report skips it.
+        async function loadEmbeddedData() {{
             try {{
-                // Parse issues data
-                const issuesScript = document.getElementById('issuesData');
-                const issuesText = issuesScript.textContent.trim();
-                const issuesLines = issuesText.split('__NEWLINE__').filter(line => line.trim());
-                
-                state.allIssues = issuesLines.map(line => {{
-                    try {{
-                        return JSON.parse(line);
-                    }} catch (e) {{
-                        console.error('Failed to parse issue line:', e);
-                        return null;
-                    }}
-                }}).filter(Boolean);
-                
-                console.log('Loaded', state.allIssues.length, 'issues');
+                const cache = new DataCache();
+                const cached = await cache.get(CONFIG.DATA_HASH);
+                if (cached) {{
+                    restoreCachedData(cached);
+                    console.log('Loaded', state.store.count, 'issues from cache');
+                }} else {{
+                    await decodeEmbeddedData(cache);
+                }}
                 
-                // Parse code context data
+                // Index code context lines by row; each is parsed when its
+                // details are opened
                 const codeScript = document.getElementById('codeContextData');
-                const codeText = codeScript.textContent.trim();
-                const codeLines = codeText.split('__NEWLINE__').filter(line => line.trim());
+                const codeLines = await splitLinesInSlices(codeScript.textContent);
                 
-                codeLines.forEach(line => {{
-                    try {{
-                        const data = JSON.parse(line);
-                        if (data.id && data.code_context) {{
-                            state.codeContextMap.set(data.id, data.code_context);
-                        }}
-                    }} catch (e) {{
-                        console.error('Failed to parse code context:', e);
-                    }}
+                await processInSlices(codeLines.length, i => {{
+                    const match = /^{{"row":(\\d+)/.exec(codeLines[i]);
+                    if (match) state.codeContextMap.set(Number(match[1]), codeLines[i]);
                 }});
                 
                 console.log('Loaded code context for', state.codeContextMap.size, 'issues');
                 
+                // Rows bound before this point show no code indicator; rebind them
+                state.rowPool.forEach(row => {{ row.rowIndex = -1; }});
+                
             }} catch (error) {{
                 console.error('Failed to load embedded data:', error);
                 throw error;
             }}
         }}
         
+        // Decode the embedded issues, search index and views, then cache them
+        async function decodeEmbeddedData(cache) {{
+            // Parse columnar issues data (header line + column blocks)
+            const issuesScript = document.getElementById('issuesData');
+            const issuesText = issuesScript.textContent;
+            const issuesLines = await splitLinesInSlices(issuesText);
+            
+            state.store = new IssueStore(JSON.parse(issuesLines[0]));
+            const allRows = new Uint32Array(state.store.size).map((_, i) => i);
+            state.rowHeights = new Uint16Array(state.store.size);
+            const showLoaded = () => {{
+                state.filteredRows = allRows.subarray(0, state.store.count);
+                document.getElementById('issuesCount').textContent =
+                    `Loaded ${{state.store.count}} of ${{state.store.size}} issues...`;
+                renderVisibleRows();
+            }};
+            if (issuesLines.length > 1) {{
+                state.store.appendBlock(JSON.parse(issuesLines[1]));
+                showLoaded();
+            }}
+            await processInSlices(issuesLines.length - 2,
+                i => state.store.appendBlock(JSON.parse(issuesLines[i + 2])), showLoaded);
+            
+            // The worker parses the search index text itself
+            const searchIndex = document.getElementById('searchIndexData').textContent;
+            state.filterEngine = new FilterEngine(state.store, issuesLines,
+                document.getElementById('filterWorkerSource').textContent, searchIndex);
+            
+            // Each order and facet value is parsed and decoded in its own step
+            const viewsLines = await splitLinesInSlices(document.getElementById('viewsData').textContent);
+            const views = JSON.parse(viewsLines[0]);
+            const issueViews = new IssueViews(views);
+            await processInSlices(viewsLines.length - 1, i => {{
+                const [kind, name, value, entry] = JSON.parse(viewsLines[i + 1]);
+                if (kind === 'order') {{
+                    views.orders[name] = value;
+                    issueViews.addOrder(name, value);
+                }} else {{
+                    views.facets[name][value] = entry;
+                    issueViews.addFacetValue(name, value, entry);
+                }}
+            }});
+            state.views = issueViews;
+            initFacetSelect('directory', 'directoryFacet');
+            initFacetSelect('check', 'checkFacet');
+            
+            console.log('Loaded', state.store.count, 'issues');
+            cache.put(CONFIG.DATA_HASH, {{ store: state.store.snapshot(), searchIndex, views }},
+                issuesText.length + searchIndex.length);
+        }}
+        
+        // Set up the store, filter worker and views from a cache entry
+        function restoreCachedData(cached) {{
+            state.store = IssueStore.fromSnapshot(cached.store);
+            state.rowHeights = new Uint16Array(state.store.size);
+            state.filterEngine = new FilterEngine(state.store, null,
+                document.getElementById('filterWorkerSource').textContent, cached.searchIndex);
+            state.views = new IssueViews(cached.views);
+            initFacetSelect('directory', 'directoryFacet');
+            initFacetSelect('check', 'checkFacet');
+        }}
+        
+        // Code context for a row, parsed from its embedded line on first use
+        function hasCodeContext(rowIndex) {{
+            return state.codeContextMap.has(rowIndex);
+        }}
+        
+        function getCodeContext(rowIndex) {{
+            const line = state.codeContextMap.get(rowIndex);
+            if (typeof line !== 'string') return line;
+            try {{
+                const context = JSON.parse(line).code_context;
+                state.codeContextMap.set(rowIndex, context);
+                return context;
+            }} catch (e) {{
+                console.error('Failed to parse code context:', e);
+                return undefined;
+            }}
+        }}
+        
         // Set up virtual scrolling
         function setupVirtualScroll() {{
             const viewport = document.getElementById('viewport');
@@ -340,173 +468,23 @@ class StandaloneVirtualDashboardGenerator:
                 renderVisibleRows();
             }};
             
+            adoptPrerenderedRows();
             updateContainerHeight();
             window.addEventListener('resize', updateContainerHeight);
             
-            // Handle scroll events
-            scrollContainer.addEventListener('scroll', debounce(() => {{
+            // Handle scroll events: one render per frame however many fire
+            scrollContainer.addEventListener('scroll', () => {{
                 state.scrollTop = scrollContainer.scrollTop;
-                renderVisibleRows();
-            }}, CONFIG.SCROLL_DEBOUNCE));
-        }}
-        
-        // Render visible rows based on scroll position
-        function renderVisibleRows() {{
-            const totalHeight = state.filteredIssues.length * CONFIG.ROW_HEIGHT;
-            const visibleStart = Math.floor(state.scrollTop / CONFIG.ROW_HEIGHT) - CONFIG.VISIBLE_BUFFER;
-            const visibleEnd = Math.ceil((state.scrollTop + state.containerHeight) / CONFIG.ROW_HEIGHT) + CONFIG.VISIBLE_BUFFER;
-            
-            state.visibleStart = Math.max(0, visibleStart);
-            state.visibleEnd = Math.min(state.filteredIssues.length, visibleEnd);
-            
-            // Update spacers
-            document.getElementById('spacerTop').style.height = (state.visibleStart * CONFIG.ROW_HEIGHT) + 'px';
-            document.getElementById('spacerBottom').style.height = 
-                ((state.filteredIssues.length - state.visibleEnd) * CONFIG.ROW_HEIGHT) + 'px';
-            
-            // Get visible issues
-            const visibleIssues = state.filteredIssues.slice(state.visibleStart, state.visibleEnd);
-            
-            // Render rows
-            const tbody = document.getElementById('issuesBody');
-            tbody.innerHTML = '';
-            
-            visibleIssues.forEach((issue, index) => {{
-                const row = createIssueRow(issue, state.visibleStart + index);
-                tbody.appendChild(row);
-            }});
+                scheduleRender();
+            }}, {{ passive: true }});
         }}
         
-        // Create issue row
-        function createIssueRow(issue, globalIndex) {{
-            const row = document.createElement('tr');
-            row.className = 'issue-row';
-            row.dataset.id = issue.id;
-            
-            const hasCodeContext = state.codeContextMap.has(issue.id);
-            
-            // Indicator cell (for code context)
-            const indicatorCell = document.createElement('td');
-            indicatorCell.className = 'indicator-cell';
-            if (hasCodeContext) {{
-                indicatorCell.innerHTML = '<div class="code-indicator"></div>';
-            }}
-            
-            // File cell
-            const fileCell = document.createElement('td');
-            fileCell.className = 'file-cell';
-            fileCell.title = issue.file || '';
-            fileCell.innerHTML = '<i class="fas fa-file-code"></i> ' + escapeHtml(getFileName(issue.file || ''));
-            
-            // Line cell
-            const lineCell = document.createElement('td');
-            lineCell.className = 'line-cell';
-            lineCell.textContent = issue.line || '-';
-            
-            // Severity cell
-            const severityCell = document.createElement('td');
-            const severityBadge = document.createElement('span');
-            severityBadge.className = 'severity-badge ' + (issue.severity || 'unknown');
-            severityBadge.textContent = (issue.severity || 'UNKNOWN').toUpperCase();
-            severityCell.appendChild(severityBadge);
-            
-            // Message cell
-            const messageCell = document.createElement('td');
-            messageCell.className = 'message-cell';
-            messageCell.title = issue.message || '';
-            messageCell.textContent = truncateMessage(issue.message || 'No message');
-            
-            // ID cell
-            const idCell = document.createElement('td');
-            idCell.className = 'id-cell';
-            idCell.textContent = issue.id || 'N/A';
-            
-            // Actions cell
-            const actionsCell = document.createElement('td');
-            actionsCell.className = 'actions-cell';
-            const actionBtn = document.createElement('button');
-            actionBtn.className = 'action-btn' + (hasCodeContext ? ' has-code' : '');
-            actionBtn.innerHTML = '<i class="fas ' + (hasCodeContext ? 'fa-code' : 'fa-eye') + '"></i>';
-            actionBtn.onclick = (e) => {{
-                e.stopPropagation();
-                showIssueDetails(issue, globalIndex);
-            }};
-            actionsCell.appendChild(actionBtn);
-            
-            // Add cells to row
-            row.appendChild(indicatorCell);
-            row.appendChild(fileCell);
-            row.appendChild(lineCell);
-            row.appendChild(severityCell);
-            row.appendChild(messageCell);
-            row.appendChild(idCell);
-            row.appendChild(actionsCell);
-            
-            // Row click handler
-            row.onclick = () => showIssueDetails(issue, globalIndex);
-            
-            return row;
-        }}
-        
-        // Filter data based on search and severity
-        function filterData() {{
-            const searchTerm = document.getElementById('searchInput').value.toLowerCase();
-            state.currentSearch = searchTerm;
-            
-            state.filteredIssues = state.allIssues.filter(issue => {{
-                // Severity filter
-                if (state.currentFilter !== 'all' && issue.severity !== state.currentFilter) {{
-                    return false;
-                }}
-                
-                // Search filter
-                if (searchTerm) {{
-                    const matchFile = (issue.file || '').toLowerCase().includes(searchTerm);
-                    const matchMessage = (issue.message || '').toLowerCase().includes(searchTerm);
-                    const matchId = (issue.id || '').toLowerCase().includes(searchTerm);
-                    return matchFile || matchMessage || matchId;
-                }}
-                
-                return true;
-            }});
-            
-            // Update count
-            updateIssueCount();
-            
-            // Reset scroll and render
-            document.getElementById('scrollContainer').scrollTop = 0;
-            state.scrollTop = 0;
-            renderVisibleRows();
-        }}
-        
-        // Update issue count display
-        function updateIssueCount() {{
-            const countEl = document.getElementById('issuesCount');
-            const filtered = state.filteredIssues.length;
-            const total = state.allIssues.length;
-            
-            if (filtered === total) {{
-                countEl.textContent = `Showing all ${{total}} issues`;
-            }} else {{
-                countEl.textContent = `Showing ${{filtered}} of ${{total}} issues`;
-            }}
-        }}
-        
-        // Set severity filter
-        function setSeverityFilter(severity, button) {{
-            state.currentFilter = severity;
-            
-            // Update button states
-            document.querySelectorAll('.filter-btn').forEach(btn => {{
-                btn.classList.remove('active');
-            }});
-            button.classList.add('active');
-            
-            filterData();
-        }}
+        {VIRTUAL_ROWS_JS}
         
         // Show issue details modal
-        function showIssueDetails(issue, index) {{
+        function showIssueDetails(rowIndex, index) {{
+            if (!state.store || rowIndex >= state.store.count) return;  // still loading
+            const issue = state.store.issue(rowIndex);
             const modal = document.getElementById('codeModal');
             const modalTitle = document.getElementById('modalTitle');
             const modalBody = document.getElementById('modalBody');
@@ -514,7 +492,7 @@ class StandaloneVirtualDashboardGenerator:
             modalTitle.innerHTML = '<i class="fas fa-file-code"></i> ' + 
                 escapeHtml(getFileName(issue.file || 'Unknown')) + ':' + (issue.line || '?');
             
-            const codeContext = state.codeContextMap.get(issue.id);
+            const codeContext = getCodeContext(rowIndex);
             
             // Build modal content
             let content = '<div class="issue-details">';
@@ -527,7 +505,7 @@ class StandaloneVirtualDashboardGenerator:
             content += '<tr><td><strong>Line:</strong></td><td>' + (issue.line || 'N/A') + '</td></tr>';
             content += '<tr><td><strong>Severity:</strong></td><td><span class="severity-badge ' + (issue.severity || 'unknown') + '">' + (issue.severity || 'UNKNOWN').toUpperCase() + '</span></td></tr>';
             content += '<tr><td><strong>Issue ID:</strong></td><td><code>' + (issue.id || 'N/A') + '</code></td></tr>';
-            content += '<tr><td><strong>Position:</strong></td><td>' + (index + 1) + ' of ' + state.filteredIssues.length + '</td></tr>';
+            content += '<tr><td><strong>Position:</strong></td><td>' + (index + 1) + ' of ' + state.filteredRows.length + '</td></tr>';
             content += '</table></div>';
             
             // Message
@@ -582,14 +560,6 @@ class StandaloneVirtualDashboardGenerator:
             return parts[parts.length - 1];
         }}
         
-        function truncateMessage(message) {{
-            const maxLength = 80;
-            if (message && message.length > maxLength) {{
-                return message.substring(0, maxLength - 3) + '...';
-            }}
-            return message || '';
-        }}
-        
         function debounce(func, wait) {{
             let timeout;
             return function executedFunction(...args) {{
@@ -648,12 +618,12 @@ class StandaloneVirtualDashboardGenerator:
             // Reset state with valid values
             state.scrollTop = 0;
             state.visibleStart = 0;
-            state.visibleEnd = Math.min(50, state.filteredIssues.length);
+            state.visibleEnd = Math.min(50, state.filteredRows.length);
             state.containerHeight = Math.max(400, rect.height || 600);
             
             console.log('📊 Recovery state:', {{
-                issues: state.allIssues.length,
-                filtered: state.filteredIssues.length,
+                issues: state.store.count,
+                filtered: state.filteredRows.length,
                 containerHeight: state.containerHeight,
                 containerStyle: {{
                     height: computedStyle.height,
@@ -935,6 +905,16 @@ class StandaloneVirtualDashboardGenerator:
             border-color: #667eea;
         }
         
+        .sort-select {
+            padding: 8px 10px;
+            border: 1px solid #e2e8f0;
+            border-radius: 6px;
+            background: white;
+            font-size: 0.85em;
+            font-family: inherit;
+            cursor: pointer;
+        }
+        
         /* Status bar */
         .status-bar {
             display: flex;
@@ -961,6 +941,7 @@ class StandaloneVirtualDashboardGenerator:
         .virtual-scroll-container {
             flex: 1;
             overflow-y: auto;
+            overflow-anchor: none; /* rows are re-anchored after measuring */
             background: white;
             margin: 0 20px 20px;
             border-radius: 8px;
@@ -1069,6 +1050,15 @@ class StandaloneVirtualDashboardGenerator:
             color: #2d3748;
         }
         
+        /* Full messages wrap; the virtual scroller measures each row */
+        .issue-row td.message-cell {
+            white-space: normal;
+            overflow-wrap: anywhere;
+            padding-top: 10px;
+            padding-bottom: 10px;
+            line-height: 1.4;
+        }
+        
         .id-cell {
             font-family: 'Monaco', 'Consolas', monospace;
             font-size: 0.85em;
@@ -7,52 +7,141 @@ Uses JSONL format for efficient data streaming and on-demand code loading
 import json
 from pathlib import Path
 from datetime import datetime
-import hashlib
 import os
 
+from columnar import ColumnarIssues, COLUMNAR_JS, DATA_CACHE_JS, FILTER_WORKER_JS, HEIGHT_INDEX_JS, content_hash
+from issue_loader import load_issues
+from issue_views import IssueViews
+from prerender import PRERENDER_ROWS, placeholder_height, prerender_rows
+from search_index import TrigramIndex
+from service_worker import register_js, service_worker_name, version_file, write_service_worker
+from virtual_rows import VIRTUAL_ROWS_JS
+
+# Files the page loads from <data_dir>/ (besides the context shards)
+DATA_FILES = ('issues.jsonl', 'search_index.json', 'views.json', 'context_index.json', 'code_context.jsonl')
+
+# Code contexts per shard file in <data_dir>/context/
+CONTEXT_SHARD_SIZE = 200
+
+# Rows per issues.jsonl block; small enough that the page can render the first
+# screen after the first block arrives while the rest is still streaming
+STREAM_BLOCK_SIZE = 1000
+
+# Height (px) assumed for rows that have not been measured yet
+ROW_HEIGHT = 50
+
 class VirtualScrollDashboardGenerator:
     def __init__(self, issues_file):
-        with open(issues_file) as f:
-            data = json.load(f)
-        self.issues = data.get('issues', [])
+        self.issues = load_issues(issues_file)
         self.timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        
-        # Generate unique IDs for each issue
-        for i, issue in enumerate(self.issues):
-            if 'id' not in issue:
-                id_str = f"{issue.get('file', '')}:{issue.get('line', '')}:{issue.get('message', '')}"
-                issue['id'] = hashlib.md5(id_str.encode()).hexdigest()[:8].upper()
     
     def generate_jsonl_data(self, output_dir):
         """Generate JSONL files for efficient streaming"""
         os.makedirs(output_dir, exist_ok=True)
         
-        # Write main issues data (without code context) as JSONL
+        # Write main issues data (without code context) as columnar JSONL:
+        # a dictionary header line followed by column blocks
         issues_jsonl_path = os.path.join(output_dir, 'issues.jsonl')
+        issues_text = ''.join(line + '\n' for line in ColumnarIssues(self.issues).lines(STREAM_BLOCK_SIZE))
         with open(issues_jsonl_path, 'w') as f:
-            for issue in self.issues:
-                # Create a copy without code context
-                issue_copy = {k: v for k, v in issue.items() if k != 'code_context'}
-                f.write(json.dumps(issue_copy) + '\n')
+            f.write(issues_text)
+        
+        # Trigram index for the search box, loaded alongside issues.jsonl
+        search_text = json.dumps(TrigramIndex(self.issues).to_json(), separators=(',', ':'))
+        with open(os.path.join(output_dir, 'search_index.json'), 'w') as f:
+            f.write(search_text)
+        
+        # Sort permutations and severity bitsets
+        views_text = json.dumps(IssueViews(self.issues).to_json(), separators=(',', ':'))
+        with open(os.path.join(output_dir, 'views.json'), 'w') as f:
+            f.write(views_text)
         
-        # Write code context separately for lazy loading
+        # Write code context separately for lazy loading, recording the byte
+        # offset of every line so single contexts can be fetched with Range
         code_jsonl_path = os.path.join(output_dir, 'code_context.jsonl')
-        with open(code_jsonl_path, 'w') as f:
-            for issue in self.issues:
+        offsets = [0]
+        with open(code_jsonl_path, 'wb') as f:
+            for row, issue in enumerate(self.issues):
                 if 'code_context' in issue:
                     context_data = {
+                        'row': row,
                         'id': issue['id'],
                         'code_context': issue['code_context']
                     }
-                    f.write(json.dumps(context_data) + '\n')
+                    line = (json.dumps(context_data) + '\n').encode('utf-8')
+                    f.write(line)
+                    offsets.append(offsets[-1] + len(line))
         
-        return issues_jsonl_path, code_jsonl_path
+        self.write_context_shards(output_dir, offsets)
+        
+        # The page caches what it decodes from these files under this key
+        data_hash = content_hash(issues_text, search_text, views_text)
+        
+        return issues_jsonl_path, code_jsonl_path, data_hash
+    
+    def write_context_shards(self, output_dir, offsets, shard_size=CONTEXT_SHARD_SIZE):
+        """Split code context into fixed-size shard files plus a row index
+        
+        The k-th issue with context (in row order) lives in shard k // shard_size
+        at offset k % shard_size, so the index only needs the sorted row list.
+        It is also line k of code_context.jsonl, spanning bytes
+        offsets[k] to offsets[k + 1] - 1.
+        """
+        shard_dir = os.path.join(output_dir, 'context')
+        os.makedirs(shard_dir, exist_ok=True)
+        for stale in Path(shard_dir).glob('shard-*.json'):  # includes hashed names
+            stale.unlink()
+        
+        rows = [row for row, issue in enumerate(self.issues) if 'code_context' in issue]
+        for shard, start in enumerate(range(0, len(rows), shard_size)):
+            shard_path = os.path.join(shard_dir, f'shard-{shard:04d}.json')
+            with open(shard_path, 'w') as f:
+                json.dump([self.issues[row]['code_context'] for row in rows[start:start + shard_size]], f)
+        
+        index_path = os.path.join(output_dir, 'context_index.json')
+        with open(index_path, 'w') as f:
+            json.dump({
+                'shardSize': shard_size,
+                'shards': (len(rows) + shard_size - 1) // shard_size,
+                'rows': rows,
+                'offsets': offsets
+            }, f, separators=(',', ':'))
+        
+        return index_path
+    
+    def version_data_files(self, data_dir):
+        """Rename the data files and context shards to content-hashed names
+        
+        The shard names are listed in context_index.json (as 'files') before
+        it is hashed itself. Returns {file name: hashed name} for DATA_FILES
+        and the hashed shard paths relative to data_dir.
+        """
+        shards = sorted(Path(data_dir, 'context').glob('shard-[0-9][0-9][0-9][0-9].json'))
+        shard_files = [version_file(path).name for path in shards]
+        
+        index_path = os.path.join(data_dir, 'context_index.json')
+        with open(index_path) as f:
+            index = json.load(f)
+        index['files'] = shard_files
+        with open(index_path, 'w') as f:
+            json.dump(index, f)
+        
+        files = {name: version_file(os.path.join(data_dir, name)).name for name in DATA_FILES}
+        return files, ['context/' + name for name in shard_files]
     
-    def generate(self, output_file, data_dir='dashboard_data'):
-        """Generate professional dashboard with virtual scrolling"""
+    def generate(self, output_file, data_dir='dashboard_data', service_worker=False):
+        """Generate professional dashboard with virtual scrolling
+        
+        With service_worker, the data files get content-hashed names and a
+        service worker that precaches them with the page is written next to it.
+        """
         
         # Generate JSONL data files
-        issues_jsonl, code_jsonl = self.generate_jsonl_data(data_dir)
+        issues_jsonl, code_jsonl, data_hash = self.generate_jsonl_data(data_dir)
+        files = {name: name for name in DATA_FILES}
+        shard_files = []
+        if service_worker:
+            files, shard_files = self.version_data_files(data_dir)
         
         # Calculate statistics
         stats = self.calculate_stats()
@@ -60,6 +149,12 @@ class VirtualScrollDashboardGenerator:
         # Count issues with code context
         with_context = sum(1 for i in self.issues if 'code_context' in i)
         
+        # Shown with the prerendered rows until the data is loaded
+        if len(self.issues) > PRERENDER_ROWS:
+            first_page_count = f'Showing first {PRERENDER_ROWS} of {len(self.issues)} issues (loading...)'
+        else:
+            first_page_count = f'Showing all {len(self.issues)} issues'
+        
         # Generate HTML
         html_content = f"""<!DOCTYPE html>
 <html lang="en">
@@ -130,30 +225,45 @@ class VirtualScrollDashboardGenerator:
             
             <div class="filter-buttons">
                 <button class="filter-btn active" onclick="setSeverityFilter('all', this)">
-                    <i class="fas fa-list"></i> All ({stats['total']})
+                    <i class="fas fa-list"></i> All (<span data-severity-count="all">{stats['total']}</span>)
                 </button>
                 <button class="filter-btn" onclick="setSeverityFilter('error', this)">
-                    <i class="fas fa-exclamation-circle"></i> Errors ({stats['errors']})
+                    <i class="fas fa-exclamation-circle"></i> Errors (<span data-severity-count="error">{stats['errors']}</span>)
                 </button>
                 <button class="filter-btn" onclick="setSeverityFilter('warning', this)">
-                    <i class="fas fa-exclamation-triangle"></i> Warnings ({stats['warnings']})
+                    <i class="fas fa-exclamation-triangle"></i> Warnings (<span data-severity-count="warning">{stats['warnings']}</span>)
                 </button>
                 <button class="filter-btn" onclick="setSeverityFilter('style', this)">
-                    <i class="fas fa-palette"></i> Style ({stats['style']})
+                    <i class="fas fa-palette"></i> Style (<span data-severity-count="style">{stats['style']}</span>)
                 </button>
                 <button class="filter-btn" onclick="setSeverityFilter('performance', this)">
-                    <i class="fas fa-tachometer-alt"></i> Performance ({stats['performance']})
+                    <i class="fas fa-tachometer-alt"></i> Performance (<span data-severity-count="performance">{stats['performance']}</span>)
                 </button>
                 <button class="filter-btn" onclick="setSeverityFilter('information', this)">
-                    <i class="fas fa-info-circle"></i> Info
+                    <i class="fas fa-info-circle"></i> Info (<span data-severity-count="information">{stats.get('information', 0)}</span>)
                 </button>
-            </div>
+            </div>            
+            <select class="sort-select" id="directoryFacet" onchange="setFacetFilter('directory', this.value)" title="Directory">
+                <option value="all" data-label="All directories">All directories</option>
+            </select>
+            
+            <select class="sort-select" id="checkFacet" onchange="setFacetFilter('check', this.value)" title="Check ID">
+                <option value="all" data-label="All checks">All checks</option>
+            </select>
+            
+            <select class="sort-select" id="sortSelect" onchange="setSortOrder(this.value)" title="Sort order">
+                <option value="default">Original order</option>
+                <option value="location">File &amp; line</option>
+                <option value="severity">Severity</option>
+                <option value="check">Check ID</option>
+                <option value="fileCount">Most issues per file</option>
+            </select>
         </div>
         
         <!-- Issues Count and Loading Status -->
         <div class="status-bar">
             <div class="issues-count">
-                <span id="issuesCount">Loading...</span>
+                <span id="issuesCount">{first_page_count}</span>
             </div>
             <div class="loading-status" id="loadingStatus" style="display: none;">
                 <i class="fas fa-spinner fa-spin"></i> <span id="loadingText">Loading...</span>
@@ -180,10 +290,11 @@ class VirtualScrollDashboardGenerator:
                     <div class="virtual-scroll-spacer" id="spacerTop"></div>
                     <table class="issues-table">
                         <tbody id="issuesBody">
-                            <!-- Virtual rows will be rendered here -->
+                            <!-- First rows are prerendered; the virtual scroller takes them over -->
+                            {prerender_rows(self.issues)}
                         </tbody>
                     </table>
-                    <div class="virtual-scroll-spacer" id="spacerBottom"></div>
+                    <div class="virtual-scroll-spacer" id="spacerBottom" style="height: {placeholder_height(len(self.issues), ROW_HEIGHT)}px;"></div>
                 </div>
             </div>
         </div>
@@ -202,30 +313,60 @@ class VirtualScrollDashboardGenerator:
         </div>
     </div>
     
+    <!-- Search/filter worker source, started from a Blob URL -->
+    <script id="filterWorkerSource" type="text/js-worker">
+        {FILTER_WORKER_JS}
+    </script>
+    
     <script>
+        {COLUMNAR_JS}
+        {HEIGHT_INDEX_JS}
+        {DATA_CACHE_JS}
+        
         // Configuration
         const CONFIG = {{
-            ROW_HEIGHT: 50,
+            ROW_HEIGHT: {ROW_HEIGHT}, // estimate for rows not yet measured
             VISIBLE_BUFFER: 5,
-            SCROLL_DEBOUNCE: 10,
             SEARCH_DEBOUNCE: 300,
             BATCH_SIZE: 50,
-            DATA_DIR: '{data_dir}'
+            CONTEXT_SHARD_CACHE: 8,
+            DATA_DIR: '{data_dir}',
+            DATA_FILES: {json.dumps(files)},
+            DATA_HASH: '{data_hash}'
         }};
         
         // Global state
         const state = {{
-            allIssues: [],
-            filteredIssues: [],
-            codeContextMap: new Map(),
-            loadedContextIds: new Set(),
+            store: null,
+            filterEngine: null,
+            views: null,
+            progressFrame: 0,
+            searchRows: null,
+            directoryFilter: 'all',
+            checkFilter: 'all',
+            sortOrder: 'default',
+            filteredRows: new Uint32Array(0),
+            contextSlots: new Int32Array(0),
+            contextShardSize: 1,
+            contextOffsets: null,
+            // Under the service worker the shards are precached, so skip
+            // Range requests (they always go to the network)
+            rangeRequests: !(navigator.serviceWorker && navigator.serviceWorker.controller),
+            contextFiles: null,
+            contextShards: new Map(),
+            contextRequests: new Map(),
             currentFilter: 'all',
             currentSearch: '',
             visibleStart: 0,
             visibleEnd: 0,
             isLoading: false,
             scrollTop: 0,
-            containerHeight: 0
+            containerHeight: 0,
+            rowPool: [],
+            rowHeights: new Uint16Array(0),
+            heightIndex: new HeightIndex(),
+            heightRows: null,
+            renderFrame: 0
         }};
         
         // Initialize
@@ -233,14 +374,16 @@ class VirtualScrollDashboardGenerator:
             try {{
                 showLoadingStatus('Loading issues data...');
                 
-                // Load issues from JSONL
-                await loadIssuesData();
-                
-                // Set up virtual scrolling
+                // Set up virtual scrolling first so rows can render while
+                // issues.jsonl is still streaming in
                 setupVirtualScroll();
                 
-                // Initial render
-                filterData();
+                // Load issues from JSONL, then the code context index
+                await loadIssuesData();
+                await loadContextIndex();
+                
+                // Full render with search and facets available
+                await filterData();
                 
                 hideLoadingStatus();
             }} catch (error) {{
@@ -249,54 +392,168 @@ class VirtualScrollDashboardGenerator:
             }}
         }}
         
-        // Load issues data from JSONL
+        // Stream issues data from JSONL: each column block is decoded as soon
+        // as its line arrives, and the first screen renders from the first block.
+        // Decoded data is cached in IndexedDB; a later visit to the same data
+        // skips the downloads and decoding.
         async function loadIssuesData() {{
             try {{
-                const response = await fetch('{data_dir}/issues.jsonl');
-                const text = await response.text();
-                const lines = text.trim().split('\\n');
+                const cache = new DataCache();
+                const cached = await cache.get(CONFIG.DATA_HASH);
+                if (cached) {{
+                    restoreCachedData(cached);
+                    console.log('Loaded', state.store.count, 'issues from cache');
+                    return;
+                }}
                 
-                state.allIssues = lines.map(line => {{
-                    try {{
-                        return JSON.parse(line);
-                    }} catch (e) {{
-                        console.error('Failed to parse line:', line);
-                        return null;
+                const sideData = Promise.all([
+                    fetch(CONFIG.DATA_DIR + '/' + CONFIG.DATA_FILES['search_index.json'])
+                        .then(response => response.ok ? response.text() : null)
+                        .catch(() => null),
+                    fetch(CONFIG.DATA_DIR + '/' + CONFIG.DATA_FILES['views.json']).then(response => response.json())
+                ]);
+                
+                const response = await fetch(CONFIG.DATA_DIR + '/' + CONFIG.DATA_FILES['issues.jsonl']);
+                const lines = [];
+                let allRows = null;
+                let size = 0;
+                await readLines(response, line => {{
+                    if (!line.trim()) return;
+                    lines.push(line);
+                    size += line.length;
+                    if (lines.length === 1) {{
+                        state.store = new IssueStore(JSON.parse(line));
+                        allRows = new Uint32Array(state.store.size).map((_, i) => i);
+                        state.rowHeights = new Uint16Array(state.store.size);
+                        return;
                     }}
-                }}).filter(Boolean);
+                    state.store.appendBlock(JSON.parse(line));
+                    state.filteredRows = allRows.subarray(0, state.store.count);
+                    scheduleProgressRender();
+                }});
+                
+                const [searchIndex, views] = await sideData;
+                state.filterEngine = new FilterEngine(state.store, lines,
+                    document.getElementById('filterWorkerSource').textContent, searchIndex);
+                state.views = new IssueViews(views);
+                initFacetSelect('directory', 'directoryFacet');
+                initFacetSelect('check', 'checkFacet');
                 
-                console.log('Loaded', state.allIssues.length, 'issues');
+                console.log('Loaded', state.store.count, 'issues');
+                cache.put(CONFIG.DATA_HASH, {{ store: state.store.snapshot(), searchIndex, views }},
+                    size + (searchIndex ? searchIndex.length : 0));
             }} catch (error) {{
                 console.error('Failed to load issues:', error);
                 throw error;
             }}
         }}
         
-        // Load code context for specific issue IDs
-        async function loadCodeContext(issueIds) {{
-            const idsToLoad = issueIds.filter(id => !state.loadedContextIds.has(id));
-            if (idsToLoad.length === 0) return;
-            
+        // Set up the store, filter worker and views from a cache entry
+        function restoreCachedData(cached) {{
+            state.store = IssueStore.fromSnapshot(cached.store);
+            state.rowHeights = new Uint16Array(state.store.size);
+            state.filterEngine = new FilterEngine(state.store, null,
+                document.getElementById('filterWorkerSource').textContent, cached.searchIndex);
+            state.views = new IssueViews(cached.views);
+            initFacetSelect('directory', 'directoryFacet');
+            initFacetSelect('check', 'checkFacet');
+        }}
+        
+        // Render rows and the running count at most once per frame while loading
+        function scheduleProgressRender() {{
+            if (state.progressFrame) return;
+            state.progressFrame = requestAnimationFrame(() => {{
+                state.progressFrame = 0;
+                if (state.views) return;
+                document.getElementById('issuesCount').textContent =
+                    `Loaded ${{state.store.count}} of ${{state.store.size}} issues...`;
+                renderVisibleRows();
+            }});
+        }}
+        
+        // Load the row -> (shard, offset) index for code context
+        async function loadContextIndex() {{
+            state.contextSlots = new Int32Array(state.store.count).fill(-1);
             try {{
-                const response = await fetch('{data_dir}/code_context.jsonl');
-                const text = await response.text();
-                const lines = text.trim().split('\\n');
-                
-                lines.forEach(line => {{
-                    try {{
-                        const data = JSON.parse(line);
-                        if (idsToLoad.includes(data.id)) {{
-                            state.codeContextMap.set(data.id, data.code_context);
-                            state.loadedContextIds.add(data.id);
-                        }}
-                    }} catch (e) {{
-                        console.error('Failed to parse code context:', e);
-                    }}
+                const response = await fetch(CONFIG.DATA_DIR + '/' + CONFIG.DATA_FILES['context_index.json']);
+                const index = await response.json();
+                state.contextShardSize = index.shardSize;
+                if (index.offsets) state.contextOffsets = Float64Array.from(index.offsets);
+                if (index.files) state.contextFiles = index.files;
+                index.rows.forEach((row, slot) => {{
+                    state.contextSlots[row] = slot;
                 }});
+                console.log('Code context available for', index.rows.length, 'issues in', index.shards, 'shards');
                 
-                console.log('Loaded code context for', idsToLoad.length, 'issues');
+                // Rows bound before this point show no code indicator; rebind them
+                state.rowPool.forEach(row => {{ row.rowIndex = -1; }});
+            }} catch (error) {{
+                console.error('Failed to load code context index:', error);
+            }}
+        }}
+        
+        // Fetch a context shard at most once while cached; cache is a small LRU
+        function loadContextShard(shard) {{
+            const cached = state.contextShards.get(shard);
+            if (cached) {{
+                state.contextShards.delete(shard);
+                state.contextShards.set(shard, cached);
+                return Promise.resolve(cached);
+            }}
+            
+            if (!state.contextRequests.has(shard)) {{
+                const name = state.contextFiles ? state.contextFiles[shard]
+                    : 'shard-' + String(shard).padStart(4, '0') + '.json';
+                const request = fetch(CONFIG.DATA_DIR + '/context/' + name)
+                    .then(response => response.json())
+                    .then(contexts => {{
+                        state.contextShards.set(shard, contexts);
+                        if (state.contextShards.size > CONFIG.CONTEXT_SHARD_CACHE) {{
+                            state.contextShards.delete(state.contextShards.keys().next().value);
+                        }}
+                        return contexts;
+                    }})
+                    .finally(() => state.contextRequests.delete(shard));
+                state.contextRequests.set(shard, request);
+            }}
+            return state.contextRequests.get(shard);
+        }}
+        
+        // Fetch one line of code_context.jsonl with a byte Range request;
+        // returns undefined if the server ignored the Range header
+        async function loadContextRange(slot) {{
+            const start = state.contextOffsets[slot];
+            const end = state.contextOffsets[slot + 1] - 1;
+            const response = await fetch(CONFIG.DATA_DIR + '/' + CONFIG.DATA_FILES['code_context.jsonl'], {{
+                headers: {{ 'Range': 'bytes=' + start + '-' + end }}
+            }});
+            if (response.status !== 206) {{
+                if (response.body) response.body.cancel();
+                state.rangeRequests = false;
+                return undefined;
+            }}
+            return JSON.parse(await response.text()).code_context;
+        }}
+        
+        // Code context for a store row, or null if the issue has none
+        function hasCodeContext(rowIndex) {{
+            return state.contextSlots[rowIndex] >= 0;
+        }}
+        
+        async function loadCodeContext(rowIndex) {{
+            const slot = state.contextSlots[rowIndex];
+            if (slot === undefined || slot < 0) return null;
+            
+            try {{
+                if (state.rangeRequests && state.contextOffsets) {{
+                    const context = await loadContextRange(slot);
+                    if (context !== undefined) return context;
+                }}
+                const contexts = await loadContextShard(Math.floor(slot / state.contextShardSize));
+                return contexts[slot % state.contextShardSize] || null;
             }} catch (error) {{
                 console.error('Failed to load code context:', error);
+                return null;
             }}
         }}
         
@@ -311,177 +568,23 @@ class VirtualScrollDashboardGenerator:
                 renderVisibleRows();
             }};
             
+            adoptPrerenderedRows();
             updateContainerHeight();
             window.addEventListener('resize', updateContainerHeight);
             
-            // Handle scroll events
-            scrollContainer.addEventListener('scroll', debounce(() => {{
+            // Handle scroll events: one render per frame however many fire
+            scrollContainer.addEventListener('scroll', () => {{
                 state.scrollTop = scrollContainer.scrollTop;
-                renderVisibleRows();
-            }}, CONFIG.SCROLL_DEBOUNCE));
+                scheduleRender();
+            }}, {{ passive: true }});
         }}
         
-        // Render visible rows based on scroll position
-        async function renderVisibleRows() {{
-            const totalHeight = state.filteredIssues.length * CONFIG.ROW_HEIGHT;
-            const visibleStart = Math.floor(state.scrollTop / CONFIG.ROW_HEIGHT) - CONFIG.VISIBLE_BUFFER;
-            const visibleEnd = Math.ceil((state.scrollTop + state.containerHeight) / CONFIG.ROW_HEIGHT) + CONFIG.VISIBLE_BUFFER;
-            
-            state.visibleStart = Math.max(0, visibleStart);
-            state.visibleEnd = Math.min(state.filteredIssues.length, visibleEnd);
-            
-            // Update spacers
-            document.getElementById('spacerTop').style.height = (state.visibleStart * CONFIG.ROW_HEIGHT) + 'px';
-            document.getElementById('spacerBottom').style.height = 
-                ((state.filteredIssues.length - state.visibleEnd) * CONFIG.ROW_HEIGHT) + 'px';
-            
-            // Get visible issues and their IDs
-            const visibleIssues = state.filteredIssues.slice(state.visibleStart, state.visibleEnd);
-            const visibleIds = visibleIssues.map(issue => issue.id).filter(Boolean);
-            
-            // Load code context for visible issues
-            await loadCodeContext(visibleIds);
-            
-            // Render rows
-            const tbody = document.getElementById('issuesBody');
-            tbody.innerHTML = '';
-            
-            visibleIssues.forEach((issue, index) => {{
-                const row = createIssueRow(issue, state.visibleStart + index);
-                tbody.appendChild(row);
-            }});
-        }}
-        
-        // Create issue row
-        function createIssueRow(issue, globalIndex) {{
-            const row = document.createElement('tr');
-            row.className = 'issue-row';
-            row.dataset.id = issue.id;
-            
-            const hasCodeContext = state.codeContextMap.has(issue.id);
-            
-            // Indicator cell (for code context)
-            const indicatorCell = document.createElement('td');
-            indicatorCell.className = 'indicator-cell';
-            if (hasCodeContext) {{
-                indicatorCell.innerHTML = '<div class="code-indicator"></div>';
-            }}
-            
-            // File cell
-            const fileCell = document.createElement('td');
-            fileCell.className = 'file-cell';
-            fileCell.title = issue.file || '';
-            fileCell.innerHTML = '<i class="fas fa-file-code"></i> ' + escapeHtml(getFileName(issue.file || ''));
-            
-            // Line cell
-            const lineCell = document.createElement('td');
-            lineCell.className = 'line-cell';
-            lineCell.textContent = issue.line || '-';
-            
-            // Severity cell
-            const severityCell = document.createElement('td');
-            const severityBadge = document.createElement('span');
-            severityBadge.className = 'severity-badge ' + (issue.severity || 'unknown');
-            severityBadge.textContent = (issue.severity || 'UNKNOWN').toUpperCase();
-            severityCell.appendChild(severityBadge);
-            
-            // Message cell
-            const messageCell = document.createElement('td');
-            messageCell.className = 'message-cell';
-            messageCell.title = issue.message || '';
-            messageCell.textContent = truncateMessage(issue.message || 'No message');
-            
-            // ID cell
-            const idCell = document.createElement('td');
-            idCell.className = 'id-cell';
-            idCell.textContent = issue.id || 'N/A';
-            
-            // Actions cell
-            const actionsCell = document.createElement('td');
-            actionsCell.className = 'actions-cell';
-            const actionBtn = document.createElement('button');
-            actionBtn.className = 'action-btn' + (hasCodeContext ? ' has-code' : '');
-            actionBtn.innerHTML = '<i class="fas ' + (hasCodeContext ? 'fa-code' : 'fa-eye') + '"></i>';
-            actionBtn.onclick = (e) => {{
-                e.stopPropagation();
-                showIssueDetails(issue, globalIndex);
-            }};
-            actionsCell.appendChild(actionBtn);
-            
-            // Add cells to row
-            row.appendChild(indicatorCell);
-            row.appendChild(fileCell);
-            row.appendChild(lineCell);
-            row.appendChild(severityCell);
-            row.appendChild(messageCell);
-            row.appendChild(idCell);
-            row.appendChild(actionsCell);
-            
-            // Row click handler
-            row.onclick = () => showIssueDetails(issue, globalIndex);
-            
-            return row;
-        }}
-        
-        // Filter data based on search and severity
-        function filterData() {{
-            const searchTerm = document.getElementById('searchInput').value.toLowerCase();
-            state.currentSearch = searchTerm;
-            
-            state.filteredIssues = state.allIssues.filter(issue => {{
-                // Severity filter
-                if (state.currentFilter !== 'all' && issue.severity !== state.currentFilter) {{
-                    return false;
-                }}
-                
-                // Search filter
-                if (searchTerm) {{
-                    const matchFile = (issue.file || '').toLowerCase().includes(searchTerm);
-                    const matchMessage = (issue.message || '').toLowerCase().includes(searchTerm);
-                    const matchId = (issue.id || '').toLowerCase().includes(searchTerm);
-                    return matchFile || matchMessage || matchId;
-                }}
-                
-                return true;
-            }});
-            
-            // Update count
-            updateIssueCount();
-            
-            // Reset scroll and render
-            document.getElementById('scrollContainer').scrollTop = 0;
-            state.scrollTop = 0;
-            renderVisibleRows();
-        }}
-        
-        // Update issue count display
-        function updateIssueCount() {{
-            const countEl = document.getElementById('issuesCount');
-            const filtered = state.filteredIssues.length;
-            const total = state.allIssues.length;
-            
-            if (filtered === total) {{
-                countEl.textContent = `Showing all ${{total}} issues`;
-            }} else {{
-                countEl.textContent = `Showing ${{filtered}} of ${{total}} issues`;
-            }}
-        }}
-        
-        // Set severity filter
-        function setSeverityFilter(severity, button) {{
-            state.currentFilter = severity;
-            
-            // Update button states
-            document.querySelectorAll('.filter-btn').forEach(btn => {{
-                btn.classList.remove('active');
-            }});
-            button.classList.add('active');
-            
-            filterData();
-        }}
+        {VIRTUAL_ROWS_JS}
         
         // Show issue details modal
-        async function showIssueDetails(issue, index) {{
+        async function showIssueDetails(rowIndex, index) {{
+            if (!state.store || rowIndex >= state.store.count) return;  // still loading
+            const issue = state.store.issue(rowIndex);
             const modal = document.getElementById('codeModal');
             const modalTitle = document.getElementById('modalTitle');
             const modalBody = document.getElementById('modalBody');
@@ -489,14 +592,10 @@ class VirtualScrollDashboardGenerator:
             modalTitle.innerHTML = '<i class="fas fa-file-code"></i> ' + 
                 escapeHtml(getFileName(issue.file || 'Unknown')) + ':' + (issue.line || '?');
             
-            // Ensure code context is loaded
-            if (issue.id && !state.codeContextMap.has(issue.id)) {{
-                showLoadingStatus('Loading code context...');
-                await loadCodeContext([issue.id]);
-                hideLoadingStatus();
-            }}
-            
-            const codeContext = state.codeContextMap.get(issue.id);
+            // Fetch the shard holding this issue's code context (if not cached)
+            showLoadingStatus('Loading code context...');
+            const codeContext = await loadCodeContext(rowIndex);
+            hideLoadingStatus();
             
             // Build modal content
             let content = '<div class="issue-details">';
@@ -509,7 +608,7 @@ class VirtualScrollDashboardGenerator:
             content += '<tr><td><strong>Line:</strong></td><td>' + (issue.line || 'N/A') + '</td></tr>';
             content += '<tr><td><strong>Severity:</strong></td><td><span class="severity-badge ' + (issue.severity || 'unknown') + '">' + (issue.severity || 'UNKNOWN').toUpperCase() + '</span></td></tr>';
             content += '<tr><td><strong>Issue ID:</strong></td><td><code>' + (issue.id || 'N/A') + '</code></td></tr>';
-            content += '<tr><td><strong>Position:</strong></td><td>' + (index + 1) + ' of ' + state.filteredIssues.length + '</td></tr>';
+            content += '<tr><td><strong>Position:</strong></td><td>' + (index + 1) + ' of ' + state.filteredRows.length + '</td></tr>';
             content += '</table></div>';
             
             // Message
@@ -564,14 +663,6 @@ class VirtualScrollDashboardGenerator:
             return parts[parts.length - 1];
         }}
         
-        function truncateMessage(message) {{
-            const maxLength = 80;
-            if (message && message.length > maxLength) {{
-                return message.substring(0, maxLength - 3) + '...';
-            }}
-            return message || '';
-        }}
-        
         function debounce(func, wait) {{
             let timeout;
             return function executedFunction(...args) {{
@@ -611,19 +702,30 @@ class VirtualScrollDashboardGenerator:
         }} else {{
             initialize();
         }}
+        {register_js(service_worker_name(output_file)) if service_worker else ''}
     </script>
 </body>
 </html>"""
         
         with open(output_file, 'w', encoding='utf-8') as f:
             f.write(html_content)
-            
+        
+        # Precache everything but code_context.jsonl, which is only read by
+        # Range requests (the shards hold the same contexts)
+        if service_worker:
+            worker_path = write_service_worker(output_file, [
+                f'{data_dir}/{files[name]}' for name in DATA_FILES if name != 'code_context.jsonl'
+            ] + [f'{data_dir}/{name}' for name in shard_files])
+        
         print(f"✅ Virtual scroll dashboard generated: {output_file}")
         print(f"   Total issues: {len(self.issues)}")
         print(f"   Issues with code context: {with_context}")
         print(f"   Data directory: {data_dir}/")
-        print(f"   - issues.jsonl: {os.path.getsize(os.path.join(data_dir, 'issues.jsonl')) / 1024:.1f} KB")
-        print(f"   - code_context.jsonl: {os.path.getsize(os.path.join(data_dir, 'code_context.jsonl')) / 1024:.1f} KB")
+        for name in ('issues.jsonl', 'search_index.json', 'views.json', 'code_context.jsonl'):
+            print(f"   - {files[name]}: {os.path.getsize(os.path.join(data_dir, files[name])) / 1024:.1f} KB")
+        print(f"   - context/: {(with_context + CONTEXT_SHARD_SIZE - 1) // CONTEXT_SHARD_SIZE} shards of up to {CONTEXT_SHARD_SIZE} contexts")
+        if service_worker:
+            print(f"   Service worker: {worker_path}")
         
     def calculate_stats(self):
         """Calculate issue statistics"""
@@ -857,6 +959,16 @@ class VirtualScrollDashboardGenerator:
             border-color: #667eea;
         }
         
+        .sort-select {
+            padding: 8px 10px;
+            border: 1px solid #e2e8f0;
+            border-radius: 6px;
+            background: white;
+            font-size: 0.85em;
+            font-family: inherit;
+            cursor: pointer;
+        }
+        
         /* Status bar */
         .status-bar {
             display: flex;
@@ -883,6 +995,7 @@ class VirtualScrollDashboardGenerator:
         .virtual-scroll-container {
             flex: 1;
             overflow-y: auto;
+            overflow-anchor: none; /* rows are re-anchored after measuring */
             background: white;
             margin: 0 20px 20px;
             border-radius: 8px;
@@ -991,6 +1104,15 @@ class VirtualScrollDashboardGenerator:
             color: #2d3748;
         }
         
+        /* Full messages wrap; the virtual scroller measures each row */
+        .issue-row td.message-cell {
+            white-space: normal;
+            overflow-wrap: anywhere;
+            padding-top: 10px;
+            padding-bottom: 10px;
+            line-height: 1.4;
+        }
+        
         .id-cell {
             font-family: 'Monaco', 'Consolas', monospace;
             font-size: 0.85em;
@@ -1374,12 +1496,13 @@ class VirtualScrollDashboardGenerator:
 if __name__ == '__main__':
     import sys
     
-    if len(sys.argv) < 2:
-        print("Usage: generate-virtual-scroll-dashboard.py <analysis.json> [output.html]")
+    args = [arg for arg in sys.argv[1:] if arg != '--service-worker']
+    if not args:
+        print("Usage: generate-virtual-scroll-dashboard.py <analysis.json> [output.html] [--service-worker]")
         sys.exit(1)
         
-    input_file = sys.argv[1]
-    output_file = sys.argv[2] if len(sys.argv) > 2 else 'virtual-scroll-dashboard.html'
+    input_file = args[0]
+    output_file = args[1] if len(args) > 1 else 'virtual-scroll-dashboard.html'
     
     generator = VirtualScrollDashboardGenerator(input_file)
-    generator.generate(output_file)
\ No newline at end of file
+    generator.generate(output_file, service_worker='--service-worker' in sys.argv)
\ No newline at end of file
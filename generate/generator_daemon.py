@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+"""
+Generator daemon
+Keeps the dashboard generators imported in a pool of pre-forked worker
+processes and runs generate jobs sent over a Unix socket, so a batch of
+thousands of dashboards pays interpreter startup, imports and the shared JS
+templates once instead of once per dashboard
+
+    python3 generate/generator_daemon.py serve [--socket PATH] [--workers N]
+    python3 generate/generator_daemon.py generate <type> <analysis.json> <output.html> [--service-worker]
+    python3 generate/generator_daemon.py batch [jobs.tsv]
+    python3 generate/generator_daemon.py stats
+    python3 generate/generator_daemon.py stop
+
+The protocol is one JSON object per line in each direction, so jobs can also
+be sent with socat or nc -U. A job is
+    {"type": "standalone", "input": "...", "output": "...", "cwd": "...",
+     "options": {"service_worker": true}, "id": 1}
+and is answered with {"id": 1, "ok": true, "output": "...", "seconds": 0.05}
+(or "ok": false and "error"). {"command": "stats"} and {"command": "stop"}
+control the daemon. Batch files hold one "<type> <input> <output>" job per
+line, tab- or space-separated.
+"""
+
+import importlib.util
+import io
+import json
+import os
+import queue
+import socket
+import sys
+import threading
+import time
+import warnings
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+
+GENERATE_DIR = Path(__file__).parent.resolve()
+
+# Job type -> (script, generator class, generate() options it accepts)
+GENERATORS = {
+    'standalone': ('generate-standalone-virtual-dashboard.py', 'StandaloneVirtualDashboardGenerator', ()),
+    'virtual-scroll': ('generate-virtual-scroll-dashboard.py', 'VirtualScrollDashboardGenerator', ('service_worker',)),
+    'split': ('generate-split-dashboard.py', 'SplitDashboardGenerator', ('service_worker',)),
+    'production': ('generate-production-dashboard.py', 'ProductionDashboardGenerator', ()),
+    'simple': ('generate-simple-dashboard.py', 'SimpleDashboardGenerator', ()),
+    'optimized': ('generate-optimized-dashboard.py', 'OptimizedDashboardGenerator', ()),
+}
+
+# Generator classes, loaded once in the daemon before the workers fork
+LOADED = {}
+
+
+def default_socket_path():
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime_dir:
+        return os.path.join(runtime_dir, 'cppcheck-studio-generator.sock')
+    return f'/tmp/cppcheck-studio-generator-{os.getuid()}.sock'
+
+
+def load_generators():
+    """Import every generator script (they are not importable by name)"""
+    sys.path.insert(0, str(GENERATE_DIR))
+    for job_type, (script, class_name, _) in GENERATORS.items():
+        spec = importlib.util.spec_from_file_location(script[:-3].replace('-', '_'), GENERATE_DIR / script)
+        module = importlib.util.module_from_spec(spec)
+        # Deprecated generators print and warn on import; every type is
+        # loaded whether or not a job will ask for it
+        with redirect_stdout(io.StringIO()), redirect_stderr(io.StringIO()), warnings.catch_warnings():
+            warnings.simplefilter('ignore', DeprecationWarning)
+            spec.loader.exec_module(module)
+        LOADED[job_type] = getattr(module, class_name)
+
+
+def run_job(job):
+    """Run one generate job in a worker; its console output is captured"""
+    started = time.perf_counter()
+    log = io.StringIO()
+    try:
+        job_type = job.get('type')
+        if job_type not in LOADED:
+            raise ValueError(f'unknown generator type {job_type!r}; expected one of {", ".join(GENERATORS)}')
+        accepted = GENERATORS[job_type][2]
+        options = {name: value for name, value in job.get('options', {}).items() if name in accepted}
+        # Relative paths (including the data directories some generators
+        # write next to the page) resolve against the client's directory
+        os.chdir(job.get('cwd') or '/')
+        with redirect_stdout(log), redirect_stderr(log):
+            generator = LOADED[job_type](job['input'])
+            generator.generate(job['output'], **options)
+        result = {'ok': True, 'output': job['output']}
+    except BaseException as error:  # generators call sys.exit() on bad input
+        result = {'ok': False, 'error': f'{type(error).__name__}: {error}'}
+    result.update(id=job.get('id'), seconds=round(time.perf_counter() - started, 4), log=log.getvalue())
+    return result
+
+
+def warm_up(_):
+    return os.getpid()
+
+
+class GeneratorDaemon:
+    """Unix socket server feeding jobs to a pool of warm worker processes"""
+
+    def __init__(self, socket_path=None, workers=None):
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        self.socket_path = socket_path or default_socket_path()
+        self.workers = workers or os.cpu_count() or 1
+        load_generators()
+        # Fork every worker now, from a single-threaded process that already
+        # holds the imported generators
+        self.pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context('fork'))
+        list(self.pool.map(warm_up, range(self.workers)))
+
+        self.started = time.monotonic()
+        self.lock = threading.Lock()
+        self.jobs = 0
+        self.failed = 0
+        self.busy_seconds = 0.0
+        self.stopping = threading.Event()
+
+    def serve_forever(self):
+        if os.path.exists(self.socket_path):
+            if is_listening(self.socket_path):
+                raise RuntimeError(f'a daemon is already listening on {self.socket_path}')
+            os.unlink(self.socket_path)
+        self.server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.server.bind(self.socket_path)
+        os.chmod(self.socket_path, 0o600)
+        self.server.listen(64)
+        # Wake up regularly to notice stop()
+        self.server.settimeout(0.2)
+        try:
+            while not self.stopping.is_set():
+                try:
+                    connection, _ = self.server.accept()
+                except socket.timeout:
+                    continue
+                threading.Thread(target=self.handle, args=(connection,), daemon=True).start()
+        finally:
+            self.close()
+
+    def close(self):
+        self.stopping.set()
+        self.server.close()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        self.pool.shutdown(wait=True)
+
+    def stop(self):
+        self.stopping.set()
+
+    def handle(self, connection):
+        """Answer the requests on one connection; jobs run concurrently and
+        are answered as they finish, tagged with their id
+
+        Replies are queued and written by this thread only: a client that
+        stops reading blocks its own connection, never the pool's callbacks
+        or other clients.
+        """
+        replies = queue.Queue()
+        reader = threading.Thread(target=self.read_requests, args=(connection, replies), daemon=True)
+        reader.start()
+        with connection:
+            reading = True
+            running = 0
+            connected = True
+            while reading or running:
+                kind, message = replies.get()
+                if kind == 'submitted':
+                    running += 1
+                    continue
+                if kind == 'end':
+                    reading = False
+                    continue
+                if kind == 'result':
+                    running -= 1
+                if connected:
+                    try:
+                        connection.sendall((json.dumps(message) + '\n').encode('utf-8'))
+                    except OSError:
+                        connected = False  # client went away; its jobs still count
+
+    def read_requests(self, connection, replies):
+        """Parse one connection's requests into (kind, message) entries on replies"""
+
+        def finished(future):
+            result = future.result()
+            with self.lock:
+                self.jobs += 1
+                self.failed += not result['ok']
+                self.busy_seconds += result['seconds']
+            replies.put(('result', result))
+
+        try:
+            with connection.makefile('r', encoding='utf-8') as lines:
+                for line in lines:
+                    if not line.strip():
+                        continue
+                    try:
+                        request = json.loads(line)
+                    except ValueError:
+                        replies.put(('reply', {'ok': False, 'error': 'invalid JSON'}))
+                        continue
+                    if not isinstance(request, dict):
+                        replies.put(('reply', {'ok': False, 'error': 'expected a JSON object'}))
+                        continue
+                    command = request.get('command', 'generate')
+                    if command == 'stats':
+                        replies.put(('reply', self.stats()))
+                    elif command == 'stop':
+                        replies.put(('reply', {'ok': True}))
+                        self.stop()
+                        break
+                    elif command == 'generate':
+                        # Counted before the callback can report it
+                        replies.put(('submitted', None))
+                        self.pool.submit(run_job, request).add_done_callback(finished)
+                    else:
+                        replies.put(('reply', {'ok': False, 'error': f'unknown command {command!r}'}))
+        except (OSError, ValueError):
+            pass  # connection reset or undecodable input: answer what was sent
+        finally:
+            replies.put(('end', None))
+
+    def stats(self):
+        with self.lock:
+            uptime = time.monotonic() - self.started
+            return {
+                'ok': True,
+                'workers': self.workers,
+                'jobs': self.jobs,
+                'failed': self.failed,
+                'uptime': round(uptime, 3),
+                'mean_seconds': round(self.busy_seconds / self.jobs, 4) if self.jobs else 0,
+                'jobs_per_second': round(self.jobs / uptime, 2) if uptime else 0
+            }
+
+
+def is_listening(socket_path):
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            probe.connect(socket_path)
+        return True
+    except OSError:
+        return False
+
+
+class GeneratorClient:
+    """Connection to a running daemon; requests can be pipelined"""
+
+    def __init__(self, socket_path=None):
+        self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.socket.connect(socket_path or default_socket_path())
+        self.replies = self.socket.makefile('r', encoding='utf-8')
+        self.next_id = 0
+
+    def send(self, request):
+        self.socket.sendall((json.dumps(request) + '\n').encode('utf-8'))
+
+    def submit(self, job_type, input_file, output_file, **options):
+        """Queue a job without waiting; returns its id"""
+        self.next_id += 1
+        self.send({
+            'id': self.next_id,
+            'type': job_type,
+            'input': input_file,
+            'output': output_file,
+            'cwd': os.getcwd(),
+            'options': options
+        })
+        return self.next_id
+
+    def receive(self):
+        line = self.replies.readline()
+        if not line:
+            raise ConnectionError('daemon closed the connection')
+        return json.loads(line)
+
+    def request(self, request):
+        self.send(request)
+        return self.receive()
+
+    def generate(self, job_type, input_file, output_file, **options):
+        self.submit(job_type, input_file, output_file, **options)
+        return self.receive()
+
+    def close(self):
+        self.replies.close()
+        self.socket.close()
+
+
+def print_result(result, job_type, latency):
+    if result['ok']:
+        print(f"✅ {job_type}: {result['output']} in {result['seconds'] * 1000:.1f} ms "
+              f"({latency * 1000:.1f} ms round trip)")
+    else:
+        print(f"❌ {job_type}: {result['error']}")
+        if result.get('log'):
+            print(result['log'], end='')
+
+
+def run_batch(client, lines):
+    """Pipeline every job, then report per-job latency and throughput"""
+    jobs = {}
+    started = time.perf_counter()
+    for line in lines:
+        fields = line.split()
+        if not fields or fields[0].startswith('#'):
+            continue
+        if len(fields) != 3:
+            print(f"⚠️  Skipping malformed job line: {line.rstrip()}")
+            continue
+        jobs[client.submit(*fields)] = (fields[0], time.perf_counter())
+
+    failed = 0
+    for _ in range(len(jobs)):
+        result = client.receive()
+        job_type, submitted = jobs[result['id']]
+        print_result(result, job_type, time.perf_counter() - submitted)
+        failed += not result['ok']
+
+    elapsed = time.perf_counter() - started
+    print(f"\n📊 {len(jobs)} jobs in {elapsed:.2f}s "
+          f"({len(jobs) / elapsed if elapsed else 0:.1f} jobs/s), {failed} failed")
+    return failed
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    socket_path = None
+    workers = None
+    if '--socket' in args:
+        socket_path = args.pop(args.index('--socket') + 1)
+        args.remove('--socket')
+    if '--workers' in args:
+        workers = int(args.pop(args.index('--workers') + 1))
+        args.remove('--workers')
+    service_worker = '--service-worker' in args
+    args = [arg for arg in args if arg != '--service-worker']
+
+    if not args or args[0] not in ('serve', 'generate', 'batch', 'stats', 'stop'):
+        print(__doc__.strip().split('\n\n')[1])
+        sys.exit(1)
+
+    if args[0] == 'serve':
+        daemon = GeneratorDaemon(socket_path, workers)
+        print(f"🚀 Generator daemon listening on {daemon.socket_path} with {daemon.workers} workers")
+        print(f"   Generators: {', '.join(GENERATORS)}")
+        try:
+            daemon.serve_forever()
+        except KeyboardInterrupt:
+            print("\nShutting down daemon...")
+        sys.exit(0)
+
+    try:
+        client = GeneratorClient(socket_path)
+    except OSError as error:
+        print(f"❌ Cannot reach the generator daemon: {error}")
+        print("   Start it with: python3 generate/generator_daemon.py serve")
+        sys.exit(2)
+
+    if args[0] == 'generate':
+        if len(args) != 4:
+            print("Usage: generator_daemon.py generate <type> <analysis.json> <output.html> [--service-worker]")
+            sys.exit(1)
+        started = time.perf_counter()
+        options = {'service_worker': True} if service_worker else {}
+        result = client.generate(args[1], args[2], args[3], **options)
+        print_result(result, args[1], time.perf_counter() - started)
+        sys.exit(0 if result['ok'] else 1)
+    elif args[0] == 'batch':
+        with (open(args[1]) if len(args) > 1 else sys.stdin) as lines:
+            sys.exit(1 if run_batch(client, lines) else 0)
+    elif args[0] == 'stats':
+        print(json.dumps(client.request({'command': 'stats'}), indent=2))
+    else:
+        client.request({'command': 'stop'})
+        print("🛑 Generator daemon stopped")
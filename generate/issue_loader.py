@@ -0,0 +1,24 @@
+"""
+Shared issue loading for dashboard generators and the query API
+Reads a cppcheck-studio analysis JSON file and gives every issue a stable id
+"""
+
+import hashlib
+import json
+
+
+def issue_id(issue):
+    """Short stable id for an issue without one, from its location and message"""
+    id_str = f"{issue.get('file', '')}:{issue.get('line', '')}:{issue.get('message', '')}"
+    return hashlib.md5(id_str.encode()).hexdigest()[:8].upper()
+
+
+def load_issues(issues_file):
+    """The 'issues' list of an analysis file, with an 'id' on every issue"""
+    with open(issues_file) as f:
+        data = json.load(f)
+    issues = data.get('issues', [])
+    for issue in issues:
+        if 'id' not in issue:
+            issue['id'] = issue_id(issue)
+    return issues
@@ -0,0 +1,343 @@
+"""
+Precomputed views for generated dashboards
+Sort permutations and facet row sets (severity, check id, top-level directory),
+so switching order or filters in the browser is an index swap or a bitset AND
+instead of a sort or a full re-filter
+"""
+
+import base64
+
+from search_index import encode_postings
+
+# Severity order for the "severity" view (unknown severities sort last)
+SEVERITY_RANK = {
+    'error': 0,
+    'warning': 1,
+    'performance': 2,
+    'portability': 3,
+    'style': 4,
+    'information': 5,
+}
+
+
+# Most values a page facet lists; the rest are merged into OTHER_VALUE, so
+# issues without a real check id (one hashed id each) cannot turn every
+# query's counting and the facet <select> into one entry per issue
+FACET_LIMIT = 100
+OTHER_VALUE = '(other)'
+
+
+def to_line(value):
+    """Line number as int for sorting, 0 if unusable"""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def encode_row_array(rows, count):
+    """Little-endian Uint16 (count <= 65536) or Uint32 row array as base64"""
+    width = 2 if count <= 0x10000 else 4
+    data = b''.join(row.to_bytes(width, 'little') for row in rows)
+    return base64.b64encode(data).decode('ascii')
+
+
+def encode_bitset(rows, count):
+    """Bitset of count bits (bit row % 8 of byte row // 8) as base64, padded to
+    whole 32-bit words so the page can AND and popcount it a word at a time"""
+    bits = bytearray((count + 31) // 32 * 4)
+    for row in rows:
+        bits[row >> 3] |= 1 << (row & 7)
+    return base64.b64encode(bytes(bits)).decode('ascii')
+
+
+def encode_row_set(rows, count):
+    """A facet's rows as a bitset, or as a varint posting list when sparse
+    (at roughly 1-2 bytes a row, a list is smaller below count / 16 rows)"""
+    if len(rows) * 16 >= count:
+        return {'bits': encode_bitset(rows, count)}
+    return {'rows': base64.b64encode(encode_postings(rows)).decode('ascii')}
+
+
+def limit_facet(values, limit=FACET_LIMIT):
+    """values (value -> rows) with at most limit entries: the limit - 1
+    largest, plus OTHER_VALUE holding the rows of all the others"""
+    if len(values) <= limit:
+        return values
+    ranked = sorted(values.items(), key=lambda item: (-len(item[1]), item[0]))
+    kept = dict(ranked[:limit - 1])
+    kept[OTHER_VALUE] = sorted(row for _, rows in ranked[limit - 1:] for row in rows)
+    return kept
+
+
+def common_directory(paths):
+    """Number of leading directory segments shared by every path"""
+    split = [path.split('/')[:-1] for path in paths]
+    if not split:
+        return 0
+    shared = 0
+    for segments in zip(*split):
+        if any(segment != segments[0] for segment in segments):
+            break
+        shared += 1
+    return shared
+
+
+def top_directory(path, shared):
+    """First directory below the shared prefix ('./' for files directly in it)"""
+    segments = path.split('/')[shared:]
+    return segments[0] + '/' if len(segments) > 1 else './'
+
+
+class IssueViews:
+    """Sort permutations and severity bitsets over issue rows"""
+
+    def __init__(self, issues):
+        self.count = len(issues)
+        files = [issue.get('file') or '' for issue in issues]
+        lines = [to_line(issue.get('line')) for issue in issues]
+        file_counts = {}
+        for file in files:
+            file_counts[file] = file_counts.get(file, 0) + 1
+
+        def location(row):
+            return files[row], lines[row], row
+
+        rows = range(self.count)
+        self.orders = {
+            'location': sorted(rows, key=location),
+            'severity': sorted(rows, key=lambda row: (
+                SEVERITY_RANK.get(issues[row].get('severity'), len(SEVERITY_RANK)),) + location(row)),
+            'check': sorted(rows, key=lambda row: (str(issues[row].get('id', '')),) + location(row)),
+            'fileCount': sorted(rows, key=lambda row: (-file_counts[files[row]],) + location(row)),
+        }
+
+        # Facet value -> rows, for each facet the page can filter and count by
+        shared = common_directory(files)
+        self.facets = {'severity': {}, 'check': {}, 'directory': {}}
+        for row, issue in enumerate(issues):
+            self.facets['severity'].setdefault(issue.get('severity', ''), []).append(row)
+            self.facets['check'].setdefault(str(issue.get('id', '')), []).append(row)
+            self.facets['directory'].setdefault(top_directory(files[row], shared), []).append(row)
+
+    def to_json(self):
+        return {
+            'count': self.count,
+            'orders': {name: encode_row_array(rows, self.count) for name, rows in self.orders.items()},
+            'facets': {
+                facet: {value: encode_row_set(rows, self.count)
+                        for value, rows in (values if facet == 'severity' else limit_facet(values)).items()}
+                for facet, values in self.facets.items()
+            }
+        }
+
+    def to_json_lines(self):
+        """to_json() as a skeleton without orders or facet values, followed by
+        one ['order', name, data] or ['facet', facet, value, entry] item each,
+        so a page can parse and decode them one slice at a time"""
+        views = self.to_json()
+        items = [{'count': views['count'], 'orders': {}, 'facets': {facet: {} for facet in views['facets']}}]
+        items += [['order', name, data] for name, data in views['orders'].items()]
+        items += [['facet', facet, value, entry]
+                  for facet, values in views['facets'].items() for value, entry in values.items()]
+        return items
+
+
+# Browser-side reader for IssueViews.to_json(). Plain string (not an f-string)
+# like the JS snippets in columnar.py.
+ISSUE_VIEWS_JS = """
+        // Precomputed sort permutations and facet row sets
+        class IssueViews {
+            constructor(views) {
+                this.count = views.count;
+                this.words = (views.count + 31) >>> 5;
+                this.orders = {};
+                Object.entries(views.orders).forEach(([name, data]) => this.addOrder(name, data));
+                this.facets = {};
+                Object.entries(views.facets).forEach(([facet, values]) => {
+                    this.facets[facet] = new Map();
+                    Object.entries(values).forEach(([value, entry]) => this.addFacetValue(facet, value, entry));
+                });
+                this.allRows = new Uint32Array(this.words).fill(0xffffffff);
+                if (views.count & 31) this.allRows[this.words - 1] = (1 << (views.count & 31)) - 1;
+            }
+
+            // Built up one item at a time from a to_json_lines() skeleton
+            addOrder(name, data) {
+                this.orders[name] = decodeRowArray(data, this.count);
+            }
+
+            addFacetValue(facet, value, entry) {
+                this.facets[facet].set(value, new FacetSet(entry, this.words));
+            }
+
+            hasSeverity(severity, row) {
+                const set = this.facets.severity.get(severity);
+                return set !== undefined && set.has(row);
+            }
+
+            // Rows of one severity ('all' for every row) in a precomputed order
+            select(severity, name) {
+                return this.query(null, { severity }, name).rows;
+            }
+
+            // Apply facet selections ({facet: value or 'all'}) on top of an
+            // optional row subset (e.g. search hits), in a precomputed order.
+            // Also counts every facet value against the other facets'
+            // selections, so each facet shows what picking a value would give.
+            query(subset, selection, name) {
+                const base = subset ? rowsToWords(subset, this.words) : this.allRows;
+                const masks = {};
+                let empty = false;
+                Object.entries(selection).forEach(([facet, value]) => {
+                    if (value === 'all' || !this.facets[facet]) return;
+                    const set = this.facets[facet].get(value);
+                    if (set) masks[facet] = set.toWords(this.words);
+                    else empty = true;
+                });
+
+                const counts = {};
+                Object.keys(this.facets).forEach(facet => {
+                    let mask = base;
+                    Object.entries(masks).forEach(([other, words]) => {
+                        if (other !== facet) mask = andWords(mask, words);
+                    });
+                    counts[facet] = new Map();
+                    this.facets[facet].forEach((set, value) => {
+                        counts[facet].set(value, empty ? 0 : set.countIn(mask));
+                    });
+                });
+
+                let selected = base;
+                Object.values(masks).forEach(words => { selected = andWords(selected, words); });
+                const order = this.orders[name];
+                const rows = new Uint32Array(empty ? 0 : popcountWords(selected));
+                let n = 0;
+                for (let i = 0; n < rows.length; i++) {
+                    const row = order ? order[i] : i;
+                    if ((selected[row >>> 5] >>> (row & 31)) & 1) rows[n++] = row;
+                }
+                return { rows, counts };
+            }
+
+            // Put a subset of rows into a precomputed order: one pass over the
+            // permutation instead of a sort. Unknown order names keep rows as-is.
+            order(name, rows) {
+                const order = this.orders[name];
+                if (!order) return rows;
+                if (rows.length === this.count) return order;
+                const member = new Uint8Array(this.count);
+                for (let i = 0; i < rows.length; i++) member[rows[i]] = 1;
+                const ordered = new Uint32Array(rows.length);
+                let n = 0;
+                for (let i = 0; i < order.length; i++) {
+                    if (member[order[i]]) ordered[n++] = order[i];
+                }
+                return ordered;
+            }
+        }
+
+        // A facet value's rows: a bitset of 32-bit words when dense, else a
+        // sorted row list
+        class FacetSet {
+            constructor(entry, words) {
+                this.bits = entry.bits ? new Uint32Array(decodeBase64(entry.bits).buffer, 0, words) : null;
+                if (!this.bits) {
+                    const bytes = decodeBase64(entry.rows);
+                    this.rows = decodePostings(bytes, 0, bytes.length);
+                }
+                this.size = this.bits ? popcountWords(this.bits) : this.rows.length;
+            }
+
+            has(row) {
+                if (this.bits) return ((this.bits[row >>> 5] >>> (row & 31)) & 1) === 1;
+                let lo = 0, hi = this.rows.length;
+                while (lo < hi) {
+                    const mid = (lo + hi) >>> 1;
+                    if (this.rows[mid] < row) lo = mid + 1; else hi = mid;
+                }
+                return this.rows[lo] === row;
+            }
+
+            toWords(words) {
+                return this.bits || rowsToWords(this.rows, words);
+            }
+
+            // Rows of this set that are also in a bitset
+            countIn(mask) {
+                if (this.bits) return popcountAnd(this.bits, mask);
+                let n = 0;
+                for (let i = 0; i < this.rows.length; i++) {
+                    const row = this.rows[i];
+                    n += (mask[row >>> 5] >>> (row & 31)) & 1;
+                }
+                return n;
+            }
+        }
+
+        function popcount32(x) {
+            x -= (x >>> 1) & 0x55555555;
+            x = (x & 0x33333333) + ((x >>> 2) & 0x33333333);
+            return Math.imul((x + (x >>> 4)) & 0x0f0f0f0f, 0x01010101) >>> 24;
+        }
+
+        function popcountWords(a) {
+            let n = 0;
+            for (let i = 0; i < a.length; i++) n += popcount32(a[i]);
+            return n;
+        }
+
+        function popcountAnd(a, b) {
+            let n = 0;
+            for (let i = 0; i < a.length; i++) n += popcount32(a[i] & b[i]);
+            return n;
+        }
+
+        function andWords(a, b) {
+            const out = new Uint32Array(a.length);
+            for (let i = 0; i < a.length; i++) out[i] = a[i] & b[i];
+            return out;
+        }
+
+        function rowsToWords(rows, words) {
+            const bits = new Uint32Array(words);
+            for (let i = 0; i < rows.length; i++) bits[rows[i] >>> 5] |= 1 << (rows[i] & 31);
+            return bits;
+        }
+
+        function decodeBase64(text) {
+            const binary = atob(text);
+            const bytes = new Uint8Array(binary.length);
+            for (let i = 0; i < binary.length; i++) bytes[i] = binary.charCodeAt(i);
+            return bytes;
+        }
+
+        // Delta + varint row list (see search_index.encode_postings)
+        function decodePostings(bytes, start, end) {
+            const rows = new Uint32Array(end - start);
+            let n = 0, row = 0, value = 0, shift = 0;
+            for (let i = start; i < end; i++) {
+                const byte = bytes[i];
+                value += (byte & 0x7f) * 2 ** shift;
+                if (byte & 0x80) {
+                    shift += 7;
+                    continue;
+                }
+                row += value;
+                rows[n++] = row;
+                value = shift = 0;
+            }
+            return rows.subarray(0, n);
+        }
+
+        function decodeRowArray(text, count) {
+            const bytes = decodeBase64(text);
+            const width = count <= 0x10000 ? 2 : 4;
+            const rows = new Uint32Array(bytes.length / width);
+            for (let i = 0, j = 0; i < rows.length; i++, j += width) {
+                rows[i] = width === 2 ? bytes[j] | (bytes[j + 1] << 8)
+                    : (bytes[j] | (bytes[j + 1] << 8) | (bytes[j + 2] << 16)) + bytes[j + 3] * 0x1000000;
+            }
+            return rows;
+        }
+"""
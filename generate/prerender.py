@@ -0,0 +1,60 @@
+"""
+Static first screen for virtual-scroll dashboards
+The first rows are written into the page as plain HTML in the same markup the
+page's row pool uses, so the table shows before any script or data has loaded;
+the virtual scroller adopts these nodes as its first pooled rows
+"""
+
+from html import escape
+
+from columnar import to_int
+
+# Enough rows to fill a tall screen plus the scroll buffer
+PRERENDER_ROWS = 40
+
+
+def file_name(path):
+    """Last path component, as getFileName() shows it"""
+    return path.split('/')[-1] if path else 'Unknown'
+
+
+def prerender_row(row, issue, has_context):
+    """One issue row, matching createPooledRow() + bindIssueRow()
+
+    Cells are written without whitespace between nodes because the pooled
+    row finds its parts by firstChild / lastChild.
+    """
+    # Reports are not always clean: ids and severities may be numbers or null
+    file = str(issue.get('file') or '')
+    severity = str(issue.get('severity') or 'unknown')
+    issue_id = str(issue.get('id') or '')
+    message = str(issue.get('message') or 'No message')
+    indicator = '' if has_context else ' style="display: none;"'
+    button = 'action-btn has-code' if has_context else 'action-btn'
+    icon = 'fa-code' if has_context else 'fa-eye'
+    return (
+        f'<tr class="issue-row" data-row="{row}" data-id="{escape(issue_id)}">'
+        f'<td class="indicator-cell"><div class="code-indicator"{indicator}></div></td>'
+        f'<td class="file-cell" title="{escape(file)}"><i class="fas fa-file-code"></i> '
+        f'<span>{escape(file_name(file))}</span></td>'
+        f'<td class="line-cell">{to_int(issue.get("line")) or "-"}</td>'
+        f'<td><span class="severity-badge {escape(severity)}">{escape(severity.upper())}</span></td>'
+        f'<td class="message-cell">{escape(message)}</td>'
+        f'<td class="id-cell">{escape(issue_id or "N/A")}</td>'
+        f'<td class="actions-cell"><button class="{button}"><i class="fas {icon}"></i></button></td>'
+        '</tr>'
+    )
+
+
+def prerender_rows(issues, count=PRERENDER_ROWS):
+    """HTML for the first rows in the page's initial (report) order"""
+    return ''.join(
+        prerender_row(row, issue, 'code_context' in issue)
+        for row, issue in enumerate(issues[:count])
+    )
+
+
+def placeholder_height(total, row_height, count=PRERENDER_ROWS):
+    """Estimated height of the rows after the prerendered ones, so the
+    scrollbar has its full length before the data arrives"""
+    return max(0, total - count) * row_height
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Local query API over an analysis file
+Answers paged, filtered and searched issue listings, facet counts and code
+context as JSON, so a dashboard downloads one page of issues at a time
+however large the run is
+
+    python3 generate/query_api.py analysis.json [port]
+
+Endpoints (all GET, JSON):
+    /api/summary                      issue count and per-severity counts
+    /api/issues?<filters>&sort=&offset=&limit=
+                                      one page of matching issues
+    /api/facets?<filters>             severity / check / directory counts
+    /api/issues/<row>/context         code context of one issue
+
+Filters: severity=, id= and directory= take comma-separated values; path= is
+a glob matched against the whole file path; q= is a case-insensitive
+substring of the file, id or message.
+"""
+
+import fnmatch
+import functools
+import http.server
+import json
+import re
+import sys
+import urllib.parse
+from collections import Counter
+
+from issue_loader import load_issues
+from issue_views import IssueViews
+from search_index import SEARCH_FIELDS, TrigramIndex
+
+DEFAULT_PORT = 8090
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+# Query parameter -> IssueViews facet it selects on
+FACET_PARAMS = {'severity': 'severity', 'id': 'check', 'directory': 'directory'}
+
+CONTEXT_PATH_RE = re.compile(r'^/api/issues/(\d+)/context$')
+
+
+class QueryError(ValueError):
+    """Invalid query parameters (answered with 400)"""
+
+
+def parse_query(query_string):
+    """(filters, sort, offset, limit) from a request's query string
+
+    filters is hashable: a sorted tuple of (name, value) pairs, where facet
+    values are sorted tuples.
+    """
+    params = urllib.parse.parse_qs(query_string)
+
+    def get(name):
+        return params.get(name, [''])[-1].strip()
+
+    filters = []
+    for name in FACET_PARAMS:
+        values = sorted({value for value in get(name).split(',') if value})
+        if values:
+            filters.append((name, tuple(values)))
+    if get('path'):
+        filters.append(('path', get('path')))
+    if get('q'):
+        filters.append(('q', get('q').lower()))
+
+    sort = get('sort') or 'default'
+    try:
+        offset = int(get('offset') or 0)
+        limit = int(get('limit') or DEFAULT_PAGE_SIZE)
+    except ValueError:
+        raise QueryError('offset and limit must be integers')
+    if offset < 0 or not 0 < limit <= MAX_PAGE_SIZE:
+        raise QueryError(f'need offset >= 0 and 0 < limit <= {MAX_PAGE_SIZE}')
+    return tuple(sorted(filters)), sort, offset, limit
+
+
+class IssueQueryIndex:
+    """Issues plus the indexes that answer dashboard queries
+
+    Facet row sets and sort permutations come from IssueViews, search
+    candidates from TrigramIndex. Matching row sets are memoized per filter
+    combination, so paging through one result only slices a cached list.
+    """
+
+    def __init__(self, issues):
+        self.contexts = {}
+        self.issues = []
+        for row, issue in enumerate(issues):
+            if 'code_context' in issue:
+                self.contexts[row] = issue['code_context']
+            self.issues.append({key: value for key, value in issue.items() if key != 'code_context'})
+        self.count = len(self.issues)
+
+        views = IssueViews(self.issues)
+        self.facets = views.facets
+        self.orders = views.orders
+        self.ranks = {}
+        for name, order in self.orders.items():
+            rank = [0] * self.count
+            for position, row in enumerate(order):
+                rank[row] = position
+            self.ranks[name] = rank
+
+        # Each row's value per facet, for counting within a row set
+        self.values = {facet: [None] * self.count for facet in self.facets}
+        for facet, values in self.facets.items():
+            for value, rows in values.items():
+                for row in rows:
+                    self.values[facet][row] = value
+
+        # Rows per distinct file, so a path glob is matched once per file
+        self.file_rows = {}
+        for row, issue in enumerate(self.issues):
+            self.file_rows.setdefault(issue.get('file') or '', []).append(row)
+
+        self.search_index = TrigramIndex(self.issues)
+        self.search_text = [
+            '\n'.join(str(issue.get(field, '')) for field in SEARCH_FIELDS).lower()
+            for issue in self.issues
+        ]
+
+        self.filter_rows = functools.lru_cache(maxsize=256)(self._filter_rows)
+        self.matching = functools.lru_cache(maxsize=64)(self._matching)
+        self.result = functools.lru_cache(maxsize=64)(self._result)
+
+    def _filter_rows(self, name, value):
+        """Set of rows passing one filter"""
+        if name in FACET_PARAMS:
+            facet = self.facets[FACET_PARAMS[name]]
+            return frozenset(row for selected in value for row in facet.get(selected, ()))
+        if name == 'path':
+            return frozenset(row for file, rows in self.file_rows.items()
+                             if fnmatch.fnmatchcase(file, value) for row in rows)
+        if name == 'q':
+            candidates = self.search_index.candidates(value)
+            rows = range(self.count) if candidates is None else candidates
+            return frozenset(row for row in rows if value in self.search_text[row])
+        raise QueryError(f'unknown filter {name}')
+
+    def _matching(self, filters, skip=None):
+        """Rows passing every filter except the skip parameter, as a set;
+        None when nothing is filtered (every row)"""
+        sets = [self.filter_rows(name, value) for name, value in filters if name != skip]
+        if not sets:
+            return None
+        sets.sort(key=len)
+        return frozenset(sets[0].intersection(*sets[1:]))
+
+    def ordered(self, rows, sort):
+        """Rows in a precomputed order ('default' is row order)"""
+        if sort != 'default' and sort not in self.orders:
+            raise QueryError(f'unknown sort {sort}')
+        if rows is None:
+            return self.orders[sort] if sort != 'default' else range(self.count)
+        if sort == 'default':
+            return sorted(rows)
+        # Small results sort by rank; large ones filter the permutation
+        if len(rows) * 8 < self.count:
+            return sorted(rows, key=self.ranks[sort].__getitem__)
+        return [row for row in self.orders[sort] if row in rows]
+
+    def _result(self, filters, sort):
+        return self.ordered(self.matching(filters), sort)
+
+    def page(self, filters, sort='default', offset=0, limit=DEFAULT_PAGE_SIZE):
+        rows = self.result(filters, sort)
+        return {
+            'total': len(rows),
+            'offset': offset,
+            'limit': limit,
+            'sort': sort,
+            'issues': [self.issue(row) for row in rows[offset:offset + limit]]
+        }
+
+    def issue(self, row):
+        return dict(self.issues[row], row=row, hasContext=row in self.contexts)
+
+    def facet_counts(self, filters):
+        """Counts of every facet value among rows matching the other filters,
+        so each count is what selecting that value would give"""
+        selecting = dict((FACET_PARAMS[name], name) for name, _ in filters if name in FACET_PARAMS)
+        counts = {}
+        for facet, values in self.facets.items():
+            rows = self.matching(filters, selecting.get(facet))
+            if rows is None:
+                counts[facet] = {value: len(facet_rows) for value, facet_rows in values.items()}
+            else:
+                column = self.values[facet]
+                counts[facet] = dict(Counter(column[row] for row in rows))
+        rows = self.matching(filters)
+        return {'total': self.count if rows is None else len(rows), 'facets': counts}
+
+    def context(self, row):
+        return self.contexts.get(row)
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'withContext': len(self.contexts),
+            'severities': {value: len(rows) for value, rows in self.facets['severity'].items()}
+        }
+
+
+class QueryRequestHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    index = None  # IssueQueryIndex, set by make_server
+
+    def do_GET(self):
+        url = urllib.parse.urlsplit(self.path)
+        try:
+            context_match = CONTEXT_PATH_RE.match(url.path)
+            if url.path == '/api/summary':
+                self.send_json(200, self.index.summary())
+            elif url.path == '/api/issues':
+                filters, sort, offset, limit = parse_query(url.query)
+                self.send_json(200, self.index.page(filters, sort, offset, limit))
+            elif url.path == '/api/facets':
+                self.send_json(200, self.index.facet_counts(parse_query(url.query)[0]))
+            elif context_match:
+                row = int(context_match.group(1))
+                context = self.index.context(row)
+                if context is None:
+                    self.send_json(404, {'error': f'no code context for issue {row}'})
+                else:
+                    self.send_json(200, {'row': row, 'code_context': context})
+            else:
+                self.send_json(404, {'error': f'unknown endpoint {url.path}'})
+        except QueryError as error:
+            self.send_json(400, {'error': str(error)})
+
+    def send_json(self, status, body):
+        data = json.dumps(body, separators=(',', ':')).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def make_server(index, port=DEFAULT_PORT, host='127.0.0.1'):
+    """Threaded query server over an IssueQueryIndex (local-only by default)"""
+    handler = type('BoundQueryRequestHandler', (QueryRequestHandler,), {'index': index})
+    return http.server.ThreadingHTTPServer((host, port), handler)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        print("Usage: query_api.py <analysis.json> [port]")
+        sys.exit(1)
+
+    port = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_PORT
+    print(f"Indexing {sys.argv[1]}...")
+    index = IssueQueryIndex(load_issues(sys.argv[1]))
+    print(f"Serving {index.count} issues on http://localhost:{port}/api/")
+    print("Press Ctrl+C to stop the server")
+
+    with make_server(index, port) as httpd:
+        try:
+            httpd.serve_forever()
+        except KeyboardInterrupt:
+            print("\nShutting down server...")
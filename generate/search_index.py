@@ -0,0 +1,189 @@
+"""
+Trigram search index for generated dashboards
+Maps every lower-cased 3-character substring of an issue's file, id and message
+to the sorted rows containing it, so substring search only verifies candidates
+"""
+
+import base64
+
+# Fields whose text is searchable from the dashboard search box
+SEARCH_FIELDS = ('file', 'id', 'message')
+
+# Trigrams found in more than this share of rows are too common to narrow a
+# search; they are listed as "common" instead of getting a posting list
+MAX_DOCUMENT_FREQUENCY = 0.25
+
+INDEX_VERSION = 1
+
+
+def trigrams(text):
+    """Set of lower-cased 3-character substrings of text"""
+    text = text.lower()
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def encode_postings(rows):
+    """Encode a sorted row list as LEB128 varints of the gaps between rows"""
+    data = bytearray()
+    previous = 0
+    for row in rows:
+        delta = row - previous
+        previous = row
+        while delta >= 0x80:
+            data.append((delta & 0x7f) | 0x80)
+            delta >>= 7
+        data.append(delta)
+    return bytes(data)
+
+
+def decode_postings(data):
+    """Inverse of encode_postings"""
+    rows = []
+    value = shift = row = 0
+    for byte in data:
+        value |= (byte & 0x7f) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+        row += value
+        rows.append(row)
+        value = shift = 0
+    return rows
+
+
+class TrigramIndex:
+    """Inverted trigram index over issue rows"""
+
+    def __init__(self, issues, max_df=MAX_DOCUMENT_FREQUENCY):
+        self.count = len(issues)
+        postings = {}
+        cache = {}
+        for row, issue in enumerate(issues):
+            grams = set()
+            for field in SEARCH_FIELDS:
+                value = str(issue.get(field, ''))
+                field_grams = cache.get(value)
+                if field_grams is None:
+                    field_grams = cache[value] = trigrams(value)
+                grams |= field_grams
+            for gram in grams:
+                postings.setdefault(gram, []).append(row)
+
+        limit = max(int(self.count * max_df), 1)
+        self.postings = {gram: rows for gram, rows in postings.items() if len(rows) <= limit}
+        self.common = sorted(gram for gram, rows in postings.items() if len(rows) > limit)
+
+    def candidates(self, term):
+        """Sorted rows that may contain term, or None if the index cannot narrow it"""
+        term = term.lower()
+        if len(term) < 3:
+            return None
+        lists = []
+        for gram in trigrams(term):
+            if gram in self.common:
+                continue
+            if gram not in self.postings:
+                return []
+            lists.append(self.postings[gram])
+        if not lists:
+            return None
+        lists.sort(key=len)
+        rows = set(lists[0])
+        for other in lists[1:]:
+            rows.intersection_update(other)
+        return sorted(rows)
+
+    def to_json(self):
+        """Compact form: gram table, byte offsets and base64 posting bytes"""
+        grams = sorted(self.postings)
+        data = bytearray()
+        offsets = [0]
+        for gram in grams:
+            data += encode_postings(self.postings[gram])
+            offsets.append(len(data))
+        return {
+            'version': INDEX_VERSION,
+            'count': self.count,
+            'grams': grams,
+            'common': self.common,
+            'offsets': offsets,
+            'postings': base64.b64encode(bytes(data)).decode('ascii')
+        }
+
+
+# Browser-side reader for TrigramIndex.to_json(). Plain string (not an
+# f-string) like the other JS snippets in columnar.py; uses decodeBase64 and
+# decodePostings from issue_views.ISSUE_VIEWS_JS.
+TRIGRAM_JS = """
+        // Trigram search index: posting lists are decoded on first use
+        class TrigramIndex {
+            constructor(index) {
+                this.count = index.count;
+                this.grams = new Map(index.grams.map((gram, i) => [gram, i]));
+                this.common = new Set(index.common);
+                this.offsets = index.offsets;
+                this.bytes = decodeBase64(index.postings);
+                this.cache = new Map();
+            }
+
+            postings(gram) {
+                let rows = this.cache.get(gram);
+                if (rows === undefined) {
+                    if (this.cache.size >= 256) this.cache.clear();
+                    rows = decodePostings(this.bytes, this.offsets[gram], this.offsets[gram + 1]);
+                    this.cache.set(gram, rows);
+                }
+                return rows;
+            }
+
+            // Sorted rows containing every indexed trigram of a lower-cased
+            // term, or null when the index cannot narrow the search
+            candidates(term) {
+                if (term.length < 3 || /[\\uD800-\\uDFFF]/.test(term)) return null;
+                const grams = new Set();
+                for (let i = 0; i + 3 <= term.length; i++) {
+                    const gram = term.substring(i, i + 3);
+                    if (this.common.has(gram)) continue;
+                    const id = this.grams.get(gram);
+                    if (id === undefined) return new Uint32Array(0);
+                    grams.add(id);
+                }
+                if (grams.size === 0) return null;
+
+                // Intersect shortest lists first (byte length tracks list length)
+                const order = Array.from(grams).sort((a, b) =>
+                    (this.offsets[a + 1] - this.offsets[a]) - (this.offsets[b + 1] - this.offsets[b]));
+                let rows = this.postings(order[0]);
+                for (let i = 1; i < order.length && rows.length > 0; i++) {
+                    rows = intersectSorted(rows, this.postings(order[i]));
+                }
+                return rows;
+            }
+        }
+
+        // Merge-intersect two sorted row lists; binary-search the longer one
+        // when it is much longer than the shorter
+        function intersectSorted(a, b) {
+            if (a.length > b.length) [a, b] = [b, a];
+            const out = new Uint32Array(a.length);
+            let n = 0;
+            if (b.length > a.length * 16) {
+                let lo = 0;
+                for (let i = 0; i < a.length; i++) {
+                    let hi = b.length;
+                    while (lo < hi) {
+                        const mid = (lo + hi) >>> 1;
+                        if (b[mid] < a[i]) lo = mid + 1; else hi = mid;
+                    }
+                    if (lo < b.length && b[lo] === a[i]) out[n++] = a[i];
+                }
+            } else {
+                for (let i = 0, j = 0; i < a.length && j < b.length;) {
+                    if (a[i] < b[j]) i++;
+                    else if (a[i] > b[j]) j++;
+                    else { out[n++] = a[i]; i++; j++; }
+                }
+            }
+            return out.subarray(0, n);
+        }
+"""
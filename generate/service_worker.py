@@ -0,0 +1,131 @@
+"""
+Service worker support for multi-file dashboards
+Data files get content-hashed names, so a generated service worker can precache
+them with the HTML shell and serve everything cache-first on repeat visits
+"""
+
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+
+from columnar import content_hash
+
+# Hex digits of the content hash put into versioned file names
+NAME_HASH_LENGTH = 10
+
+# Caches created by dashboard service workers start with this
+CACHE_PREFIX = 'cppcheck-studio-'
+
+
+def hashed_name(name, data):
+    """File name with a short content hash before the extension
+    (issues.jsonl -> issues.1a2b3c4d5e.jsonl)"""
+    stem, dot, suffix = name.rpartition('.')
+    if not dot:
+        stem, suffix = name, ''
+    digest = hashlib.sha256(data).hexdigest()[:NAME_HASH_LENGTH]
+    return f'{stem}.{digest}' + (f'.{suffix}' if suffix else '')
+
+
+def version_file(path):
+    """Rename a file to its content-hashed name and remove older versions of it
+
+    Returns the new path.
+    """
+    path = Path(path)
+    target = path.with_name(hashed_name(path.name, path.read_bytes()))
+    stem, dot, suffix = path.name.rpartition('.')
+    if not dot:
+        stem, suffix = path.name, ''
+    versioned = re.compile(re.escape(stem) + r'\.[0-9a-f]{%d}' % NAME_HASH_LENGTH +
+                           (re.escape('.' + suffix) if suffix else ''))
+    for stale in path.parent.iterdir():
+        if stale != target and versioned.fullmatch(stale.name):
+            stale.unlink()
+    os.replace(path, target)
+    return target
+
+
+def service_worker_name(html_path):
+    """Service worker script for a dashboard page, next to the page"""
+    return f'{Path(html_path).stem}-sw.js'
+
+
+def service_worker_js(cache_name, precache):
+    """Service worker that precaches the given URLs and serves them cache-first
+
+    Byte-range requests and anything not precached go to the network. A new
+    cache name (new shell or data) replaces the page's older caches.
+    """
+    return f"""// Generated by cppcheck-studio: serves the dashboard shell and its
+// content-hashed data files from the cache
+const CACHE_NAME = {json.dumps(cache_name)};
+const CACHE_PREFIX = {json.dumps(cache_name.rsplit('-', 1)[0] + '-')};
+const PRECACHE = {json.dumps(precache, indent=4)};
+const PRECACHED = new Set(PRECACHE.map(url => new URL(url, self.location).href));
+
+self.addEventListener('install', event => {{
+    // Bypass the HTTP cache so the shell is never an older copy
+    event.waitUntil(
+        caches.open(CACHE_NAME)
+            .then(cache => cache.addAll(PRECACHE.map(url => new Request(url, {{ cache: 'reload' }}))))
+            .then(() => self.skipWaiting())
+    );
+}});
+
+self.addEventListener('activate', event => {{
+    event.waitUntil(
+        caches.keys()
+            .then(names => Promise.all(names
+                .filter(name => name !== CACHE_NAME && name.startsWith(CACHE_PREFIX) &&
+                    /^[0-9a-f]+$/.test(name.slice(CACHE_PREFIX.length)))
+                .map(name => caches.delete(name))))
+            .then(() => self.clients.claim())
+    );
+}});
+
+self.addEventListener('fetch', event => {{
+    const request = event.request;
+    if (request.method !== 'GET' || request.headers.has('Range')) return;
+    const url = new URL(request.url);
+    url.search = '';
+    url.hash = '';
+    if (!PRECACHED.has(url.href)) return;
+    event.respondWith(
+        caches.open(CACHE_NAME)
+            .then(cache => cache.match(url.href))
+            .then(response => response || fetch(request))
+    );
+}});
+"""
+
+
+def write_service_worker(html_path, precache):
+    """Write the service worker for a generated page; precache holds URLs
+    relative to the page (the page itself is added first)
+
+    The cache name covers the page and every precached name, so regenerating
+    either gives a byte-different worker that browsers pick up as an update.
+    Returns the worker's path.
+    """
+    html_path = Path(html_path)
+    urls = [html_path.name] + list(precache)
+    stem = re.sub(r'[^A-Za-z0-9_-]', '-', html_path.stem)
+    cache_name = CACHE_PREFIX + stem + '-' + content_hash(html_path.read_text(encoding='utf-8'), *urls)[:16]
+    worker_path = html_path.with_name(service_worker_name(html_path))
+    worker_path.write_text(service_worker_js(cache_name, urls), encoding='utf-8')
+    return worker_path
+
+
+def register_js(worker_name):
+    """Page snippet registering the dashboard's service worker"""
+    return f"""
+        // Serve the shell and data files from the service worker cache on
+        // repeat visits (http(s) only; file:// pages fetch as usual)
+        if ('serviceWorker' in navigator && location.protocol.startsWith('http')) {{
+            navigator.serviceWorker.register('{worker_name}', {{ updateViaCache: 'none' }})
+                .catch(error => console.warn('Service worker registration failed:', error));
+        }}
+"""
@@ -0,0 +1,300 @@
+"""
+Row rendering and facet filtering shared by the virtual-scroll dashboards
+The page supplies state, CONFIG, getFileName(), showIssueDetails() and
+hasCodeContext(rowIndex); HEIGHT_INDEX_JS (columnar) must come first
+"""
+
+# Pooled-row virtual scroller over state.filteredRows and the facet
+# controls; the row markup matches prerender.prerender_row()
+VIRTUAL_ROWS_JS = """
+        // Render visible rows based on scroll position, re-binding pooled
+        // row nodes instead of creating new ones. Rows wrap to any height:
+        // offsets come from measured heights (CONFIG.ROW_HEIGHT until a row
+        // has been rendered once) kept in a Fenwick tree.
+        function renderVisibleRows() {
+            // Until the first rows are decoded the prerendered ones stay as they are
+            if (!state.store || !state.store.count) return;
+            syncHeightIndex();
+            const heights = state.heightIndex;
+            const count = state.filteredRows.length;
+            const first = heights.indexAt(state.scrollTop);
+            const last = heights.indexAt(state.scrollTop + state.containerHeight);
+            
+            state.visibleStart = Math.max(0, first - CONFIG.VISIBLE_BUFFER);
+            state.visibleEnd = Math.min(count, last + 1 + CONFIG.VISIBLE_BUFFER);
+            updateSpacers();
+            
+            // Grow the pool to the number of visible rows; spare rows are hidden
+            const tbody = document.getElementById('issuesBody');
+            const needed = state.visibleEnd - state.visibleStart;
+            while (state.rowPool.length < needed) {
+                const row = createPooledRow();
+                state.rowPool.push(row);
+                tbody.appendChild(row);
+            }
+            
+            for (let p = 0; p < state.rowPool.length; p++) {
+                const row = state.rowPool[p];
+                if (p < needed) {
+                    const globalIndex = state.visibleStart + p;
+                    bindIssueRow(row, state.filteredRows[globalIndex], globalIndex);
+                    if (row.style.display) row.style.display = '';
+                } else if (!row.style.display) {
+                    row.style.display = 'none';
+                    row.rowIndex = -1;
+                }
+            }
+            
+            // Measure the bound rows (one layout per frame) and keep the first
+            // visible row in place when rows above it turn out taller or shorter
+            const anchor = heights.offsetOf(first);
+            let changed = false;
+            for (let p = 0; p < needed; p++) {
+                const row = state.rowPool[p];
+                const height = row.offsetHeight;
+                if (height > 0 && height !== state.rowHeights[row.rowIndex]) {
+                    state.rowHeights[row.rowIndex] = height;
+                    heights.set(state.visibleStart + p, height);
+                    changed = true;
+                }
+            }
+            if (changed) {
+                updateSpacers();
+                const shift = heights.offsetOf(first) - anchor;
+                if (shift !== 0 && state.scrollTop > 0) {
+                    const scrollContainer = document.getElementById('scrollContainer');
+                    scrollContainer.scrollTop += shift;
+                    state.scrollTop = scrollContainer.scrollTop;
+                }
+            }
+        }
+        
+        // Rebuild the height index when the row list changes; a list that
+        // only grew (rows streaming in) is extended instead
+        function syncHeightIndex() {
+            const rows = state.filteredRows;
+            const previous = state.heightRows;
+            if (rows === previous) return;
+            const heightOf = position => state.rowHeights[rows[position]] || CONFIG.ROW_HEIGHT;
+            if (previous && previous.buffer === rows.buffer &&
+                previous.byteOffset === rows.byteOffset && rows.length >= previous.length) {
+                state.heightIndex.append(rows.length, heightOf);
+            } else {
+                state.heightIndex.reset(rows.length, heightOf);
+            }
+            state.heightRows = rows;
+        }
+        
+        function updateSpacers() {
+            const heights = state.heightIndex;
+            document.getElementById('spacerTop').style.height = heights.offsetOf(state.visibleStart) + 'px';
+            document.getElementById('spacerBottom').style.height =
+                (heights.total() - heights.offsetOf(state.visibleEnd)) + 'px';
+        }
+        
+        // Coalesce scroll and resize work into one render per animation frame
+        function scheduleRender() {
+            if (state.renderFrame) return;
+            state.renderFrame = requestAnimationFrame(() => {
+                state.renderFrame = 0;
+                renderVisibleRows();
+            });
+        }
+        
+        // The generator writes the first rows into the page in pooled-row
+        // markup; they become the first pool entries, already bound to their
+        // rows, so the first render re-binds nothing it does not have to
+        function adoptPrerenderedRows() {
+            document.querySelectorAll('#issuesBody > tr.issue-row').forEach((row, position) => {
+                initPooledRow(row);
+                row.rowIndex = Number(row.dataset.row);
+                row.globalIndex = position;
+                state.rowPool.push(row);
+            });
+        }
+        
+        // Build one reusable row; its cells are kept on the node for re-binding
+        function createPooledRow() {
+            const row = document.createElement('tr');
+            row.className = 'issue-row';
+            row.innerHTML =
+                '<td class="indicator-cell"><div class="code-indicator"></div></td>' +
+                '<td class="file-cell"><i class="fas fa-file-code"></i> <span></span></td>' +
+                '<td class="line-cell"></td>' +
+                '<td><span class="severity-badge"></span></td>' +
+                '<td class="message-cell"></td>' +
+                '<td class="id-cell"></td>' +
+                '<td class="actions-cell"><button class="action-btn"><i class="fas"></i></button></td>';
+            return initPooledRow(row);
+        }
+        
+        // Attach the cell references and click handlers of a pooled row
+        function initPooledRow(row) {
+            const cells = row.children;
+            row.parts = {
+                indicator: cells[0].firstChild,
+                fileCell: cells[1],
+                fileName: cells[1].lastChild,
+                line: cells[2],
+                badge: cells[3].firstChild,
+                message: cells[4],
+                id: cells[5],
+                button: cells[6].firstChild,
+                icon: cells[6].firstChild.firstChild
+            };
+            row.rowIndex = -1;
+            row.globalIndex = -1;
+            
+            // Handlers read whatever issue the row is bound to at click time
+            row.parts.button.onclick = (e) => {
+                e.stopPropagation();
+                showIssueDetails(row.rowIndex, row.globalIndex);
+            };
+            row.onclick = () => showIssueDetails(row.rowIndex, row.globalIndex);
+            
+            return row;
+        }
+        
+        // Point a pooled row at a store row; skipped if already bound to it
+        function bindIssueRow(row, rowIndex, globalIndex) {
+            row.globalIndex = globalIndex;
+            if (row.rowIndex === rowIndex) return;
+            row.rowIndex = rowIndex;
+            
+            const store = state.store;
+            const parts = row.parts;
+            const file = store.file(rowIndex);
+            const severity = store.severity(rowIndex);
+            const message = store.message(rowIndex);
+            const issueId = store.id(rowIndex);
+            const hasContext = hasCodeContext(rowIndex);
+            
+            row.dataset.id = issueId;
+            parts.indicator.style.display = hasContext ? '' : 'none';
+            parts.fileCell.title = file;
+            parts.fileName.textContent = getFileName(file);
+            parts.line.textContent = store.line(rowIndex) || '-';
+            parts.badge.className = 'severity-badge ' + (severity || 'unknown');
+            parts.badge.textContent = (severity || 'UNKNOWN').toUpperCase();
+            parts.message.textContent = message || 'No message';
+            parts.id.textContent = issueId || 'N/A';
+            parts.button.className = 'action-btn' + (hasContext ? ' has-code' : '');
+            parts.icon.className = 'fas ' + (hasContext ? 'fa-code' : 'fa-eye');
+        }
+        
+        // Filter data based on search; facets are applied on top of the hits
+        async function filterData() {
+            if (!state.views) return;  // still loading; applied once loaded
+            const searchTerm = document.getElementById('searchInput').value.toLowerCase();
+            state.currentSearch = searchTerm;
+            
+            // The filter worker finds search hits across all severities (null
+            // means a newer query replaced this one); no term means every row
+            if (searchTerm) {
+                const rows = await state.filterEngine.filter('all', searchTerm);
+                if (!rows || searchTerm !== state.currentSearch) return;
+                state.searchRows = rows;
+            } else {
+                state.filterEngine.cancel();
+                state.searchRows = null;
+            }
+            
+            applyFacets();
+        }
+        
+        // Intersect search hits with the severity/directory/check selections
+        // using the precomputed facet bitsets, and refresh every facet count
+        function applyFacets() {
+            if (!state.views) return;
+            const result = state.views.query(state.searchRows, {
+                severity: state.currentFilter,
+                directory: state.directoryFilter,
+                check: state.checkFilter
+            }, state.sortOrder);
+            state.filteredRows = result.rows;
+            updateFacetCounts(result.counts);
+            
+            // Update count
+            updateIssueCount();
+            
+            // Reset scroll and render
+            document.getElementById('scrollContainer').scrollTop = 0;
+            state.scrollTop = 0;
+            renderVisibleRows();
+        }
+        
+        // Fill a facet <select> with its values, largest first
+        function initFacetSelect(facet, selectId) {
+            const select = document.getElementById(selectId);
+            const values = Array.from(state.views.facets[facet].entries())
+                .sort((a, b) => b[1].size - a[1].size)
+                .map(([value]) => value);
+            values.forEach(value => {
+                const option = document.createElement('option');
+                option.value = value;
+                option.dataset.label = value;
+                select.appendChild(option);
+            });
+        }
+        
+        function updateFacetCounts(counts) {
+            let total = 0;
+            counts.severity.forEach(count => { total += count; });
+            document.querySelectorAll('[data-severity-count]').forEach(el => {
+                const severity = el.dataset.severityCount;
+                el.textContent = severity === 'all' ? total : (counts.severity.get(severity) || 0);
+            });
+            
+            [['directory', 'directoryFacet'], ['check', 'checkFacet']].forEach(([facet, selectId]) => {
+                const select = document.getElementById(selectId);
+                let facetTotal = 0;
+                Array.from(select.options).forEach(option => {
+                    if (option.value === 'all') return;
+                    const count = counts[facet].get(option.value) || 0;
+                    facetTotal += count;
+                    option.textContent = option.dataset.label + ' (' + count + ')';
+                    option.disabled = count === 0 && option.value !== select.value;
+                });
+                select.options[0].textContent = select.options[0].dataset.label + ' (' + facetTotal + ')';
+            });
+        }
+        
+        // Update issue count display
+        function updateIssueCount() {
+            const countEl = document.getElementById('issuesCount');
+            const filtered = state.filteredRows.length;
+            const total = state.store.count;
+            
+            if (filtered === total) {
+                countEl.textContent = `Showing all ${total} issues`;
+            } else {
+                countEl.textContent = `Showing ${filtered} of ${total} issues`;
+            }
+        }
+        
+        // Set severity filter
+        function setSeverityFilter(severity, button) {
+            state.currentFilter = severity;
+            
+            // Update button states
+            document.querySelectorAll('.filter-btn').forEach(btn => {
+                btn.classList.remove('active');
+            });
+            button.classList.add('active');
+            
+            applyFacets();
+        }
+        
+        // Set directory or check filter
+        function setFacetFilter(facet, value) {
+            if (facet === 'directory') state.directoryFilter = value;
+            else state.checkFilter = value;
+            applyFacets();
+        }
+        
+        // Switch between precomputed orderings
+        function setSortOrder(name) {
+            state.sortOrder = name;
+            applyFacets();
+        }
+"""
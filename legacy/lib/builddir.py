@@ -0,0 +1,150 @@
+"""
+Managed cppcheck build directory for CPPCheck Studio
+cppcheck's --cppcheck-build-dir keeps an analyzer file (<stem>.a1) per
+translation unit and skips a unit whose preprocessed code is unchanged.
+The files are kept in a persistent store per repository and profile; every
+shard gets a private build directory seeded from the store and harvested
+back afterwards, so concurrent processes never share one
+"""
+
+import hashlib
+import os
+import shutil
+import threading
+import time
+from collections import Counter
+
+from diffscope import git
+
+# Store limits, applied across every repository's store
+MAX_BYTES = 512 * 1024 * 1024
+MAX_AGE_DAYS = 30
+
+
+def cache_root():
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'cppcheck-studio', 'build')
+
+
+def repo_root(path):
+    """The git work tree holding path, or path itself outside git"""
+    cwd = path if os.path.isdir(path) else os.path.dirname(path) or '.'
+    try:
+        return git(['rev-parse', '--show-toplevel'], cwd).strip()
+    except (ValueError, OSError):
+        return os.path.realpath(cwd)
+
+
+def stem(unit):
+    return os.path.splitext(os.path.basename(unit))[0]
+
+
+class BuildDirCache:
+    """Persistent analyzer files for one repository and profile
+
+    A shard's build directory only receives the files of units whose stem
+    is unique within the shard: cppcheck numbers clashing stems (.a1, .a2)
+    by the order it meets them, so their files cannot be matched reliably.
+    A seeded file that cppcheck leaves untouched (same mtime and size) was
+    reused; a rewritten one replaces the stored copy.
+    """
+
+    def __init__(self, repo, profile, options, root=None):
+        self.root = root or cache_root()
+        repo = os.path.realpath(repo)
+        key = hashlib.sha256('\0'.join([repo, profile] + list(options)).encode()).hexdigest()[:16]
+        self.directory = os.path.join(self.root, f'{os.path.basename(repo) or "root"}-{profile}-{key}')
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.unmanaged = 0
+
+    def entry(self, unit):
+        return os.path.join(self.directory, hashlib.sha256(os.path.realpath(unit).encode()).hexdigest()[:32] + '.a1')
+
+    def managed(self, units):
+        counts = Counter(stem(unit) for unit in units)
+        return [unit for unit in units if counts[stem(unit)] == 1]
+
+    def seed(self, build_dir, units):
+        """Fill a shard's fresh build directory; returns {unit: (mtime, size)}
+        of the seeded files"""
+        os.makedirs(build_dir, exist_ok=True)
+        seeded = {}
+        for unit in self.managed(units):
+            target = os.path.join(build_dir, stem(unit) + '.a1')
+            try:
+                shutil.copy2(self.entry(unit), target)
+                os.utime(self.entry(unit))
+            except OSError:
+                continue
+            info = os.stat(target)
+            seeded[unit] = (info.st_mtime_ns, info.st_size)
+        return seeded
+
+    def harvest(self, build_dir, units, seeded):
+        """Store the analyzer files cppcheck wrote and count reuse"""
+        os.makedirs(self.directory, exist_ok=True)
+        hits = misses = 0
+        managed = self.managed(units)
+        for unit in managed:
+            source = os.path.join(build_dir, stem(unit) + '.a1')
+            try:
+                info = os.stat(source)
+            except OSError:
+                misses += 1
+                continue
+            if seeded.get(unit) == (info.st_mtime_ns, info.st_size):
+                hits += 1
+                continue
+            misses += 1
+            # Copy then rename, so a concurrent run never reads half a file
+            temp = f'{self.entry(unit)}.{os.getpid()}.{threading.get_ident()}.tmp'
+            try:
+                shutil.copyfile(source, temp)
+                os.replace(temp, self.entry(unit))
+            except OSError:
+                pass
+        with self.lock:
+            self.hits += hits
+            self.misses += misses
+            self.unmanaged += len(units) - len(managed)
+
+    def size(self):
+        return sum(entry.stat().st_size for entry in os.scandir(self.directory)) if os.path.isdir(self.directory) else 0
+
+    def prune(self, max_bytes=MAX_BYTES, max_age_days=MAX_AGE_DAYS):
+        """Drop files older than max_age_days, then the least recently used
+        until every store together fits in max_bytes"""
+        cutoff = time.time() - max_age_days * 86400
+        entries = []
+        for directory, dirs, files in os.walk(self.root):
+            for name in files:
+                path = os.path.join(directory, name)
+                try:
+                    info = os.stat(path)
+                except OSError:
+                    continue
+                if info.st_mtime < cutoff:
+                    self.remove(path)
+                else:
+                    entries.append((info.st_mtime, info.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= max_bytes:
+                break
+            self.remove(path)
+            total -= size
+        for entry in os.scandir(self.root) if os.path.isdir(self.root) else []:
+            if entry.is_dir():
+                try:
+                    os.rmdir(entry.path)  # only succeeds when empty
+                except OSError:
+                    pass
+
+    @staticmethod
+    def remove(path):
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
@@ -0,0 +1,190 @@
+"""
+Per-translation-unit result cache for CPPCheck Studio
+Issues are stored under a key hashed from a unit's contents, the contents of
+every header it includes, the cppcheck version and the options, so an
+unchanged unit can reuse its issues instead of being analyzed again
+"""
+
+import hashlib
+import json
+import os
+import subprocess
+import time
+
+from engine import WHOLE_PROGRAM_CHECKS, issue_key, merge_issues
+from includes import IncludeScanner, include_paths
+
+CACHE_VERSION = 1
+
+# Entries not used for this long are removed
+MAX_AGE_DAYS = 30
+
+
+def cppcheck_version(cppcheck='cppcheck'):
+    try:
+        return subprocess.run([cppcheck, '--version'], capture_output=True, text=True, timeout=60).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return ''
+
+
+def write_json(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp = f'{path}.{os.getpid()}.tmp'
+    with open(temp, 'w') as f:
+        json.dump(data, f)
+    os.replace(temp, path)
+
+
+class ResultCache:
+    """Cached issues per translation unit, attributed by cppcheck's file0
+
+    cppcheck reports an issue in a header once per process, for whichever
+    unit reached the header first, so the records of the other units that
+    include it lack the issue. When that first unit changes or disappears,
+    every unit including the header is analyzed again (lookup), which keeps
+    the merged output identical to a full run.
+
+    Some messages carry no file0: missingInclude* is attributed to the unit
+    whose closure holds its location, and messages without a location
+    (checkersReport) belong to the run; they are kept apart and reported
+    again by every run (run_issues).
+
+    Whole-program checks (unusedFunction) depend on every unit at once, so
+    their findings are kept per run under a key over all the units' keys
+    and reused only while the set of units and each of them is unchanged
+    (whole_program).
+    """
+
+    def __init__(self, directory, options, cppcheck='cppcheck'):
+        self.directory = directory
+        self.scanner = IncludeScanner(include_paths(options))
+        self.salt = '\0'.join([f'v{CACHE_VERSION}', cppcheck_version(cppcheck)] + list(options))
+        # unit -> key of its latest record, per cppcheck version and options
+        self.index_file = os.path.join(directory, f'index-{hashlib.sha256(self.salt.encode()).hexdigest()[:16]}.json')
+        self.index = self.load_json(self.index_file) or {}
+        self.run_file = self.index_file.replace('index-', 'run-')
+        self.run_issues = self.load_json(self.run_file) or []
+        self.program_file = self.index_file.replace('index-', 'program-')
+        self.keys = {}
+        self.hits = 0
+        self.misses = 0
+        self.invalidated = 0
+
+    @staticmethod
+    def load_json(path):
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def entry_file(self, key):
+        return os.path.join(self.directory, 'entries', key[:2], key + '.json')
+
+    def load(self, key):
+        entry = self.load_json(self.entry_file(key)) if key else None
+        return entry['issues'] if entry else None
+
+    def lookup(self, units):
+        """(cached issues per unit, units that must be analyzed)"""
+        cached = {}
+        for unit in units:
+            self.keys[unit] = self.scanner.digest(unit, self.salt)
+            issues = self.load(self.keys[unit])
+            if issues is not None:
+                cached[unit] = issues
+                os.utime(self.entry_file(self.keys[unit]))
+
+        # Headers with issues that only the old records of dirty or removed
+        # units hold; the units still cached that include them may have lost
+        # those issues to the old owner. (Units analyzed again report their
+        # unchanged issues again, so one pass is enough.)
+        kept = {issue_key(issue) for issues in cached.values() for issue in issues}
+        headers = set()
+        removed = [unit for unit in self.index if unit not in self.keys and not os.path.exists(unit)]
+        for unit in [unit for unit in units if unit not in cached] + removed:
+            if unit not in self.index:
+                continue
+            old = self.load(self.index[unit])
+            if old is None:
+                headers.update(self.scanner.closure(unit) - {unit})
+            else:
+                headers.update(issue['file'] for issue in old
+                               if issue['file'] != unit and issue_key(issue) not in kept)
+        if headers:
+            for unit in self.scanner.dependents(list(cached), headers):
+                del cached[unit]
+                self.invalidated += 1
+
+        self.hits = len(cached)
+        self.misses = len(units) - len(cached)
+        return cached, [unit for unit in units if unit not in cached]
+
+    def program_key(self, units):
+        keys = [self.keys.get(unit) or self.scanner.digest(unit, self.salt) for unit in sorted(units)]
+        return hashlib.sha256('\0'.join(sorted(units) + keys).encode()).hexdigest()
+
+    def whole_program(self, units):
+        """Stored whole-program findings for exactly these units, or None"""
+        stored = self.load_json(self.program_file)
+        if stored and stored.get('key') == self.program_key(units):
+            return stored['issues']
+        return None
+
+    def store_whole_program(self, units, issues):
+        write_json(self.program_file, {'key': self.program_key(units), 'issues': issues})
+
+    def attribute(self, shard, issue, file0):
+        """The shard unit an issue belongs to, 'run' for a run-level message,
+        None when it cannot be placed"""
+        if file0 is not None:
+            return file0 if file0 in shard.units else None
+        if not issue['file']:
+            return 'run'
+        for unit in shard.units:
+            if issue['file'] in self.scanner.closure(unit):
+                return unit
+        return None
+
+    def store(self, shards):
+        """Record the issues of every unit in the shards that ran cleanly
+
+        A shard reporting an issue it cannot attribute to one of its units
+        is not recorded. The run-level messages of the clean shards replace
+        the stored ones.
+        """
+        run_issues = None
+        for shard in shards:
+            if shard.error or shard.returncode != 0:
+                continue
+            owners = [(issue, self.attribute(shard, issue, file0)) for issue, file0 in shard.results]
+            run_issues = (run_issues or []) + [issue for issue, owner in owners if owner == 'run']
+            if any(owner is None for _, owner in owners):
+                continue
+            issues = {unit: [] for unit in shard.units}
+            for issue, owner in owners:
+                if owner != 'run' and issue['id'] not in WHOLE_PROGRAM_CHECKS:
+                    issues[owner].append(issue)
+            for unit in shard.units:
+                key = self.keys.get(unit) or self.scanner.digest(unit, self.salt)
+                write_json(self.entry_file(key), {'unit': unit, 'issues': issues[unit]})
+                self.index[unit] = key
+        self.index = {unit: key for unit, key in self.index.items() if os.path.exists(unit)}
+        write_json(self.index_file, self.index)
+        if run_issues is not None:
+            self.run_issues = [issue for issue in merge_issues([run_issues])
+                               if issue['id'] not in WHOLE_PROGRAM_CHECKS]
+            write_json(self.run_file, self.run_issues)
+        self.prune()
+
+    def prune(self, max_age_days=MAX_AGE_DAYS):
+        cutoff = time.time() - max_age_days * 86400
+        live = set(self.index.values())
+        for root, _, files in os.walk(os.path.join(self.directory, 'entries')):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    if name[:-len('.json')] not in live and os.path.getmtime(path) < cutoff:
+                        os.unlink(path)
+                except OSError:
+                    pass
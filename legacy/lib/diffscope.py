@@ -0,0 +1,156 @@
+"""
+Git-diff scoping for CPPCheck Studio
+Works out which translation units a change touches (changed units plus the
+units including a changed header) and which lines it changed, so an
+analysis can run on just those units and report just the issues on changed
+lines
+"""
+
+import os
+import re
+import subprocess
+from bisect import bisect_right
+
+HUNK_RE = re.compile(r'^@@ -\d+(?:,(\d+))? \+(\d+)(?:,(\d+))? @@')
+
+C_ESCAPES = {'a': 7, 'b': 8, 't': 9, 'n': 10, 'v': 11, 'f': 12, 'r': 13}
+
+# End of the interval covering a whole new or untracked file
+WHOLE_FILE = float('inf')
+
+
+def git(args, cwd):
+    result = subprocess.run(['git', '-c', 'core.quotePath=false'] + args, cwd=cwd,
+                            capture_output=True, text=True, errors='replace')
+    if result.returncode != 0:
+        raise ValueError(f"git {' '.join(args)}: {result.stderr.strip() or 'failed'}")
+    return result.stdout
+
+
+def unquote(path):
+    """A path from git output, which C-quotes names with unusual characters"""
+    if len(path) < 2 or path[0] != '"' or path[-1] != '"':
+        return path
+    body = path[1:-1]
+    data = bytearray()
+    index = 0
+    while index < len(body):
+        char = body[index]
+        if char == '\\' and index + 1 < len(body):
+            escaped = body[index + 1]
+            if escaped in '01234567':
+                data.append(int(body[index + 1:index + 4], 8) & 0xFF)
+                index += 4
+                continue
+            data.append(C_ESCAPES.get(escaped, ord(escaped)))
+            index += 2
+            continue
+        data += char.encode()
+        index += 1
+    return data.decode('utf-8', 'replace')
+
+
+def parse_diff(diff_text):
+    """{path: [(first, last) changed lines]} from `git diff -U0` output
+
+    Paths are relative to the repository root. A pure deletion marks the
+    lines either side of it.
+    """
+    hunks = {}
+    path = None
+    remaining = 0  # -/+ lines left in the current hunk (there is no context)
+    for line in diff_text.split('\n'):
+        if remaining:
+            if line[:1] in ('-', '+'):
+                remaining -= 1
+            continue
+        if line.startswith('+++ '):
+            target = unquote(line[4:].rstrip('\t'))
+            path = target[2:] if target.startswith('b/') else None
+            if path is not None:
+                hunks.setdefault(path, [])
+            continue
+        match = HUNK_RE.match(line)
+        if match and path is not None:
+            removed = int(match.group(1)) if match.group(1) is not None else 1
+            start = int(match.group(2))
+            count = int(match.group(3)) if match.group(3) is not None else 1
+            remaining = removed + count
+            if count:
+                hunks[path].append((start, start + count - 1))
+            else:
+                hunks[path].append((max(start, 1), start + 1))
+    return hunks
+
+
+class HunkIndex:
+    """Changed line intervals per file, answering "is this line changed?"
+    with a binary search over merged, sorted intervals"""
+
+    def __init__(self, hunks):
+        self.starts = {}
+        self.ends = {}
+        for path, intervals in hunks.items():
+            starts, ends = [], []
+            for first, last in sorted(intervals):
+                if starts and first <= ends[-1] + 1:
+                    ends[-1] = max(ends[-1], last)
+                else:
+                    starts.append(first)
+                    ends.append(last)
+            self.starts[path] = starts
+            self.ends[path] = ends
+
+    def files(self):
+        return list(self.starts)
+
+    def changed(self, path, line):
+        """Whether line of path was changed; line 0 (no line) counts when the
+        file changed at all"""
+        starts = self.starts.get(path)
+        if starts is None:
+            return False
+        if not line:
+            return True
+        index = bisect_right(starts, line) - 1
+        return index >= 0 and line <= self.ends[path][index]
+
+
+class DiffScope:
+    """The changes in the working tree of the repository holding path since ref"""
+
+    def __init__(self, ref, path='.'):
+        cwd = path if os.path.isdir(path) else os.path.dirname(path) or '.'
+        self.ref = ref
+        self.root = git(['rev-parse', '--show-toplevel'], cwd).strip()
+        try:
+            commit = git(['rev-parse', '--verify', '--quiet', f'{ref}^{{commit}}'], cwd).strip()
+        except ValueError:
+            raise ValueError(f'Not a commit: {ref}') from None
+        hunks = parse_diff(git(['diff', '-U0', '--no-color', '--no-ext-diff', '--src-prefix=a/', '--dst-prefix=b/',
+                                commit, '--'], self.root))
+        for untracked in git(['ls-files', '--others', '--exclude-standard', '-z'], self.root).split('\0'):
+            if untracked:
+                hunks[untracked] = [(1, WHOLE_FILE)]
+        # Keyed by real path, so paths spelled relative to anywhere match
+        self.index = HunkIndex({os.path.realpath(os.path.join(self.root, name)): lines
+                                for name, lines in hunks.items()})
+        self.real = {}
+
+    def realpath(self, path):
+        if path not in self.real:
+            self.real[path] = os.path.realpath(path)
+        return self.real[path]
+
+    def changed_files(self):
+        return self.index.files()
+
+    def select_units(self, units, scanner):
+        """The units that changed or include a changed header, in order"""
+        changed = set(self.changed_files())
+        return [unit for unit in units if any(self.realpath(path) in changed for path in scanner.closure(unit))]
+
+    def filter_issues(self, issues):
+        """The issues on changed lines"""
+        return [issue for issue in issues
+                if issue['file'] and self.index.changed(self.realpath(issue['file']), issue['line'])]
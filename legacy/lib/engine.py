@@ -0,0 +1,302 @@
+"""
+Parallel analysis engine for CPPCheck Studio
+Enumerates the translation units under a source path, splits them into shards
+and runs several cppcheck processes at once, each writing its own XML file;
+the per-shard results are merged into one issue list
+"""
+
+import os
+import shutil
+import statistics
+import subprocess
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+from live import parse_progress
+from schedule import plan_shards
+
+# Files cppcheck treats as translation units when given a directory
+SOURCE_EXTENSIONS = {'.c', '.cc', '.cpp', '.cxx', '.c++', '.ipp', '.ixx', '.tpp', '.txx'}
+
+# Directories never searched for translation units
+SKIP_DIRS = {'.git', '.hg', '.svn', '.cppcheck-studio'}
+
+# Shards per parallel process when there are several; small shards keep
+# every process busy until the queue runs dry
+SHARDS_PER_JOB = 4
+
+# Whole-program check that is meaningless per shard (cppcheck drops it with -j too);
+# a split run checks it in one extra process over every unit
+WHOLE_PROGRAM_CHECKS = {'unusedFunction'}
+
+
+def enabled_whole_program_checks(options):
+    """The WHOLE_PROGRAM_CHECKS that the --enable options turn on"""
+    enabled = set()
+    for option in options:
+        if option.startswith('--enable='):
+            enabled.update(option.split('=', 1)[1].split(','))
+    return set(WHOLE_PROGRAM_CHECKS) if 'all' in enabled else WHOLE_PROGRAM_CHECKS & enabled
+
+
+def whole_program_options(options, checks):
+    """options for a process that only looks for the given whole-program checks"""
+    return [option for option in options if not option.startswith('--enable=')] + \
+        [f"--enable={','.join(sorted(checks))}"]
+
+
+def find_translation_units(source_path):
+    """Sorted, normalized paths of the source files under source_path"""
+    if os.path.isfile(source_path):
+        return [os.path.normpath(source_path)]
+    units = []
+    for root, dirs, files in os.walk(source_path):
+        dirs[:] = sorted(d for d in dirs if d not in SKIP_DIRS)
+        for name in files:
+            if os.path.splitext(name)[1].lower() in SOURCE_EXTENSIONS:
+                units.append(os.path.normpath(os.path.join(root, name)))
+    return sorted(units)
+
+
+def split_shards(units, count):
+    """Split units into at most count contiguous shards of near-equal size"""
+    count = max(1, min(count, len(units)))
+    size, extra = divmod(len(units), count)
+    shards = []
+    start = 0
+    for index in range(count):
+        end = start + size + (index < extra)
+        if end > start:
+            shards.append(units[start:end])
+        start = end
+    return shards
+
+
+def parse_results_xml(xml_file):
+    """(issue, file0) pairs from a cppcheck --xml results file
+
+    file0 is the translation unit being checked when the issue was found
+    (None when cppcheck does not say). Only the primary location is kept.
+    """
+    results = []
+    for error in ET.parse(xml_file).getroot().iter('error'):
+        location = error.find('location')
+        if location is None:
+            location = {}
+        issue = {
+            'file': os.path.normpath(location.get('file')) if location.get('file') else '',
+            'line': to_int(location.get('line')),
+            'column': to_int(location.get('column')),
+            'severity': error.get('severity', 'style'),
+            'message': error.get('msg', ''),
+            'id': error.get('id', '')
+        }
+        file0 = error.get('file0') or location.get('file0')
+        results.append((issue, os.path.normpath(file0) if file0 else None))
+    return results
+
+
+def to_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def issue_key(issue):
+    return (issue['file'], issue['line'], issue['column'], issue['severity'], issue['id'], issue['message'])
+
+
+def merge_issues(issue_lists):
+    """One issue list from many: identical issues (a header reached from
+    units in different shards) appear once, in a fixed order"""
+    merged = {}
+    for issues in issue_lists:
+        for issue in issues:
+            merged.setdefault(issue_key(issue), issue)
+    return [merged[key] for key in sorted(merged)]
+
+
+class ShardResult:
+    """Outcome of one cppcheck process"""
+
+    def __init__(self, index, units):
+        self.index = index
+        self.units = units
+        self.results = []  # (issue, file0) pairs
+        self.seconds = 0.0
+        self.durations = {}  # unit -> seconds spent checking it
+        self.startup = None  # seconds before the first file was started
+        self.returncode = None
+        self.log = []
+        self.error = None
+
+
+def run_shard(index, units, options, work_dir, cppcheck='cppcheck', on_file=None, build_cache=None):
+    """Run cppcheck over one shard; on_file() is called as each file finishes
+
+    A file's duration runs from its "Checking" line to the next file's.
+    With a BuildDirCache the shard gets its own seeded build directory.
+    """
+    shard = ShardResult(index, units)
+    file_list = Path(work_dir) / f'shard-{index}.files'
+    xml_file = Path(work_dir) / f'shard-{index}.xml'
+    file_list.write_text(''.join(unit + '\n' for unit in units))
+    options = list(options)
+    if build_cache is not None:
+        build_dir = Path(work_dir) / f'shard-{index}.build'
+        seeded = build_cache.seed(build_dir, units)
+        options.append(f'--cppcheck-build-dir={build_dir}')
+    cmd = [cppcheck] + options + ['--xml', f'--output-file={xml_file}', f'--file-list={file_list}']
+
+    started = time.monotonic()
+    current = None
+    file_started = started
+    # stderr is merged so one reader can never block on the other pipe. A
+    # file is done when cppcheck moves on to the next one (per-configuration
+    # "Checking" lines repeat the same file).
+    with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                          text=True, errors='replace') as process:
+        for line in process.stdout:
+            update = parse_progress(line)
+            if update is None:
+                if line.strip():
+                    shard.log.append(line.rstrip())
+            elif update.get('file') and os.path.normpath(update['file']) != current:
+                now = time.monotonic()
+                if current:
+                    shard.durations[current] = now - file_started
+                    if on_file:
+                        on_file()
+                else:
+                    shard.startup = now - started
+                current = os.path.normpath(update['file'])
+                file_started = now
+    finished = time.monotonic()
+    if current:
+        shard.durations[current] = finished - file_started
+        if on_file:
+            on_file()
+    shard.returncode = process.returncode
+    shard.seconds = finished - started
+    if build_cache is not None and process.returncode == 0:
+        build_cache.harvest(build_dir, units, seeded)
+
+    try:
+        shard.results = parse_results_xml(xml_file)
+    except (OSError, ET.ParseError) as error:
+        shard.error = f'shard {index}: no usable results ({error})'
+    return shard
+
+
+class AnalysisRun:
+    """Merged outcome of a sharded analysis"""
+
+    def __init__(self, shards, issues, seconds, jobs, predicted=None, reused=0, dropped_checks=(),
+                 whole_program=None):
+        self.shards = shards
+        self.issues = issues
+        self.seconds = seconds
+        self.jobs = jobs
+        self.predicted = predicted  # predicted seconds per shard, if scheduled from history
+        self.reused = reused  # units whose issues came from the result cache
+        self.dropped_checks = sorted(dropped_checks)  # enabled whole-program checks left out
+        self.whole_program = whole_program  # ShardResult of the whole-program pass, if one ran
+
+    @property
+    def predicted_makespan(self):
+        return max(self.predicted) if self.predicted else None
+
+    @property
+    def errors(self):
+        shards = self.shards + ([self.whole_program] if self.whole_program else [])
+        return [shard.error for shard in shards if shard.error]
+
+
+def run_analysis(units, options, work_dir, jobs=None, cppcheck='cppcheck', on_file=None, history=None,
+                 cache=None, build_cache=None):
+    """Analyze units with up to jobs cppcheck processes at once
+
+    With a TimingHistory that knows some of the units, they are packed
+    longest first into one shard per process; otherwise they are split into
+    small shards that the processes pull in turn. The measured durations are
+    recorded into the history (the caller saves it). A single process runs
+    everything as one shard, whole-program checks included. When the units
+    are split across shards or partly answered from the cache, the enabled
+    whole-program checks run in one more process over every unit, started
+    first next to the shards; if it fails they are listed in dropped_checks.
+
+    With a ResultCache, only the units it cannot answer for are analyzed and
+    their results are stored back; the whole-program findings are stored
+    per run and reused while no unit changes. A BuildDirCache lets cppcheck itself
+    skip the units whose preprocessed code it has seen before.
+    """
+    jobs = max(1, jobs or os.cpu_count() or 1)
+    work_dir = Path(work_dir)
+    work_dir.mkdir(parents=True, exist_ok=True)
+    for stale in work_dir.glob('shard-*'):
+        if stale.is_dir():
+            shutil.rmtree(stale)
+        else:
+            stale.unlink()
+
+    all_units = units
+    cached, units = cache.lookup(units) if cache is not None else ({}, units)
+    if on_file:
+        for _ in cached:
+            on_file()
+
+    predicted = history.predict(units) if history is not None else None
+    if predicted:
+        shards, loads = plan_shards(units, jobs, predicted, history.startup or 0.0)
+    else:
+        shards, loads = split_shards(units, jobs * SHARDS_PER_JOB if jobs > 1 else 1), None
+    checks = enabled_whole_program_checks(options)
+    split = len(shards) > 1 or cached
+    started = time.monotonic()
+    reused_program = None
+    if checks and split and cache is not None:
+        reused_program = cache.whole_program(all_units)
+    with ThreadPoolExecutor(jobs) as pool:
+        program = None
+        if checks and split and reused_program is None:
+            # Submitted first: it parses every unit, so it is the longest
+            program = pool.submit(run_shard, len(shards), all_units, whole_program_options(options, checks),
+                                  work_dir, cppcheck)
+        futures = [pool.submit(run_shard, index, shard, options, work_dir, cppcheck, on_file, build_cache)
+                   for index, shard in enumerate(shards)]
+        results = sorted((future.result() for future in as_completed(futures)), key=lambda shard: shard.index)
+        program = program.result() if program else None
+    seconds = time.monotonic() - started
+
+    if history is not None:
+        startups = [shard.startup for shard in results if shard.startup is not None]
+        for shard in results:
+            if shard.returncode == 0 and not shard.error:
+                history.record(shard.durations)
+        history.record({}, statistics.median(startups) if startups else None)
+
+    if cache is not None:
+        cache.store(results)
+
+    reused = list(cached.values()) + ([cache.run_issues] if cache is not None else [])
+    issues = merge_issues(reused + [[issue for issue, _ in shard.results] for shard in results])
+    # Findings of the whole-program checks over every unit, from the extra
+    # process or from a single unsplit one
+    dropped = set()
+    found = None
+    if program:
+        if program.error or program.returncode != 0:
+            dropped = checks
+        else:
+            found = [issue for issue, _ in program.results if issue['id'] in checks]
+    elif checks and not split and results and not results[0].error and results[0].returncode == 0:
+        found = [issue for issue, _ in results[0].results if issue['id'] in checks]
+    if cache is not None and found is not None:
+        cache.store_whole_program(all_units, found)
+    if split:
+        issues = [issue for issue in issues if issue['id'] not in WHOLE_PROGRAM_CHECKS]
+        issues = merge_issues([issues, reused_program or found or []])
+    return AnalysisRun(results, issues, seconds, jobs, loads, len(cached), dropped, program)
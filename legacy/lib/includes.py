@@ -0,0 +1,106 @@
+"""
+Include scanning for CPPCheck Studio
+Finds the headers a translation unit pulls in, transitively, the way
+cppcheck's preprocessor resolves them: quoted includes relative to the
+including file first, then the -I directories; angle includes from the -I
+directories only (anything else is a system header). Conditional
+compilation is ignored, so the result is a superset of what a given
+configuration really includes.
+"""
+
+import hashlib
+import os
+import re
+
+INCLUDE_RE = re.compile(rb'^[ \t]*#[ \t]*include[ \t]*([<"])([^>"\r\n]+)[>"]', re.M)
+
+
+def include_paths(options):
+    """The -I directories from a list of cppcheck options"""
+    paths = []
+    options = list(options)
+    for index, option in enumerate(options):
+        if option == '-I' and index + 1 < len(options):
+            paths.append(options[index + 1])
+        elif option.startswith('-I') and len(option) > 2:
+            paths.append(option[2:])
+    return paths
+
+
+class IncludeScanner:
+    """Reads each file once and answers include and content-hash queries
+
+    Paths are returned normalized but otherwise as cppcheck would print
+    them (relative paths stay relative to the working directory).
+    """
+
+    def __init__(self, paths=()):
+        self.paths = list(paths)
+        self.hashes = {}    # file -> sha256 of its contents, None when unreadable
+        self.includes = {}  # file -> resolved headers it includes directly
+        self.missing = {}   # file -> quoted includes that could not be resolved
+        self.closures = {}
+
+    def scan(self, path):
+        if path in self.includes:
+            return
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            self.hashes[path] = None
+            self.includes[path] = []
+            self.missing[path] = []
+            return
+        self.hashes[path] = hashlib.sha256(data).hexdigest()
+        found, missing = [], []
+        for kind, name in INCLUDE_RE.findall(data):
+            name = name.decode('utf-8', 'replace').strip()
+            resolved = self.resolve(path, name, kind == b'"')
+            if resolved:
+                found.append(resolved)
+            elif kind == b'"':
+                missing.append(name)
+        self.includes[path] = found
+        self.missing[path] = missing
+
+    def resolve(self, includer, name, quoted):
+        candidates = [os.path.join(os.path.dirname(includer), name)] if quoted else []
+        candidates += [os.path.join(directory, name) for directory in self.paths]
+        for candidate in candidates:
+            if os.path.isfile(candidate):
+                return os.path.normpath(candidate)
+        return None
+
+    def closure(self, unit):
+        """unit and every header it includes, directly or not"""
+        if unit not in self.closures:
+            seen = set()
+            pending = [unit]
+            while pending:
+                path = pending.pop()
+                if path in seen:
+                    continue
+                seen.add(path)
+                self.scan(path)
+                pending.extend(self.includes[path])
+            self.closures[unit] = seen
+        return self.closures[unit]
+
+    def digest(self, unit, salt=''):
+        """Hash of unit's contents, its headers' contents and salt
+
+        Unresolved quoted includes are part of the hash, so creating the
+        missing header changes it.
+        """
+        h = hashlib.sha256(salt.encode())
+        for path in sorted(self.closure(unit)):
+            h.update(f'\0{path}\0{self.hashes[path]}'.encode())
+            for name in self.missing[path]:
+                h.update(f'\0missing\0{name}'.encode())
+        return h.hexdigest()
+
+    def dependents(self, units, headers):
+        """The units whose closure contains any of headers"""
+        headers = set(headers)
+        return [unit for unit in units if headers & self.closure(unit)]
@@ -0,0 +1,330 @@
+"""
+Live analysis server for CPPCheck Studio
+Runs cppcheck as a subprocess and streams its progress and issues to
+connected dashboards as Server-Sent Events while the analysis is running
+"""
+
+import asyncio
+import json
+import re
+import time
+from datetime import datetime
+from urllib.parse import urlsplit
+
+# Issue lines on stderr: tab-separated, message last (cppcheck expands \t)
+LIVE_TEMPLATE = '{file}\\t{line}\\t{column}\\t{severity}\\t{id}\\t{message}'
+
+# Progress lines on stdout
+CHECKING_RE = re.compile(r'^Checking (.+?)(?: \.\.\.|: .*)$')
+PROGRESS_RE = re.compile(r'^(\d+)/(\d+) files checked (\d+)% done$')
+
+# Longest output line read from cppcheck
+LINE_LIMIT = 1 << 20
+
+DEFAULT_PORT = 8081
+
+
+def parse_issue(line):
+    """Issue dict from one LIVE_TEMPLATE line, None for any other output"""
+    parts = line.rstrip('\r\n').split('\t', 5)
+    if len(parts) != 6:
+        return None
+    file_path, line_num, column, severity, issue_id, message = parts
+    return {
+        'file': file_path,
+        'line': int(line_num) if line_num.isdigit() else 0,
+        'column': int(column) if column.isdigit() else 0,
+        'severity': severity,
+        'message': message,
+        'id': issue_id
+    }
+
+
+def parse_progress(line):
+    """Progress update from one stdout line: {'file': ...} when cppcheck
+    starts a file, {'checked', 'total', 'percent'} after it; None otherwise"""
+    line = line.strip()
+    match = PROGRESS_RE.match(line)
+    if match:
+        checked, total, percent = (int(group) for group in match.groups())
+        return {'checked': checked, 'total': total, 'percent': percent}
+    match = CHECKING_RE.match(line)
+    if match:
+        return {'file': match.group(1)}
+    return None
+
+
+def live_command(options, source_path):
+    """cppcheck command line whose output LiveAnalysis can parse"""
+    return ['cppcheck'] + list(options) + [f'--template={LIVE_TEMPLATE}', source_path]
+
+
+class LiveAnalysis:
+    """One cppcheck run and the numbered event log its dashboards replay
+
+    Events are never dropped, so a client that connects late, or reconnects
+    with Last-Event-ID, first catches up on everything it missed.
+    """
+
+    def __init__(self, cmd, output_file=None):
+        self.cmd = cmd
+        self.output_file = output_file
+        self.issues = []
+        self.events = []
+        self.progress = {'checked': 0, 'total': 0, 'percent': 0, 'file': None}
+        self.done = False
+        self.returncode = None
+        self.started = None
+        self.wakeup = asyncio.Event()
+
+    def emit(self, kind, data):
+        self.events.append((kind, json.dumps(data, separators=(',', ':'))))
+        # Wake every waiting client; later waiters get a fresh event
+        self.wakeup.set()
+        self.wakeup = asyncio.Event()
+
+    async def run(self):
+        """Run cppcheck to completion, emitting events as output arrives"""
+        self.started = time.monotonic()
+        self.emit('start', {'command': self.cmd})
+        process = await asyncio.create_subprocess_exec(
+            *self.cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            limit=LINE_LIMIT
+        )
+        await asyncio.gather(self.read_progress(process.stdout), self.read_issues(process.stderr))
+        self.returncode = await process.wait()
+        self.finish()
+        return self.issues
+
+    async def read_progress(self, stream):
+        async for raw in stream:
+            update = parse_progress(raw.decode('utf-8', 'replace'))
+            if update:
+                self.progress.update(update)
+                self.emit('progress', self.progress)
+
+    async def read_issues(self, stream):
+        async for raw in stream:
+            line = raw.decode('utf-8', 'replace')
+            issue = parse_issue(line)
+            if issue:
+                self.issues.append(issue)
+                self.emit('issue', issue)
+            elif line.strip():
+                self.emit('log', {'text': line.rstrip()})
+
+    def finish(self):
+        if self.output_file:
+            with open(self.output_file, 'w') as f:
+                json.dump(self.snapshot(), f, indent=2)
+        self.done = True
+        self.emit('done', {
+            'returncode': self.returncode,
+            'total': len(self.issues),
+            'elapsed': round(time.monotonic() - self.started, 3)
+        })
+
+    def snapshot(self):
+        return {'issues': self.issues, 'timestamp': datetime.now().isoformat()}
+
+    async def stream(self, writer, last_event_id=-1):
+        """Write events after last_event_id as SSE until the run is done"""
+        writer.write(b'retry: 2000\n\n')
+        position = last_event_id + 1
+        while True:
+            wakeup = self.wakeup
+            if position < len(self.events):
+                # Everything pending goes out in one write
+                chunk = []
+                for event_id in range(position, len(self.events)):
+                    kind, data = self.events[event_id]
+                    chunk.append(f'id: {event_id}\nevent: {kind}\ndata: {data}\n\n')
+                position = len(self.events)
+                writer.write(''.join(chunk).encode('utf-8'))
+                await writer.drain()
+            elif self.done:
+                return
+            else:
+                await wakeup.wait()
+
+
+async def read_request(reader):
+    """(method, path, headers) of one HTTP request"""
+    request_line = (await reader.readline()).decode('latin-1').split()
+    headers = {}
+    while True:
+        line = (await reader.readline()).decode('latin-1')
+        if line in ('\r\n', '\n', ''):
+            break
+        name, _, value = line.partition(':')
+        headers[name.strip().lower()] = value.strip()
+    if len(request_line) < 2:
+        return None, None, headers
+    return request_line[0], urlsplit(request_line[1]).path, headers
+
+
+def response_head(status, content_type, length=None):
+    lines = [f'HTTP/1.1 {status}', f'Content-Type: {content_type}', 'Cache-Control: no-cache',
+             'Access-Control-Allow-Origin: *', 'Connection: close']
+    if length is not None:
+        lines.append(f'Content-Length: {length}')
+    return ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+
+
+async def handle_client(analysis, reader, writer):
+    """Serve the live page, its event stream and the current results"""
+    try:
+        method, path, headers = await read_request(reader)
+        if method != 'GET':
+            writer.write(response_head('405 Method Not Allowed', 'text/plain', 0))
+        elif path == '/events':
+            try:
+                last_event_id = int(headers.get('last-event-id', -1))
+            except ValueError:
+                last_event_id = -1
+            writer.write(response_head('200 OK', 'text/event-stream'))
+            await analysis.stream(writer, last_event_id)
+        elif path in ('/', '/index.html'):
+            body = LIVE_PAGE.encode('utf-8')
+            writer.write(response_head('200 OK', 'text/html; charset=utf-8', len(body)) + body)
+        elif path == '/analysis.json':
+            body = json.dumps(analysis.snapshot()).encode('utf-8')
+            writer.write(response_head('200 OK', 'application/json', len(body)) + body)
+        else:
+            writer.write(response_head('404 Not Found', 'text/plain', 0))
+        await writer.drain()
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass  # client went away
+    finally:
+        writer.close()
+
+
+async def start_server(analysis, host='127.0.0.1', port=DEFAULT_PORT):
+    return await asyncio.start_server(lambda r, w: handle_client(analysis, r, w), host, port)
+
+
+async def serve_analysis(analysis, host='127.0.0.1', port=DEFAULT_PORT, ready=None):
+    """Run the analysis while serving it; keeps serving the finished results
+    until cancelled. ready(url) is called once the server is listening."""
+    server = await start_server(analysis, host, port)
+    async with server:
+        if ready:
+            ready(f'http://localhost:{server.sockets[0].getsockname()[1]}/')
+        await analysis.run()
+        await server.serve_forever()
+
+
+LIVE_PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>CPPCheck Studio - Live Analysis</title>
+    <style>
+        * { margin: 0; padding: 0; box-sizing: border-box; }
+        body { font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif; background: #f5f7fa; color: #2d3748; }
+        .container { max-width: 1400px; margin: 0 auto; padding: 20px; }
+        .header { background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 20px 30px; border-radius: 8px; margin-bottom: 20px; }
+        .status { margin-top: 8px; opacity: 0.9; font-size: 0.9em; }
+        .progress { height: 8px; background: rgba(255,255,255,0.3); border-radius: 4px; margin-top: 12px; overflow: hidden; }
+        .progress-bar { height: 100%; width: 0; background: white; transition: width 0.3s; }
+        .counts { display: flex; gap: 10px; margin-bottom: 20px; flex-wrap: wrap; }
+        .count { background: white; padding: 10px 16px; border-radius: 8px; box-shadow: 0 1px 3px rgba(0,0,0,0.1); }
+        .count strong { font-size: 1.3em; margin-right: 6px; }
+        table { width: 100%; border-collapse: collapse; background: white; border-radius: 8px; table-layout: fixed; }
+        th { text-align: left; padding: 10px 12px; background: #f7fafc; font-size: 0.8em; text-transform: uppercase; color: #4a5568; }
+        td { padding: 8px 12px; border-top: 1px solid #e2e8f0; font-size: 0.85em; overflow-wrap: anywhere; vertical-align: top; }
+        .col-line { width: 70px; } .col-severity { width: 120px; } .col-id { width: 180px; }
+        .severity { display: inline-block; padding: 2px 8px; border-radius: 10px; color: white; font-size: 0.75em; font-weight: 600; background: #a0aec0; }
+        .severity.error { background: #e53e3e; } .severity.warning { background: #dd6b20; }
+        .severity.style { background: #3182ce; } .severity.performance { background: #38a169; }
+        .severity.portability { background: #805ad5; } .severity.information { background: #718096; }
+        #log { margin-top: 20px; color: #718096; font-family: monospace; font-size: 0.8em; white-space: pre-wrap; }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <header class="header">
+            <h1>CPPCheck Studio - Live Analysis</h1>
+            <div class="status" id="status">Connecting...</div>
+            <div class="progress"><div class="progress-bar" id="progressBar"></div></div>
+        </header>
+        <div class="counts" id="counts"></div>
+        <table>
+            <thead>
+                <tr><th>File</th><th class="col-line">Line</th><th class="col-severity">Severity</th><th>Message</th><th class="col-id">ID</th></tr>
+            </thead>
+            <tbody id="issuesBody"></tbody>
+        </table>
+        <div id="log"></div>
+    </div>
+    <script>
+        const counts = {};
+        let pending = [];
+        let frame = 0;
+        let total = 0;
+
+        // Issues arrive in bursts; rows are appended once per animation frame
+        function flush() {
+            frame = 0;
+            const fragment = document.createDocumentFragment();
+            pending.forEach(issue => {
+                const row = document.createElement('tr');
+                ['file', 'line', 'severity', 'message', 'id'].forEach(field => {
+                    const cell = document.createElement('td');
+                    if (field === 'severity') {
+                        const badge = document.createElement('span');
+                        badge.className = 'severity ' + issue.severity;
+                        badge.textContent = issue.severity.toUpperCase();
+                        cell.appendChild(badge);
+                    } else {
+                        cell.textContent = issue[field] || '-';
+                    }
+                    row.appendChild(cell);
+                });
+                fragment.appendChild(row);
+            });
+            pending = [];
+            document.getElementById('issuesBody').appendChild(fragment);
+            // Severities come from cppcheck's output: text nodes only
+            document.getElementById('counts').replaceChildren(...Object.keys(counts).sort().map(severity => {
+                const count = document.createElement('div');
+                const strong = document.createElement('strong');
+                count.className = 'count';
+                strong.textContent = counts[severity];
+                count.append(strong, severity);
+                return count;
+            }));
+        }
+
+        const source = new EventSource('/events');
+        source.addEventListener('issue', event => {
+            const issue = JSON.parse(event.data);
+            counts[issue.severity] = (counts[issue.severity] || 0) + 1;
+            total++;
+            pending.push(issue);
+            if (!frame) frame = requestAnimationFrame(flush);
+        });
+        source.addEventListener('progress', event => {
+            const progress = JSON.parse(event.data);
+            const files = progress.total ? progress.checked + '/' + progress.total + ' files' : '';
+            document.getElementById('status').textContent =
+                'Checking ' + (progress.file || '...') + ' ' + files + ' - ' + total + ' issues so far';
+            document.getElementById('progressBar').style.width = progress.percent + '%';
+        });
+        source.addEventListener('log', event => {
+            document.getElementById('log').textContent += JSON.parse(event.data).text + '\\n';
+        });
+        source.addEventListener('done', event => {
+            const done = JSON.parse(event.data);
+            source.close();
+            document.getElementById('status').textContent = 'Analysis complete: ' + done.total +
+                ' issues in ' + done.elapsed.toFixed(1) + 's' + (done.returncode ? ' (cppcheck exited with ' + done.returncode + ')' : '');
+            document.getElementById('progressBar').style.width = '100%';
+        });
+    </script>
+</body>
+</html>
+"""
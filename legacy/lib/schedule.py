@@ -0,0 +1,88 @@
+"""
+Longest-processing-time-first scheduling for sharded analysis
+Per-file durations measured in earlier runs predict how long each translation
+unit will take; units are bin-packed longest first onto one shard per process
+so the processes finish at about the same time
+"""
+
+import heapq
+import json
+import os
+import statistics
+
+HISTORY_VERSION = 1
+
+# Weight of the newest measurement in a file's smoothed duration
+SMOOTHING = 0.5
+
+
+class TimingHistory:
+    """Smoothed per-file analysis durations kept between runs"""
+
+    def __init__(self, path):
+        self.path = path
+        self.files = {}
+        self.startup = None  # seconds before a cppcheck process starts its first file
+        try:
+            with open(path) as f:
+                data = json.load(f)
+            if data.get('version') == HISTORY_VERSION:
+                self.files = data['files']
+                self.startup = data.get('startup')
+        except (OSError, ValueError, KeyError):
+            pass
+
+    def __len__(self):
+        return len(self.files)
+
+    def predict(self, units):
+        """Predicted seconds per unit, or None without any usable history
+
+        Files not timed before are estimated from their size at the median
+        seconds-per-byte of the timed ones.
+        """
+        known = [unit for unit in units if unit in self.files]
+        if not known:
+            return None
+        sizes = {unit: file_size(unit) for unit in units}
+        rates = [self.files[unit] / sizes[unit] for unit in known if sizes[unit]]
+        rate = statistics.median(rates) if rates else 0.0
+        return {unit: self.files[unit] if unit in self.files else sizes[unit] * rate for unit in units}
+
+    def record(self, durations, startup=None):
+        for unit, seconds in durations.items():
+            previous = self.files.get(unit)
+            self.files[unit] = seconds if previous is None else previous + SMOOTHING * (seconds - previous)
+        if startup is not None:
+            self.startup = startup if self.startup is None else self.startup + SMOOTHING * (startup - self.startup)
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        temp = self.path + '.tmp'
+        with open(temp, 'w') as f:
+            json.dump({'version': HISTORY_VERSION, 'startup': self.startup,
+                       'files': {unit: round(seconds, 4) for unit, seconds in sorted(self.files.items())}}, f)
+        os.replace(temp, self.path)
+
+
+def file_size(path):
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def plan_shards(units, count, predicted, startup=0.0):
+    """Pack units into at most count shards, longest first onto the least
+    loaded shard; returns (shards, predicted seconds per shard)"""
+    count = max(1, min(count, len(units)))
+    heap = [(startup, index) for index in range(count)]
+    shards = [[] for _ in range(count)]
+    loads = [startup] * count
+    for unit in sorted(units, key=lambda unit: (-predicted[unit], unit)):
+        load, index = heapq.heappop(heap)
+        shards[index].append(unit)
+        loads[index] = load + predicted[unit]
+        heapq.heappush(heap, (loads[index], index))
+    planned = [(shard, load) for shard, load in zip(shards, loads) if shard]
+    return [shard for shard, _ in planned], [load for _, load in planned]
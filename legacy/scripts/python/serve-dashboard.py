@@ -1,54 +1,223 @@
-#\!/usr/bin/env python3
+#!/usr/bin/env python3
 """
 Simple HTTP server to serve the dashboard and JSONL files
 Solves CORS issues with loading local files
+
+Requests are handled on their own threads and files are streamed with
+sendfile, so several people opening a large dataset are not served one after
+another. Precompressed name.gz siblings are sent to gzip-capable clients, and
+ETag / Last-Modified let browsers revalidate instead of downloading again.
 """
 
+import email.utils
+import functools
 import http.server
-import socketserver
 import os
+import re
+import socketserver
 import sys
 
 PORT = 8080
 
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+# Content-hashed data file names written by the generators' --service-worker
+# mode (name.<10 hex digits>.ext); their content never changes
+VERSIONED_RE = re.compile(r'\.[0-9a-f]{10}\.[A-Za-z0-9]+$')
+
+
+def parse_range(header, size):
+    """Parse a single-range 'bytes=' header into inclusive (start, end)
+
+    Returns None when the header is absent or not a single byte range (the
+    whole file is sent), and raises ValueError when it cannot be satisfied.
+    """
+    if not header:
+        return None
+    match = RANGE_RE.match(header.strip())
+    if not match or match.groups() == ('', ''):
+        return None
+    first, last = match.groups()
+    if first == '':
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            raise ValueError(header)
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError(header)
+    return start, end
+
+
+def file_etag(stat, encoding=None):
+    """Strong ETag from size and modification time; each encoding of a file
+    is a different representation and gets its own tag"""
+    suffix = f'-{encoding}' if encoding else ''
+    return f'"{stat.st_size:x}-{stat.st_mtime_ns:x}{suffix}"'
+
+
+def accepts_gzip(header):
+    """Whether an Accept-Encoding header allows gzip"""
+    for part in (header or '').split(','):
+        coding, _, params = part.partition(';')
+        if coding.strip().lower() in ('gzip', '*'):
+            quality = params.replace(' ', '').lower()
+            if quality.startswith('q='):
+                try:
+                    return float(quality[2:]) > 0
+                except ValueError:
+                    return False
+            return True
+    return False
+
+
 class CORSRequestHandler(http.server.SimpleHTTPRequestHandler):
+    # Keep-alive, so a page's many small requests reuse one connection
+    protocol_version = 'HTTP/1.1'
+    extensions_map = dict(http.server.SimpleHTTPRequestHandler.extensions_map,
+                          **{'.jsonl': 'application/x-ndjson'})
+
     def end_headers(self):
         self.send_header('Access-Control-Allow-Origin', '*')
-        self.send_header('Access-Control-Allow-Methods', 'GET')
-        self.send_header('Cache-Control', 'no-store, no-cache, must-revalidate')
+        self.send_header('Access-Control-Allow-Methods', 'GET, HEAD')
+        self.send_header('Access-Control-Allow-Headers', 'Range')
+        self.send_header('Access-Control-Expose-Headers', 'Content-Range, Content-Length, ETag')
+        if VERSIONED_RE.search(self.path.split('?', 1)[0]):
+            self.send_header('Cache-Control', 'public, max-age=31536000, immutable')
+        else:
+            # Revalidate (If-None-Match / If-Modified-Since) instead of
+            # refetching every time
+            self.send_header('Cache-Control', 'no-cache')
         super().end_headers()
 
     def do_GET(self):
-        # Set correct content type for JSONL files
-        if self.path.endswith('.jsonl'):
-            self.send_response(200)
-            self.send_header('Content-type', 'application/x-ndjson')
-            self.end_headers()
-            
-            file_path = self.path.lstrip('/')
-            if os.path.exists(file_path):
-                with open(file_path, 'rb') as f:
-                    self.wfile.write(f.read())
+        self.send_file()
+
+    def do_HEAD(self):
+        self.send_file(head=True)
+
+    def send_file(self, head=False):
+        """Send a file, or the byte range of it asked for; directories get
+        the stock index or listing"""
+        file_path = self.translate_path(self.path)
+        if os.path.isdir(file_path):
+            if head:
+                super().do_HEAD()
             else:
-                self.send_error(404, f"File not found: {file_path}")
-        else:
-            super().do_GET()
+                super().do_GET()
+            return
+        if not os.path.isfile(file_path):
+            self.send_error(404, f"File not found: {self.path}")
+            return
+
+        # Ranges address the identity encoding, so they never get the .gz
+        range_header = self.headers.get('Range')
+        encoded = None if range_header else self.precompressed(file_path)
+        with open(encoded or file_path, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            etag = file_etag(stat, 'gzip' if encoded else None)
+            if self.not_modified(etag, stat.st_mtime):
+                self.send_response(304)
+                self.send_header('ETag', etag)
+                self.send_header('Vary', 'Accept-Encoding')
+                self.end_headers()
+                return
+
+            size = stat.st_size
+            if_range = self.headers.get('If-Range')
+            if if_range and if_range.strip() != etag:
+                range_header = None  # changed since the client's copy: send it all
+            try:
+                byte_range = parse_range(range_header, size)
+            except ValueError:
+                self.send_response(416)
+                self.send_header('Content-Range', f'bytes */{size}')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+
+            if byte_range is None:
+                start, end = 0, size - 1
+                self.send_response(200)
+            else:
+                start, end = byte_range
+                self.send_response(206)
+                self.send_header('Content-Range', f'bytes {start}-{end}/{size}')
+            length = end - start + 1
+
+            self.send_header('Content-type', self.guess_type(file_path))
+            if encoded:
+                self.send_header('Content-Encoding', 'gzip')
+            self.send_header('Vary', 'Accept-Encoding')
+            self.send_header('ETag', etag)
+            self.send_header('Last-Modified', self.date_time_string(stat.st_mtime))
+            self.send_header('Accept-Ranges', 'bytes')
+            self.send_header('Content-Length', str(length))
+            self.end_headers()
+
+            # Kernel-side copy where available (socket.sendfile falls back
+            # to send() elsewhere); the file is never read into memory
+            if not head and length > 0:
+                self.connection.sendfile(f, start, length)
+
+    def precompressed(self, file_path):
+        """Up-to-date name.gz sibling to send instead, if the client takes gzip"""
+        if not accepts_gzip(self.headers.get('Accept-Encoding')):
+            return None
+        gz_path = file_path + '.gz'
+        try:
+            if os.path.getmtime(gz_path) >= os.path.getmtime(file_path):
+                return gz_path
+        except OSError:
+            pass
+        return None
+
+    def not_modified(self, etag, mtime):
+        """Whether the client's cached copy (If-None-Match, else
+        If-Modified-Since) is still current"""
+        if_none_match = self.headers.get('If-None-Match')
+        if if_none_match is not None:
+            tags = [tag.strip() for tag in if_none_match.split(',')]
+            tags = [tag[2:] if tag.startswith('W/') else tag for tag in tags]
+            return '*' in tags or etag in tags
+        if_modified_since = self.headers.get('If-Modified-Since')
+        if if_modified_since:
+            try:
+                since = email.utils.parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError, IndexError, OverflowError):
+                return False
+            return since.tzinfo is not None and int(mtime) <= since.timestamp()
+        return False
+
+
+class ThreadingHTTPServer(socketserver.ThreadingMixIn, http.server.HTTPServer):
+    """http.server.ThreadingHTTPServer, which only exists from Python 3.7"""
+    daemon_threads = True
+
+
+def make_server(port=PORT, directory=None, handler_class=CORSRequestHandler):
+    """Threaded server for directory (default: the current one; serving
+    another directory needs Python 3.7)"""
+    handler = handler_class
+    if directory is not None:
+        handler = functools.partial(handler_class, directory=directory)
+    return ThreadingHTTPServer(("", port), handler)
+
 
 if __name__ == '__main__':
     os.chdir(os.path.dirname(os.path.abspath(__file__)) or '.')
-    
-    Handler = CORSRequestHandler
-    
+
     print(f"Starting server on http://localhost:{PORT}")
     print(f"Serving directory: {os.getcwd()}")
     print("\nOpen your browser to:")
     print(f"  http://localhost:{PORT}/VIRTUAL_SCROLL_DASHBOARD.html")
     print("\nPress Ctrl+C to stop the server")
-    
-    with socketserver.TCPServer(("", PORT), Handler) as httpd:
+
+    with make_server(PORT) as httpd:
         try:
             httpd.serve_forever()
         except KeyboardInterrupt:
             print("\nShutting down server...")
             sys.exit(0)
-EOF < /dev/null
\ No newline at end of file
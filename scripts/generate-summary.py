@@ -1,17 +1,18 @@
 #!/usr/bin/env python3
 """Generate a summary of CPPCheck analysis results."""
 
-import json
 import sys
+from pathlib import Path
 from collections import Counter
 
+# Shared with the dashboard generators (reads analysis JSON or columnar JSONL)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'generate'))
+from columnar import load_issues
+
 def generate_summary(json_file):
     """Generate a text summary of the analysis results."""
     try:
-        with open(json_file, 'r') as f:
-            data = json.load(f)
-        
-        issues = data.get('issues', [])
+        issues = load_issues(json_file)
         if not issues:
             print("No issues found!")
             return
@@ -46,7 +47,7 @@ def generate_summary(json_file):
 
 if __name__ == "__main__":
     if len(sys.argv) != 2:
-        print("Usage: generate-summary.py <analysis.json>")
+        print("Usage: generate-summary.py <analysis.json|issues.jsonl>")
         sys.exit(1)
     
     generate_summary(sys.argv[1])
\ No newline at end of file
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Stand-in for cppcheck used by the analysis engine tests
+
+Reads --file-list, prints cppcheck's progress lines and writes --xml results
+to --output-file. Every "BUG:<id>" marker in a checked file, or in a header
+it includes with #include "...", is reported once per process (as cppcheck
+deduplicates), with file0 naming the translation unit being checked.
+"SLOW:<seconds>" makes checking that file take that long.
+
+With --enable=all or information, like cppcheck, an #include "..." that
+cannot be found is reported as missingInclude and a checkersReport ends the
+results; neither carries a file0.
+
+With --cppcheck-build-dir, each unit's findings are kept in <stem>.a<n>
+under a checksum of its sources; a unit whose checksum matches is not
+checked again (no SLOW delay) and its stored findings are replayed.
+"""
+
+import hashlib
+import os
+import re
+import sys
+import time
+from xml.sax.saxutils import quoteattr
+
+INCLUDE_RE = re.compile(r'^\s*#\s*include\s*"([^"]+)"', re.M)
+BUG_RE = re.compile(r'BUG:(\w+)')
+SLOW_RE = re.compile(r'SLOW:([\d.]+)')
+
+
+def option(name):
+    for arg in sys.argv[1:]:
+        if arg.startswith(name + '='):
+            return arg.split('=', 1)[1]
+    return None
+
+
+def sources(path, seen):
+    """path and the headers it includes, depth first"""
+    if path in seen or not os.path.isfile(path):
+        return
+    seen.add(path)
+    yield path
+    with open(path) as f:
+        text = f.read()
+    for include in INCLUDE_RE.findall(text):
+        yield from sources(os.path.normpath(os.path.join(os.path.dirname(path), include)), seen)
+
+
+def main():
+    if '--version' in sys.argv:
+        print('Cppcheck 2.13.0')
+        return
+    with open(option('--file-list')) as f:
+        units = [line.strip() for line in f if line.strip()]
+
+    enabled = option('--enable') or ''
+    information = 'all' in enabled or 'information' in enabled
+    build_dir = option('--cppcheck-build-dir')
+    stems = {}
+    reported = set()
+    errors = []
+    for number, unit in enumerate(units, 1):
+        print(f'Checking {unit} ...', flush=True)
+        paths = list(sources(unit, set()))
+        findings = None
+        if build_dir:
+            stem = os.path.splitext(os.path.basename(unit))[0]
+            stems[stem] = stems.get(stem, 0) + 1
+            info_file = os.path.join(build_dir, f'{stem}.a{stems[stem]}')
+            checksum = hashlib.sha256(b''.join(open(path, 'rb').read() for path in paths)).hexdigest()
+            try:
+                with open(info_file) as f:
+                    stored = f.read().split('\n')
+                if stored[0] == checksum:
+                    findings = [tuple(line.split('\t')) for line in stored[1:] if line]
+            except OSError:
+                pass
+        if findings is None:
+            findings = []
+            for path in paths:
+                with open(path) as f:
+                    lines = f.read().split('\n')
+                for line_number, text in enumerate(lines, 1):
+                    for delay in SLOW_RE.findall(text):
+                        time.sleep(float(delay))
+                    for issue_id in BUG_RE.findall(text):
+                        findings.append((path, str(line_number), issue_id))
+                    for include in INCLUDE_RE.findall(text):
+                        if information and not os.path.isfile(os.path.join(os.path.dirname(path), include)):
+                            findings.append((path, str(line_number), 'missingInclude'))
+            if build_dir:
+                with open(info_file, 'w') as f:
+                    f.write('\n'.join([checksum] + ['\t'.join(finding) for finding in findings]) + '\n')
+        for path, line_number, issue_id in findings:
+            key = (path, line_number, issue_id)
+            if key in reported:
+                continue
+            reported.add(key)
+            file0 = '' if issue_id == 'missingInclude' else f' file0={quoteattr(unit)}'
+            errors.append(
+                f'        <error id="{issue_id}" severity="warning" msg={quoteattr(issue_id + " here")}'
+                f' verbose=""{file0}>\n'
+                f'            <location file={quoteattr(path)} line="{line_number}" column="1"/>\n'
+                f'        </error>\n')
+        if len(units) > 1:
+            print(f'{number}/{len(units)} files checked {number * 100 // len(units)}% done', flush=True)
+
+    with open(option('--output-file'), 'w') as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n<results version="2">\n'
+                '    <cppcheck version="2.13.0"/>\n    <errors>\n')
+        f.write(''.join(errors))
+        if information:
+            f.write('        <error id="checkersReport" severity="information" msg="Active checkers: 1/1"'
+                    ' verbose="Active checkers: 1/1"/>\n')
+        f.write('    </errors>\n</results>\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Tests for the managed cppcheck build directory
+"""
+
+import unittest
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'legacy' / 'lib'))
+
+from builddir import BuildDirCache, cache_root
+from engine import find_translation_units, run_analysis
+
+FAKE_CPPCHECK = str(Path(__file__).parent / 'fixtures' / 'fake_cppcheck.py')
+
+
+class TestBuildDirCache(unittest.TestCase):
+    """Test seeding, harvesting and reuse across runs"""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.src = os.path.join(self.test_dir, 'src')
+        os.makedirs(self.src)
+        for n in range(4):
+            Path(self.src, f'f{n}.cpp').write_text(f'int f{n}; // BUG:issue{n} SLOW:0.1\n')
+        self.root = os.path.join(self.test_dir, 'store')
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def analyze(self, jobs=2):
+        build_cache = BuildDirCache(self.test_dir, 'cpp17', ['--enable=all'], root=self.root)
+        run = run_analysis(find_translation_units(self.src), ['--enable=all'], os.path.join(self.test_dir, 'work'),
+                           jobs, cppcheck=FAKE_CPPCHECK, build_cache=build_cache)
+        self.assertEqual(run.errors, [])
+        return run, build_cache
+
+    def test_reuse_across_runs(self):
+        first, cache = self.analyze()
+        self.assertEqual((cache.hits, cache.misses), (0, 4))
+        self.assertEqual(len(os.listdir(cache.directory)), 4)
+
+        second, cache = self.analyze(jobs=1)
+        self.assertEqual((cache.hits, cache.misses), (4, 0))
+        self.assertEqual(second.issues, first.issues)
+        # reused units skip their SLOW delay
+        self.assertLess(second.seconds, first.seconds)
+
+    def test_changed_unit_is_analyzed_and_stored(self):
+        self.analyze()
+        Path(self.src, 'f2.cpp').write_text('int f2; // BUG:changed\n')
+        run, cache = self.analyze()
+        self.assertEqual((cache.hits, cache.misses), (3, 1))
+        self.assertIn('changed', [issue['id'] for issue in run.issues])
+        _, cache = self.analyze()
+        self.assertEqual((cache.hits, cache.misses), (4, 0))
+
+    def test_clashing_stems_are_not_managed(self):
+        cache = BuildDirCache(self.test_dir, 'cpp17', [], root=self.root)
+        units = ['a/util.cpp', 'b/util.cpp', 'b/util.c', 'main.cpp']
+        self.assertEqual(cache.managed(units), ['main.cpp'])
+
+    def test_stores_are_per_repo_and_profile(self):
+        a = BuildDirCache(self.test_dir, 'cpp17', [], root=self.root)
+        self.assertEqual(a.directory, BuildDirCache(self.test_dir, 'cpp17', [], root=self.root).directory)
+        self.assertNotEqual(a.directory, BuildDirCache(self.test_dir, 'quick', [], root=self.root).directory)
+        self.assertNotEqual(a.directory, BuildDirCache(self.src, 'cpp17', [], root=self.root).directory)
+
+    def test_prune(self):
+        cache = BuildDirCache(self.test_dir, 'cpp17', [], root=self.root)
+        other = os.path.join(self.root, 'other-store')
+        os.makedirs(cache.directory)
+        os.makedirs(other)
+        now = time.time()
+        files = {'old.a1': 40 * 86400, 'lru.a1': 300, 'mid.a1': 200, 'new.a1': 100}
+        for name, age in files.items():
+            path = os.path.join(other if name == 'old.a1' else cache.directory, name)
+            Path(path).write_bytes(b'x' * 100)
+            os.utime(path, (now - age, now - age))
+        cache.prune(max_bytes=250)
+        self.assertEqual(sorted(os.listdir(cache.directory)), ['mid.a1', 'new.a1'])
+        self.assertFalse(os.path.exists(other))
+
+    def test_cache_root(self):
+        with mock.patch.dict(os.environ, {'XDG_CACHE_HOME': '/xdg'}):
+            self.assertEqual(cache_root(), '/xdg/cppcheck-studio/build')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Tests for the columnar dashboard data layout
+"""
+
+import unittest
+import json
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'generate'))
+
+from columnar import COLUMNAR_JS, HEIGHT_INDEX_JS, ColumnarIssues, PathTrie, content_hash, decode_lines, fill_template, load_issues, script_json, split_message
+
+
+class TestColumnarIssues(unittest.TestCase):
+    """Test dictionary encoding and block layout"""
+
+    def setUp(self):
+        self.issues = [
+            {"id": "uninitvar", "severity": "error", "message": "Uninitialized variable: x",
+             "file": "src/a.cpp", "line": 10},
+            {"id": "unreadVariable", "severity": "style", "message": "Variable 'y' is assigned a value that is never used.",
+             "file": "src/a.cpp", "line": "20", "column": 3},
+            {"id": "uninitvar", "severity": "error", "message": "Uninitialized variable: z",
+             "file": "src/b.cpp", "line": 5, "context": {"line": "int z;"}},
+        ]
+
+    def test_dictionaries_hold_unique_values(self):
+        columnar = ColumnarIssues(self.issues)
+        header = columnar.header()
+        self.assertEqual(header['count'], 3)
+        self.assertEqual(header['paths'], {'parent': [-1, 0, 0], 'segment': ['src', 'a.cpp', 'b.cpp']})
+        self.assertEqual(header['dicts']['severity'], ['error', 'style'])
+        self.assertEqual(header['dicts']['id'], ['uninitvar', 'unreadVariable'])
+
+    def test_rows_round_trip(self):
+        columnar = ColumnarIssues(self.issues)
+        header = columnar.header()
+        block = next(columnar.blocks())
+        file_paths = columnar.paths.paths()
+        for row, issue in enumerate(self.issues):
+            self.assertEqual(file_paths[block['file'][row]], issue['file'])
+            self.assertEqual(header['dicts']['severity'][block['severity'][row]], issue['severity'])
+            self.assertEqual(header['dicts']['id'][block['id'][row]], issue['id'])
+            self.assertEqual(block['line'][row], int(issue['line']))
+            template = header['templates'][block['template'][row]]
+            self.assertEqual(fill_template(template, block['params'][row]), issue['message'])
+        self.assertEqual(block['column'], [0, 3, 0])
+
+    def test_unknown_fields_kept_as_extras(self):
+        block = next(ColumnarIssues(self.issues).blocks())
+        self.assertEqual(block['extras'], [[2, {"context": {"line": "int z;"}}]])
+
+    def test_blocks_split_rows(self):
+        blocks = list(ColumnarIssues(self.issues).blocks(block_size=2))
+        self.assertEqual([b['start'] for b in blocks], [0, 2])
+        self.assertEqual(len(blocks[1]['file']), 1)
+        self.assertNotIn('extras', blocks[0])
+        self.assertEqual(blocks[1]['extras'][0][0], 2)
+
+    def test_lines_are_script_safe(self):
+        issues = [{"id": "x", "severity": "style", "message": "</script><b>", "file": "a.cpp", "line": 1}]
+        lines = list(ColumnarIssues(issues).lines())
+        self.assertEqual(len(lines), 2)
+        self.assertNotIn('</script>', lines[1])
+        self.assertEqual(json.loads(lines[0])['templates'], [["</script><b>"]])
+        self.assertEqual(json.loads(script_json("<")), "<")
+
+    def test_content_hash(self):
+        self.assertEqual(content_hash('a', 'b'), content_hash('a', 'b'))
+        self.assertNotEqual(content_hash('ab', ''), content_hash('a', 'b'))
+        self.assertEqual(len(content_hash('')), 32)
+
+    def test_empty_input(self):
+        columnar = ColumnarIssues([])
+        self.assertEqual(list(columnar.blocks()), [])
+        self.assertEqual(len(list(columnar.lines())), 1)
+
+
+class TestPathTrie(unittest.TestCase):
+    """Test path trie encoding and directory rollups"""
+
+    def test_shared_prefixes_stored_once(self):
+        trie = PathTrie()
+        a = trie.add('/home/user/lpz/selforg/agent.h')
+        b = trie.add('/home/user/lpz/selforg/matrix.h')
+        c = trie.add('/home/user/lpz/ode_robots/robot.cpp')
+        self.assertEqual(len(trie.segments), 9)
+        paths = trie.paths()
+        self.assertEqual(paths[a], '/home/user/lpz/selforg/agent.h')
+        self.assertEqual(paths[b], '/home/user/lpz/selforg/matrix.h')
+        self.assertEqual(paths[c], '/home/user/lpz/ode_robots/robot.cpp')
+        self.assertEqual(trie.add('/home/user/lpz/selforg/agent.h'), a)
+
+    def test_relative_and_empty_paths(self):
+        trie = PathTrie()
+        nodes = [trie.add(p) for p in ['a.cpp', 'src/a.cpp', '', 'src/']]
+        self.assertEqual([trie.paths()[n] for n in nodes], ['a.cpp', 'src/a.cpp', '', 'src/'])
+
+    def test_rollup(self):
+        trie = PathTrie()
+        a = trie.add('src/core/a.cpp')
+        b = trie.add('src/core/b.cpp')
+        c = trie.add('src/ui/c.cpp')
+        counts = [0] * len(trie.segments)
+        counts[a], counts[b], counts[c] = 2, 3, 4
+        totals = trie.rollup(counts)
+        paths = trie.paths()
+        self.assertEqual(totals[paths.index('src')], 9)
+        self.assertEqual(totals[paths.index('src/core')], 5)
+        self.assertEqual(totals[paths.index('src/ui')], 4)
+
+    def test_json_round_trip(self):
+        trie = PathTrie()
+        trie.add('x/y.cpp')
+        self.assertEqual(PathTrie.from_json(trie.to_json()).paths(), trie.paths())
+
+
+class TestMessageTemplates(unittest.TestCase):
+    """Test message template extraction"""
+
+    def test_split_message(self):
+        self.assertEqual(split_message("Variable 'x' is assigned a value that is never used."),
+                         (["Variable '", "' is assigned a value that is never used."], ['x']))
+        self.assertEqual(split_message("Uninitialized variable: x"),
+                         (["Uninitialized variable: ", ""], ['x']))
+        self.assertEqual(split_message("Class 'Agent' has a constructor with 1 argument that is not explicit."),
+                         (["Class '", "' has a constructor with ", " argument that is not explicit."], ['Agent', '1']))
+        self.assertEqual(split_message("No parameters here."), (["No parameters here."], []))
+
+    def test_messages_share_templates(self):
+        issues = [
+            {"id": "unreadVariable", "severity": "style", "file": "a.cpp", "line": i,
+             "message": f"Variable 'v{i}' is assigned a value that is never used."}
+            for i in range(50)
+        ]
+        columnar = ColumnarIssues(issues)
+        self.assertEqual(len(columnar.templates), 1)
+        self.assertEqual(columnar.params[7], ['v7'])
+
+    def test_decode_lines_round_trip(self):
+        issues = [
+            {"id": "uninitvar", "severity": "error", "message": "Uninitialized variable: x",
+             "file": "a.cpp", "line": 3, "column": 7},
+            {"id": "cstyleCast", "severity": "style", "message": "C-style pointer casting",
+             "file": "b.cpp", "line": 9, "additional_locations": [{"file": "c.h", "line": 1}]},
+        ]
+        self.assertEqual(list(decode_lines(ColumnarIssues(issues).lines(block_size=1))), issues)
+
+    def test_load_issues(self):
+        issues = [{"id": "uninitvar", "severity": "error", "message": "Uninitialized variable: x",
+                   "file": "a.cpp", "line": 3}]
+        with tempfile.TemporaryDirectory() as directory:
+            analysis = Path(directory) / 'analysis.json'
+            analysis.write_text(json.dumps({'issues': issues}))
+            columnar = Path(directory) / 'issues.jsonl'
+            columnar.write_text('\n'.join(ColumnarIssues(issues).lines()) + '\n')
+            self.assertEqual(load_issues(str(analysis)), issues)
+            self.assertEqual(load_issues(str(columnar)), issues)
+
+
+
+@unittest.skipUnless(shutil.which('node'), 'node is not installed')
+class TestHeightIndex(unittest.TestCase):
+    """Test the dashboards' Fenwick tree of row heights under node"""
+
+    def run_js(self, body):
+        script = HEIGHT_INDEX_JS + body
+        result = subprocess.run(['node', '-e', script], capture_output=True, text=True, check=True)
+        return json.loads(result.stdout)
+
+    def test_repeated_resets(self):
+        totals = self.run_js('''
+            const index = new HeightIndex();
+            const totals = [];
+            for (let n = 0; n < 3; n++) {
+                index.reset(10, () => 50);
+                totals.push(index.total());
+            }
+            index.reset(10, i => (i % 2 ? 80 : 50));
+            totals.push(index.total(), index.offsetOf(3), index.indexAt(130), index.indexAt(129));
+            index.reset(4, () => 10);
+            totals.push(index.total(), index.indexAt(1000));
+            console.log(JSON.stringify(totals));
+        ''')
+        self.assertEqual(totals, [500, 500, 500, 650, 180, 2, 1, 40, 3])
+
+    def test_append_and_set_after_reset(self):
+        totals = self.run_js('''
+            const index = new HeightIndex();
+            index.reset(3, () => 20);
+            index.append(6, () => 30);
+            index.set(0, 100);
+            const heights = [100, 20, 20, 30, 30, 30];
+            const offsets = heights.map((_, i) => index.offsetOf(i));
+            index.reset(6, () => 20);
+            console.log(JSON.stringify([index.total(), offsets, index.total() === 6 * 20]));
+        ''')
+        self.assertEqual(totals, [120, [0, 100, 120, 140, 170, 200], True])
+
+
+@unittest.skipUnless(shutil.which('node'), 'node is not installed')
+class TestSplitLines(unittest.TestCase):
+    """Test the sliced line splitter of the embedded data under node"""
+
+    def test_lines_across_steps(self):
+        script = COLUMNAR_JS + '''
+            const text = '\\n a\\n\\nbcd\\nef\\n\\n' + 'x'.repeat(50) + '\\nlast';
+            Promise.all([1, 7, 100, 1 << 20].map(chunk => splitLinesInSlices(text, chunk)))
+                .then(results => console.log(JSON.stringify(results)));
+        '''
+        result = subprocess.run(['node', '-e', script], capture_output=True, text=True, check=True)
+        for lines in json.loads(result.stdout):
+            self.assertEqual(lines, [' a', 'bcd', 'ef', 'x' * 50, 'last'])
+
+
+if __name__ == '__main__':
+    unittest.main()
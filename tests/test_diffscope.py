@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Tests for git-diff scoped analysis
+"""
+
+import unittest
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'legacy' / 'lib'))
+
+from diffscope import DiffScope, HunkIndex, parse_diff, unquote
+from engine import find_translation_units
+from includes import IncludeScanner
+
+DIFF = '''diff --git a/src/a.cpp b/src/a.cpp
+index 1111111..2222222 100644
+--- a/src/a.cpp
++++ b/src/a.cpp
+@@ -3 +3,2 @@ int main()
+-int x;
++int y;
++++ looks like a header
+@@ -10,2 +10,0 @@
+-gone();
+-gone();
+@@ -20 +19 @@
+-a
++b
+diff --git a/old.h b/old.h
+deleted file mode 100644
+--- a/old.h
++++ /dev/null
+@@ -1 +0,0 @@
+-int old;
+diff --git "a/sp ace\\303\\251.h" "b/sp ace\\303\\251.h"
+--- "a/sp ace\\303\\251.h"
++++ "b/sp ace\\303\\251.h"
+@@ -1,0 +2 @@
++int added;
+'''
+
+
+def git(cwd, *args):
+    subprocess.run(['git', '-c', 'user.name=test', '-c', 'user.email=test@example.com'] + list(args),
+                   cwd=cwd, check=True, capture_output=True)
+
+
+class TestDiffParsing(unittest.TestCase):
+    """Test hunk parsing and the interval index"""
+
+    def test_parse_diff(self):
+        hunks = parse_diff(DIFF)
+        self.assertEqual(hunks, {
+            'src/a.cpp': [(3, 4), (10, 11), (19, 19)],
+            'sp aceé.h': [(2, 2)]
+        })
+
+    def test_unquote(self):
+        self.assertEqual(unquote('"b/tab\\there\\\\"'), 'b/tab\there\\')
+        self.assertEqual(unquote('b/plain.c'), 'b/plain.c')
+
+    def test_hunk_index(self):
+        index = HunkIndex({'a.cpp': [(20, 25), (3, 4), (5, 5), (10, 12), (11, 15)], 'b.h': []})
+        self.assertEqual(index.starts['a.cpp'], [3, 10, 20])
+        self.assertEqual(index.ends['a.cpp'], [5, 15, 25])
+        changed = [line for line in range(30) if index.changed('a.cpp', line)]
+        self.assertEqual(changed, [0, 3, 4, 5] + list(range(10, 16)) + list(range(20, 26)))
+        self.assertFalse(index.changed('b.h', 1))
+        self.assertTrue(index.changed('b.h', 0))
+        self.assertFalse(index.changed('c.cpp', 0))
+
+
+class TestDiffScope(unittest.TestCase):
+    """Test unit selection and issue filtering in a real repository"""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.files = {
+            'src/util.h': 'int util;\n',
+            'src/a.cpp': '#include "util.h"\nint a;\n',
+            'src/b.cpp': 'int b1;\nint b2;\nint b3;\n',
+            'src/c.cpp': 'int c;\n'
+        }
+        for name, text in self.files.items():
+            path = Path(self.test_dir, name)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(text)
+        git(self.test_dir, 'init', '-q')
+        git(self.test_dir, 'add', '.')
+        git(self.test_dir, 'commit', '-q', '-m', 'base')
+        self.src = os.path.join(self.test_dir, 'src')
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def path(self, name):
+        return os.path.join(self.test_dir, name)
+
+    def issue(self, name, line):
+        return {'file': self.path(name), 'line': line, 'column': 1, 'severity': 'style', 'message': 'm', 'id': 'x'}
+
+    def test_select_units(self):
+        Path(self.path('src/util.h')).write_text('int util;\nint more;\n')
+        Path(self.path('src/b.cpp')).write_text('int b1;\nint changed;\nint b3;\n')
+        Path(self.path('src/new.cpp')).write_text('int n;\n')
+        scope = DiffScope('HEAD', self.src)
+        units = scope.select_units(find_translation_units(self.src), IncludeScanner())
+        self.assertEqual([os.path.basename(unit) for unit in units], ['a.cpp', 'b.cpp', 'new.cpp'])
+
+        issues = [self.issue('src/util.h', 1), self.issue('src/util.h', 2), self.issue('src/b.cpp', 2),
+                  self.issue('src/b.cpp', 3), self.issue('src/a.cpp', 1), self.issue('src/new.cpp', 1),
+                  self.issue('src/b.cpp', 0)]
+        kept = scope.filter_issues(issues)
+        self.assertEqual([(os.path.basename(issue['file']), issue['line']) for issue in kept],
+                         [('util.h', 2), ('b.cpp', 2), ('new.cpp', 1), ('b.cpp', 0)])
+
+    def test_committed_changes_since_ref(self):
+        Path(self.path('src/c.cpp')).write_text('int c;\nint c2;\n')
+        git(self.test_dir, 'commit', '-q', '-am', 'change c')
+        scope = DiffScope('HEAD~1', self.src)
+        self.assertEqual(scope.changed_files(), [os.path.realpath(self.path('src/c.cpp'))])
+        self.assertEqual(scope.filter_issues([self.issue('src/c.cpp', 1), self.issue('src/c.cpp', 2)]),
+                         [self.issue('src/c.cpp', 2)])
+
+    def test_bad_ref(self):
+        with self.assertRaises(ValueError):
+            DiffScope('no-such-ref', self.src)
+
+
+if __name__ == '__main__':
+    unittest.main()
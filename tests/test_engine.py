@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Tests for the sharded analysis engine
+"""
+
+import unittest
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'legacy' / 'lib'))
+
+from engine import (enabled_whole_program_checks, find_translation_units, merge_issues, parse_results_xml,
+                    run_analysis, split_shards, whole_program_options)
+
+FAKE_CPPCHECK = str(Path(__file__).parent / 'fixtures' / 'fake_cppcheck.py')
+
+
+def make_project(root, files):
+    for name, text in files.items():
+        path = Path(root) / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+
+
+class TestSharding(unittest.TestCase):
+    """Test translation unit discovery and shard splitting"""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_find_translation_units(self):
+        make_project(self.test_dir, {
+            'src/b.cpp': '', 'src/a.c': '', 'src/a.h': '', 'lib/x.cc': '',
+            '.git/hooks/skip.cpp': '', '.cppcheck-studio/skip.cpp': ''
+        })
+        units = find_translation_units(self.test_dir)
+        self.assertEqual([os.path.relpath(unit, self.test_dir) for unit in units],
+                         ['lib/x.cc', 'src/a.c', 'src/b.cpp'])
+
+    def test_split_shards(self):
+        shards = split_shards(list(range(10)), 4)
+        self.assertEqual([len(shard) for shard in shards], [3, 3, 2, 2])
+        self.assertEqual(sum(shards, []), list(range(10)))
+        self.assertEqual(split_shards([1, 2], 8), [[1], [2]])
+        self.assertEqual(split_shards([], 4), [])
+
+
+class TestResults(unittest.TestCase):
+    """Test XML parsing and merging"""
+
+    def test_parse_results_xml(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.xml', delete=False) as f:
+            f.write('<?xml version="1.0"?><results version="2"><errors>'
+                    '<error id="nullPointer" severity="error" msg="Null &lt;p&gt;" file0="src/a.cpp">'
+                    '<location file="src/a.h" line="3" column="7"/><location file="src/a.cpp" line="9"/></error>'
+                    '<error id="toomanyconfigs" severity="information" msg="Too many"/>'
+                    '</errors></results>')
+        try:
+            results = parse_results_xml(f.name)
+        finally:
+            os.unlink(f.name)
+        self.assertEqual(results[0], ({'file': 'src/a.h', 'line': 3, 'column': 7, 'severity': 'error',
+                                       'message': 'Null <p>', 'id': 'nullPointer'}, 'src/a.cpp'))
+        self.assertEqual(results[1][0]['file'], '')
+        self.assertIsNone(results[1][1])
+
+    def test_merge_issues(self):
+        a = {'file': 'b.cpp', 'line': 2, 'column': 1, 'severity': 'style', 'message': 'm', 'id': 'x'}
+        b = {'file': 'a.h', 'line': 5, 'column': 1, 'severity': 'style', 'message': 'm', 'id': 'x'}
+        self.assertEqual(merge_issues([[a, b], [dict(b)]]), [b, a])
+
+
+class TestRunAnalysis(unittest.TestCase):
+    """Test a sharded run against a fake cppcheck"""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        files = {'common.h': 'int shared; // BUG:headerIssue\n'}
+        for n in range(7):
+            files[f'src/f{n}.cpp'] = f'#include "../common.h"\nint f{n}; // BUG:issue{n}\n'
+        files['src/unused.cpp'] = 'void never(); // BUG:unusedFunction\n'
+        make_project(self.test_dir, files)
+        self.units = find_translation_units(self.test_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def analyze(self, jobs, options=()):
+        checked = []
+        run = run_analysis(self.units, options, os.path.join(self.test_dir, 'work'), jobs,
+                           cppcheck=FAKE_CPPCHECK, on_file=lambda: checked.append(1))
+        self.assertEqual(len(checked), len(self.units))
+        self.assertEqual(run.errors, [])
+        return run
+
+    def test_results_do_not_depend_on_sharding(self):
+        single = self.analyze(1)
+        sharded = self.analyze(3)
+        self.assertEqual(len(sharded.shards), len(self.units))
+        ids = [issue['id'] for issue in sharded.issues]
+        # the header issue is reported once; unusedFunction is dropped when sharded
+        self.assertEqual(ids.count('headerIssue'), 1)
+        self.assertNotIn('unusedFunction', ids)
+        self.assertEqual([issue for issue in single.issues if issue['id'] != 'unusedFunction'], sharded.issues)
+
+    def test_single_job_keeps_whole_program_checks(self):
+        single = self.analyze(1, ['--enable=all'])
+        self.assertEqual(len(single.shards), 1)
+        self.assertIn('unusedFunction', [issue['id'] for issue in single.issues])
+        self.assertEqual(single.dropped_checks, [])
+
+        self.assertIsNone(single.whole_program)
+
+    def test_split_run_adds_whole_program_pass(self):
+        single = self.analyze(1, ['--enable=all'])
+        sharded = self.analyze(2, ['--enable=all'])
+        self.assertGreater(len(sharded.shards), 1)
+        self.assertEqual(sharded.whole_program.units, self.units)
+        self.assertEqual(sharded.dropped_checks, [])
+        self.assertEqual(sharded.issues, single.issues)
+        # not needed when no whole-program check is enabled
+        self.assertIsNone(self.analyze(2, ['--enable=style']).whole_program)
+
+    def test_whole_program_options(self):
+        self.assertEqual(whole_program_options(['--enable=all', '--std=c++17'], {'unusedFunction'}),
+                         ['--std=c++17', '--enable=unusedFunction'])
+
+    def test_enabled_whole_program_checks(self):
+        self.assertEqual(enabled_whole_program_checks(['--enable=all']), {'unusedFunction'})
+        self.assertEqual(enabled_whole_program_checks(['--enable=style,unusedFunction']), {'unusedFunction'})
+        self.assertEqual(enabled_whole_program_checks(['--enable=warning', '--std=c++17']), set())
+
+    def test_shard_files(self):
+        self.analyze(2)
+        work = Path(self.test_dir) / 'work'
+        self.assertTrue(list(work.glob('shard-*.xml')))
+        self.assertTrue(list(work.glob('shard-*.files')))
+
+
+if __name__ == '__main__':
+    unittest.main()
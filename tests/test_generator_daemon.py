@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Tests for the generator daemon
+"""
+
+import unittest
+import shutil
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'generate'))
+
+from generator_daemon import GeneratorClient, GeneratorDaemon
+
+FIXTURE = str(Path(__file__).parent / 'fixtures' / 'small.json')
+
+
+class TestGeneratorDaemon(unittest.TestCase):
+    """Test jobs sent over the daemon's socket"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.test_dir = Path(tempfile.mkdtemp())
+        cls.socket_path = str(cls.test_dir / 'generator.sock')
+        cls.daemon = GeneratorDaemon(cls.socket_path, workers=2)
+        cls.thread = threading.Thread(target=cls.daemon.serve_forever, daemon=True)
+        cls.thread.start()
+        while not Path(cls.socket_path).exists():
+            cls.thread.join(0.05)
+
+    @classmethod
+    def tearDownClass(cls):
+        client = GeneratorClient(cls.socket_path)
+        client.request({'command': 'stop'})
+        client.close()
+        cls.thread.join(10)
+        shutil.rmtree(cls.test_dir)
+
+    def setUp(self):
+        self.client = GeneratorClient(self.socket_path)
+
+    def tearDown(self):
+        self.client.close()
+
+    def test_generate(self):
+        output = self.test_dir / 'standalone.html'
+        result = self.client.generate('standalone', FIXTURE, str(output))
+        self.assertTrue(result['ok'], result.get('error'))
+        self.assertIn('<!DOCTYPE html>', output.read_text())
+        self.assertGreater(result['seconds'], 0)
+
+    def test_pipelined_jobs(self):
+        ids = [self.client.submit('production', FIXTURE, str(self.test_dir / f'p{n}.html')) for n in range(4)]
+        results = [self.client.receive() for _ in ids]
+        self.assertEqual(sorted(result['id'] for result in results), ids)
+        self.assertTrue(all(result['ok'] for result in results))
+        for n in range(4):
+            self.assertTrue((self.test_dir / f'p{n}.html').exists())
+
+    def test_errors_are_reported(self):
+        result = self.client.generate('nope', FIXTURE, str(self.test_dir / 'x.html'))
+        self.assertFalse(result['ok'])
+        self.assertIn('unknown generator type', result['error'])
+        result = self.client.generate('standalone', str(self.test_dir / 'missing.json'), str(self.test_dir / 'x.html'))
+        self.assertFalse(result['ok'])
+
+    def test_requests_must_be_objects(self):
+        for line in ('[1, 2]', '"stats"', 'not json'):
+            self.client.socket.sendall((line + '\n').encode('utf-8'))
+            self.assertFalse(self.client.receive()['ok'])
+        self.assertTrue(self.client.request({'command': 'stats'})['ok'])
+
+    def test_stalled_client_does_not_block_others(self):
+        # More replies than the socket buffers, never read, then a normal client
+        stalled = GeneratorClient(self.socket_path)
+        self.client.socket.settimeout(30)
+        try:
+            for n in range(3000):
+                stalled.submit('nope', FIXTURE, str(self.test_dir / 'x.html'))
+            result = self.client.generate('production', FIXTURE, str(self.test_dir / 'other.html'))
+            self.assertTrue(result['ok'], result.get('error'))
+        finally:
+            stalled.close()
+
+    def test_stats(self):
+        self.client.generate('production', FIXTURE, str(self.test_dir / 'stats.html'))
+        stats = self.client.request({'command': 'stats'})
+        self.assertEqual(stats['workers'], 2)
+        self.assertGreaterEqual(stats['jobs'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Tests for precomputed dashboard views
+"""
+
+import unittest
+import base64
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'generate'))
+
+from issue_views import (FACET_LIMIT, OTHER_VALUE, IssueViews, common_directory, encode_bitset, encode_row_array,
+                         encode_row_set, limit_facet, top_directory)
+
+
+class TestIssueViews(unittest.TestCase):
+    """Test sort permutations and severity bitsets"""
+
+    def setUp(self):
+        self.issues = [
+            {"id": "unusedFunction", "severity": "style", "file": "b.cpp", "line": 30},
+            {"id": "nullPointer", "severity": "error", "file": "a.cpp", "line": "12"},
+            {"id": "passedByValue", "severity": "performance", "file": "b.cpp", "line": 4},
+            {"id": "uninitvar", "severity": "error", "file": "b.cpp", "line": 10},
+            {"id": "unknownMacro", "severity": "custom", "file": "a.cpp", "line": 1},
+        ]
+        self.views = IssueViews(self.issues)
+
+    def test_orders_are_permutations(self):
+        for rows in self.views.orders.values():
+            self.assertEqual(sorted(rows), list(range(len(self.issues))))
+
+    def test_location_order(self):
+        self.assertEqual(self.views.orders['location'], [4, 1, 2, 3, 0])
+
+    def test_severity_order(self):
+        # errors first, unknown severities last, ties by file and line
+        self.assertEqual(self.views.orders['severity'], [1, 3, 2, 0, 4])
+
+    def test_check_order(self):
+        self.assertEqual(self.views.orders['check'], [1, 2, 3, 4, 0])
+
+    def test_file_count_order(self):
+        self.assertEqual(self.views.orders['fileCount'], [2, 3, 0, 4, 1])
+
+    def test_facets(self):
+        self.assertEqual(self.views.facets['severity']['error'], [1, 3])
+        self.assertEqual(self.views.facets['check']['uninitvar'], [3])
+        self.assertEqual(set(self.views.to_json()['facets']['severity']), {'style', 'error', 'performance', 'custom'})
+
+    def test_json_lines(self):
+        items = self.views.to_json_lines()
+        views = items[0]
+        self.assertEqual(views['orders'], {})
+        for item in items[1:]:
+            if item[0] == 'order':
+                views['orders'][item[1]] = item[2]
+            else:
+                views['facets'][item[1]][item[2]] = item[3]
+        self.assertEqual(views, self.views.to_json())
+
+    def test_many_unique_check_ids(self):
+        # issues without an id get one hashed id each
+        issues = [{"id": f"{n:08x}", "severity": "style", "file": "a.cpp", "line": n} for n in range(3000)]
+        issues += [{"id": "nullPointer", "severity": "error", "file": "b.cpp", "line": n} for n in range(50)]
+        views = IssueViews(issues)
+        self.assertEqual(len(views.facets['check']), 3001)
+        check = views.to_json()['facets']['check']
+        self.assertEqual(len(check), FACET_LIMIT)
+        self.assertIn('nullPointer', check)
+        self.assertIn(OTHER_VALUE, check)
+
+    def test_limit_facet(self):
+        values = {'a': [0, 4, 5], 'b': [1, 6], 'c': [2], 'd': [3]}
+        self.assertIs(limit_facet(values, 4), values)
+        self.assertEqual(limit_facet(values, 3), {'a': [0, 4, 5], 'b': [1, 6], OTHER_VALUE: [2, 3]})
+
+    def test_directory_facet_below_shared_prefix(self):
+        views = IssueViews([
+            {"id": "a", "severity": "style", "file": "/src/proj/core/a.cpp"},
+            {"id": "b", "severity": "style", "file": "/src/proj/ui/b.cpp"},
+            {"id": "c", "severity": "style", "file": "/src/proj/main.cpp"},
+        ])
+        self.assertEqual(views.facets['directory'], {'core/': [0], 'ui/': [1], './': [2]})
+
+
+class TestEncoding(unittest.TestCase):
+    """Test binary encodings of row arrays and bitsets"""
+
+    def test_row_array_width(self):
+        self.assertEqual(base64.b64decode(encode_row_array([1, 258], 300)), b'\x01\x00\x02\x01')
+        self.assertEqual(len(base64.b64decode(encode_row_array([70000], 70001))), 4)
+
+    def test_bitset(self):
+        self.assertEqual(base64.b64decode(encode_bitset([0, 3, 9], 10)), bytes([0b1001, 0b10, 0, 0]))
+        self.assertEqual(len(base64.b64decode(encode_bitset([], 33))), 8)
+
+    def test_row_set_picks_smaller_encoding(self):
+        self.assertIn('bits', encode_row_set(list(range(50)), 100))
+        self.assertIn('rows', encode_row_set([7], 1000))
+
+    def test_directories(self):
+        self.assertEqual(common_directory(['a/b/c.cpp', 'a/b/d/e.cpp']), 2)
+        self.assertEqual(common_directory(['x.cpp', 'a/y.cpp']), 0)
+        self.assertEqual(top_directory('a/b/d/e.cpp', 2), 'd/')
+        self.assertEqual(top_directory('a/b/c.cpp', 2), './')
+
+
+if __name__ == '__main__':
+    unittest.main()
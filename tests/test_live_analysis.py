@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Tests for the live analysis server
+"""
+
+import unittest
+import asyncio
+import json
+import shutil
+import sys
+import tempfile
+import textwrap
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'legacy' / 'lib'))
+
+from live import LiveAnalysis, parse_issue, parse_progress, start_server
+
+# Prints cppcheck-style progress on stdout and LIVE_TEMPLATE issues on stderr
+FAKE_CPPCHECK = textwrap.dedent('''
+    import sys, time
+    for n, name in enumerate(['a.cpp', 'b.cpp'], 1):
+        print(f'Checking src/{name} ...', flush=True)
+        sys.stderr.write(f'src/{name}\\t{n}\\t3\\terror\\tnullPointer\\tNull pointer\\tdereference\\n')
+        sys.stderr.flush()
+        print(f'{n}/2 files checked {n * 50}% done', flush=True)
+        time.sleep(0.05)
+    sys.stderr.write('cppcheck: some note\\n')
+''')
+
+
+def parse_events(text):
+    """(id, event, data) triples from an SSE body"""
+    events = []
+    for block in text.split('\n\n'):
+        fields = dict(line.split(': ', 1) for line in block.splitlines() if ': ' in line)
+        if 'event' in fields:
+            events.append((int(fields['id']), fields['event'], json.loads(fields['data'])))
+    return events
+
+
+class TestParsers(unittest.TestCase):
+    """Test parsing of cppcheck output lines"""
+
+    def test_issue(self):
+        issue = parse_issue('src/a.cpp\t12\t5\twarning\tuninitvar\tUninitialized variable: x\n')
+        self.assertEqual(issue, {'file': 'src/a.cpp', 'line': 12, 'column': 5, 'severity': 'warning',
+                                 'message': 'Uninitialized variable: x', 'id': 'uninitvar'})
+        self.assertEqual(parse_issue('a\t\t\tstyle\tid\tmsg\twith tab')['message'], 'msg\twith tab')
+        self.assertIsNone(parse_issue('cppcheck: error: could not find or open any of the paths given.'))
+
+    def test_progress(self):
+        self.assertEqual(parse_progress('Checking src/a.cpp ...\n'), {'file': 'src/a.cpp'})
+        self.assertEqual(parse_progress('Checking src/a.cpp: DEBUG=1...'), {'file': 'src/a.cpp'})
+        self.assertEqual(parse_progress('3/4 files checked 75% done'), {'checked': 3, 'total': 4, 'percent': 75})
+        self.assertIsNone(parse_progress('Active checkers: 100/500'))
+
+
+class TestLiveAnalysis(unittest.TestCase):
+    """Test a run against a fake cppcheck"""
+
+    def setUp(self):
+        self.test_dir = Path(tempfile.mkdtemp())
+        script = self.test_dir / 'fake_cppcheck.py'
+        script.write_text(FAKE_CPPCHECK)
+        self.cmd = [sys.executable, str(script)]
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_run_writes_results(self):
+        output = self.test_dir / 'analysis.json'
+        analysis = LiveAnalysis(self.cmd, str(output))
+        issues = asyncio.run(analysis.run())
+
+        self.assertEqual([issue['file'] for issue in issues], ['src/a.cpp', 'src/b.cpp'])
+        self.assertEqual(json.loads(output.read_text())['issues'], issues)
+        kinds = [kind for kind, _ in analysis.events]
+        self.assertEqual(kinds[0], 'start')
+        self.assertEqual(kinds[-1], 'done')
+        self.assertEqual(kinds.count('issue'), 2)
+        self.assertIn('log', kinds)
+        self.assertEqual(analysis.progress['percent'], 100)
+
+    def test_event_stream(self):
+        async def scenario():
+            analysis = LiveAnalysis(self.cmd)
+            server = await start_server(analysis, port=0)
+            port = server.sockets[0].getsockname()[1]
+
+            async def get(path, headers=''):
+                reader, writer = await asyncio.open_connection('127.0.0.1', port)
+                writer.write(f'GET {path} HTTP/1.1\r\nHost: localhost\r\n{headers}\r\n'.encode())
+                body = (await reader.read()).decode()
+                writer.close()
+                return body
+
+            async with server:
+                # Connected before the run starts: receives every event live
+                live = asyncio.ensure_future(get('/events'))
+                await asyncio.sleep(0.05)
+                await analysis.run()
+                streamed = await live
+                resumed = await get('/events', 'Last-Event-ID: 2\r\n')
+                page = await get('/')
+            return streamed, resumed, page
+
+        streamed, resumed, page = asyncio.run(scenario())
+        self.assertIn('Content-Type: text/event-stream', streamed)
+        events = parse_events(streamed)
+        self.assertEqual([event_id for event_id, _, _ in events], list(range(len(events))))
+        self.assertEqual(events[-1][1], 'done')
+        self.assertEqual(events[-1][2]['total'], 2)
+        self.assertEqual(parse_events(resumed)[0][0], 3)
+        self.assertIn("new EventSource('/events')", page)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Tests for prerendered dashboard rows
+"""
+
+import unittest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'generate'))
+
+from prerender import PRERENDER_ROWS, placeholder_height, prerender_row, prerender_rows
+
+
+class TestPrerender(unittest.TestCase):
+    """Test the static first rows"""
+
+    def test_row_cells(self):
+        html = prerender_row(3, {"id": "nullPointer", "severity": "error", "file": "src/a.cpp",
+                                 "line": "12", "message": "Null <pointer> & co"}, True)
+        self.assertIn('data-row="3"', html)
+        self.assertIn('title="src/a.cpp"', html)
+        self.assertIn('<span>a.cpp</span>', html)
+        self.assertIn('<td class="line-cell">12</td>', html)
+        self.assertIn('<span class="severity-badge error">ERROR</span>', html)
+        self.assertIn('Null &lt;pointer&gt; &amp; co', html)
+        self.assertIn('action-btn has-code', html)
+        self.assertNotIn('display: none', html)
+
+    def test_missing_fields(self):
+        html = prerender_row(0, {}, False)
+        self.assertIn('<span>Unknown</span>', html)
+        self.assertIn('<td class="line-cell">-</td>', html)
+        self.assertIn('severity-badge unknown">UNKNOWN', html)
+        self.assertIn('<td class="id-cell">N/A</td>', html)
+        self.assertIn('code-indicator" style="display: none;"', html)
+
+    def test_non_string_fields(self):
+        html = prerender_row(0, {"id": 404, "severity": None, "file": None, "line": None, "message": 7}, False)
+        self.assertIn('data-id="404"', html)
+        self.assertIn('<td class="id-cell">404</td>', html)
+        self.assertIn('severity-badge unknown">UNKNOWN', html)
+        self.assertIn('<td class="message-cell">7</td>', html)
+
+    def test_no_whitespace_between_nodes(self):
+        self.assertNotIn('> <td', prerender_row(0, {"file": "a.cpp"}, False))
+        self.assertNotIn('\n', prerender_row(0, {"file": "a.cpp"}, False))
+
+    def test_first_rows_only(self):
+        issues = [{"id": str(i)} for i in range(PRERENDER_ROWS + 5)]
+        self.assertEqual(prerender_rows(issues).count('<tr '), PRERENDER_ROWS)
+        self.assertEqual(prerender_rows(issues[:2]).count('<tr '), 2)
+        self.assertEqual(placeholder_height(PRERENDER_ROWS + 5, 50), 250)
+        self.assertEqual(placeholder_height(3, 50), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Tests for the local query API
+"""
+
+import unittest
+import json
+import sys
+import threading
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'generate'))
+
+from query_api import IssueQueryIndex, QueryError, make_server, parse_query
+
+
+def make_issues():
+    return [
+        {"id": "nullPointer", "severity": "error", "file": "src/a.cpp", "line": 12, "message": "Null pointer dereference",
+         "code_context": {"lines": [{"number": 12, "content": "*p = 0;", "is_target": True}]}},
+        {"id": "unusedFunction", "severity": "style", "file": "src/b.cpp", "line": 30, "message": "Function never used"},
+        {"id": "uninitvar", "severity": "error", "file": "include/c.h", "line": 4, "message": "Uninitialized variable"},
+        {"id": "passedByValue", "severity": "performance", "file": "src/a.cpp", "line": 2, "message": "Pass by reference"},
+    ]
+
+
+class TestParseQuery(unittest.TestCase):
+    """Test query string parsing"""
+
+    def test_defaults(self):
+        self.assertEqual(parse_query(''), ((), 'default', 0, 100))
+
+    def test_filters_are_normalized(self):
+        filters, sort, offset, limit = parse_query('severity=style,error&q=Null&path=src/*&sort=location&offset=5&limit=10')
+        self.assertEqual(filters, (('path', 'src/*'), ('q', 'null'), ('severity', ('error', 'style'))))
+        self.assertEqual((sort, offset, limit), ('location', 5, 10))
+
+    def test_invalid_paging(self):
+        for query in ('offset=x', 'limit=0', 'limit=100000', 'offset=-1'):
+            with self.assertRaises(QueryError):
+                parse_query(query)
+
+
+class TestIssueQueryIndex(unittest.TestCase):
+    """Test filtering, paging and facet counts"""
+
+    def setUp(self):
+        self.index = IssueQueryIndex(make_issues())
+
+    def rows(self, query):
+        filters, sort, offset, limit = parse_query(query)
+        return [issue['row'] for issue in self.index.page(filters, sort, offset, limit)['issues']]
+
+    def test_filters(self):
+        self.assertEqual(self.rows('severity=error'), [0, 2])
+        self.assertEqual(self.rows('path=src/*.cpp'), [0, 1, 3])
+        self.assertEqual(self.rows('q=never'), [1])
+        self.assertEqual(self.rows('severity=error&path=*.h'), [2])
+        self.assertEqual(self.rows('id=missing'), [])
+
+    def test_sorted_pages(self):
+        self.assertEqual(self.rows('sort=location'), [2, 3, 0, 1])
+        self.assertEqual(self.rows('sort=location&offset=1&limit=2'), [3, 0])
+        with self.assertRaises(QueryError):
+            self.rows('sort=bogus')
+
+    def test_page_total(self):
+        page = self.index.page(parse_query('severity=error')[0], limit=1)
+        self.assertEqual(page['total'], 2)
+        self.assertEqual(len(page['issues']), 1)
+        self.assertNotIn('code_context', page['issues'][0])
+        self.assertTrue(page['issues'][0]['hasContext'])
+
+    def test_facet_counts_ignore_own_selection(self):
+        counts = self.index.facet_counts(parse_query('severity=error&path=src/*')[0])
+        # severity counts are against the path filter only
+        self.assertEqual(counts['facets']['severity'], {'error': 1, 'style': 1, 'performance': 1})
+        self.assertEqual(counts['facets']['check'], {'nullPointer': 1})
+        self.assertEqual(counts['total'], 1)
+
+    def test_context(self):
+        self.assertEqual(self.index.context(0)['lines'][0]['number'], 12)
+        self.assertIsNone(self.index.context(1))
+
+
+class TestQueryServer(unittest.TestCase):
+    """Test the HTTP endpoints"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = make_server(IssueQueryIndex(make_issues()), 0)
+        cls.base = f'http://127.0.0.1:{cls.server.server_address[1]}'
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def get(self, path):
+        try:
+            with urllib.request.urlopen(self.base + path) as response:
+                return response.status, json.loads(response.read())
+        except urllib.error.HTTPError as error:
+            return error.code, json.loads(error.read())
+
+    def test_issues(self):
+        status, body = self.get('/api/issues?severity=error&limit=1')
+        self.assertEqual(status, 200)
+        self.assertEqual(body['total'], 2)
+        self.assertEqual(body['issues'][0]['id'], 'nullPointer')
+
+    def test_summary_and_facets(self):
+        self.assertEqual(self.get('/api/summary')[1]['count'], 4)
+        self.assertEqual(self.get('/api/facets?q=pointer')[1]['total'], 1)
+
+    def test_context(self):
+        status, body = self.get('/api/issues/0/context')
+        self.assertEqual(status, 200)
+        self.assertEqual(body['code_context']['lines'][0]['content'], '*p = 0;')
+        self.assertEqual(self.get('/api/issues/1/context')[0], 404)
+
+    def test_errors(self):
+        self.assertEqual(self.get('/api/issues?limit=abc')[0], 400)
+        self.assertEqual(self.get('/api/nothing')[0], 404)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Tests for include scanning and the per-unit result cache
+"""
+
+import unittest
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'legacy' / 'lib'))
+
+from cache import ResultCache
+from engine import find_translation_units, run_analysis
+from includes import IncludeScanner, include_paths
+
+FAKE_CPPCHECK = str(Path(__file__).parent / 'fixtures' / 'fake_cppcheck.py')
+
+
+def make_project(root, files):
+    for name, text in files.items():
+        path = Path(root) / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+
+
+class TestIncludeScanner(unittest.TestCase):
+    """Test include resolution and content hashing"""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        make_project(self.test_dir, {
+            'src/a.cpp': '#include "a.h"\n#include <lib.h>\n#include <vector>\n',
+            'src/a.h': '  #  include "../common/base.h"\n',
+            'common/base.h': '#include "a.h" // not found next to base.h\n',
+            'include/lib.h': 'int lib;\n'
+        })
+        self.unit = os.path.join(self.test_dir, 'src', 'a.cpp')
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def path(self, name):
+        return os.path.normpath(os.path.join(self.test_dir, name))
+
+    def test_include_paths(self):
+        self.assertEqual(include_paths(['-Iinc', '-I', 'other', '--std=c++17', '-DX']), ['inc', 'other'])
+
+    def test_closure(self):
+        scanner = IncludeScanner([os.path.join(self.test_dir, 'include')])
+        self.assertEqual(scanner.closure(self.unit),
+                         {self.path('src/a.cpp'), self.path('src/a.h'), self.path('common/base.h'),
+                          self.path('include/lib.h')})
+        # without -I the angle include is a system header
+        self.assertNotIn(self.path('include/lib.h'), IncludeScanner().closure(self.unit))
+
+    def test_digest_follows_headers(self):
+        before = IncludeScanner().digest(self.unit, 'salt')
+        self.assertEqual(IncludeScanner().digest(self.unit, 'salt'), before)
+        self.assertNotEqual(IncludeScanner().digest(self.unit, 'other'), before)
+        Path(self.path('common/base.h')).write_text('int changed;\n')
+        self.assertNotEqual(IncludeScanner().digest(self.unit, 'salt'), before)
+
+    def test_creating_missing_header_changes_digest(self):
+        before = IncludeScanner().digest(self.unit, '')
+        Path(self.path('common/a.h')).write_text('')
+        self.assertNotEqual(IncludeScanner().digest(self.unit, ''), before)
+
+
+class TestResultCache(unittest.TestCase):
+    """Test that cached runs match full runs"""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        files = {'shared.h': 'int shared; // BUG:headerIssue\n'}
+        for n in range(5):
+            files[f'src/f{n}.cpp'] = f'#include "../shared.h"\nint f{n}; // BUG:issue{n}\n'
+        files['src/alone.cpp'] = 'int alone; // BUG:aloneIssue\n'
+        make_project(self.test_dir, files)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def path(self, name):
+        return os.path.normpath(os.path.join(self.test_dir, name))
+
+    def analyze(self, options=(), jobs=1, cached=True):
+        cache = ResultCache(os.path.join(self.test_dir, 'cache'), options, FAKE_CPPCHECK) if cached else None
+        run = run_analysis(find_translation_units(os.path.join(self.test_dir, 'src')), options,
+                           os.path.join(self.test_dir, 'work'), jobs, cppcheck=FAKE_CPPCHECK, cache=cache)
+        self.assertEqual(run.errors, [])
+        return run, cache
+
+    def assert_matches_full_run(self, run, options=()):
+        full, _ = self.analyze(options, cached=False)
+        self.assertEqual(run.issues, full.issues)
+
+    def test_unchanged_units_are_reused(self):
+        first, cache = self.analyze()
+        self.assertEqual((cache.hits, cache.misses), (0, 6))
+        second, cache = self.analyze()
+        self.assertEqual((cache.hits, cache.misses), (6, 0))
+        self.assertEqual(second.shards, [])
+        self.assertEqual(second.reused, 6)
+        self.assertEqual(second.issues, first.issues)
+
+    def test_only_dirty_units_run(self):
+        self.analyze(jobs=2)
+        Path(self.path('src/f3.cpp')).write_text('#include "../shared.h"\nint f3; // BUG:changed\n')
+        run, cache = self.analyze(jobs=2)
+        self.assertEqual([unit for shard in run.shards for unit in shard.units], [self.path('src/f3.cpp')])
+        self.assertIn('changed', [issue['id'] for issue in run.issues])
+        self.assert_matches_full_run(run)
+
+    def test_header_change_dirties_includers(self):
+        self.analyze()
+        Path(self.path('shared.h')).write_text('int shared; // BUG:newHeaderIssue\n')
+        run, cache = self.analyze()
+        self.assertEqual((cache.hits, cache.misses), (1, 5))
+        self.assert_matches_full_run(run)
+
+    def owners(self, cache, issue_id):
+        """Units whose records hold issue_id; the others including its header lack it"""
+        return [unit for unit, key in cache.index.items()
+                if issue_id in [issue['id'] for issue in cache.load(key)]]
+
+    def test_units_owning_header_issue_change(self):
+        _, cache = self.analyze()
+        owners = self.owners(cache, 'headerIssue')
+        self.assertLess(len(owners), 5)
+        for unit in owners:
+            Path(unit).write_text('int changed;\n')
+        run, cache = self.analyze()
+        self.assertEqual(cache.invalidated, 5 - len(owners))
+        self.assertIn('headerIssue', [issue['id'] for issue in run.issues])
+        self.assert_matches_full_run(run)
+
+    def test_units_owning_header_issue_removed(self):
+        _, cache = self.analyze()
+        owners = self.owners(cache, 'headerIssue')
+        for unit in owners:
+            os.unlink(unit)
+        run, cache = self.analyze()
+        self.assertEqual(cache.invalidated, 5 - len(owners))
+        self.assert_matches_full_run(run)
+        _, cache = self.analyze()
+        self.assertEqual(cache.misses, 0)
+
+    def test_other_owners_keep_header_issue(self):
+        # every unit in a shard of its own reports the header issue
+        _, cache = self.analyze(jobs=2)
+        owners = self.owners(cache, 'headerIssue')
+        self.assertGreater(len(owners), 1)
+        Path(owners[0]).write_text('int changed;\n')
+        run, cache = self.analyze(jobs=2)
+        self.assertEqual((cache.invalidated, cache.misses), (0, 1))
+        self.assert_matches_full_run(run)
+
+    def test_messages_without_file0(self):
+        # --enable=all adds missingInclude and checkersReport, neither with a file0
+        options = ['--enable=all']
+        Path(self.path('shared.h')).write_text('#include "gone.h"\nint shared; // BUG:headerIssue\n')
+        Path(self.path('src/alone.cpp')).write_text('#include "missing.h"\nint alone;\n')
+        first, cache = self.analyze(options)
+        ids = [issue['id'] for issue in first.issues]
+        self.assertEqual(ids.count('missingInclude'), 2)
+        self.assertEqual(ids.count('checkersReport'), 1)
+
+        second, cache = self.analyze(options)
+        self.assertEqual((cache.hits, cache.misses), (6, 0))
+        self.assertEqual(second.issues, first.issues)
+
+        Path(self.path('src/missing.h')).write_text('')
+        third, cache = self.analyze(options)
+        self.assertEqual((cache.hits, cache.misses), (5, 1))
+        self.assertEqual([issue['id'] for issue in third.issues].count('missingInclude'), 1)
+        self.assertIn('checkersReport', [issue['id'] for issue in third.issues])
+        self.assert_matches_full_run(third, options)
+
+    def test_whole_program_findings_are_reused(self):
+        options = ['--enable=style,unusedFunction']
+        Path(self.path('src/unused.cpp')).write_text('void never(); // BUG:unusedFunction\n')
+        first, _ = self.analyze(options)
+        self.assertIn('unusedFunction', [issue['id'] for issue in first.issues])
+
+        second, cache = self.analyze(options)
+        self.assertEqual((cache.hits, second.shards, second.whole_program), (7, [], None))
+        self.assertEqual(second.issues, first.issues)
+
+        Path(self.path('src/f1.cpp')).write_text('int f1;\n')
+        third, cache = self.analyze(options)
+        self.assertEqual(len(third.whole_program.units), 7)
+        self.assertEqual(third.dropped_checks, [])
+        self.assert_matches_full_run(third, options)
+
+        os.unlink(self.path('src/unused.cpp'))
+        fourth, cache = self.analyze(options)
+        self.assertIsNotNone(fourth.whole_program)
+        self.assertNotIn('unusedFunction', [issue['id'] for issue in fourth.issues])
+
+    def test_options_are_part_of_key(self):
+        self.analyze()
+        _, cache = self.analyze(options=['--std=c++17'])
+        self.assertEqual(cache.hits, 0)
+        _, cache = self.analyze()
+        self.assertEqual(cache.misses, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Tests for longest-first scheduling from timing history
+"""
+
+import unittest
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'legacy' / 'lib'))
+
+from engine import find_translation_units, run_analysis
+from schedule import TimingHistory, plan_shards
+
+FAKE_CPPCHECK = str(Path(__file__).parent / 'fixtures' / 'fake_cppcheck.py')
+
+
+class TestPlanShards(unittest.TestCase):
+    """Test longest-first bin packing"""
+
+    def test_longest_first(self):
+        predicted = {'a': 5, 'b': 4, 'c': 3, 'd': 3, 'e': 2, 'f': 1}
+        shards, loads = plan_shards(sorted(predicted), 2, predicted)
+        self.assertEqual(shards, [['a', 'd', 'f'], ['b', 'c', 'e']])
+        self.assertEqual(loads, [9, 9])
+        self.assertEqual(sorted(sum(shards, [])), sorted(predicted))
+
+    def test_startup_and_few_units(self):
+        shards, loads = plan_shards(['a', 'b'], 4, {'a': 1.0, 'b': 2.0}, startup=0.5)
+        self.assertEqual(shards, [['b'], ['a']])
+        self.assertEqual(loads, [2.5, 1.5])
+        self.assertEqual(plan_shards([], 2, {}), ([], []))
+
+
+class TestTimingHistory(unittest.TestCase):
+    """Test recording, smoothing and predicting durations"""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.test_dir, 'state', 'timings.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_round_trip_and_smoothing(self):
+        history = TimingHistory(self.path)
+        self.assertEqual(len(history), 0)
+        self.assertIsNone(history.predict(['a.cpp']))
+        history.record({'a.cpp': 2.0}, startup=0.2)
+        history.save()
+
+        history = TimingHistory(self.path)
+        history.record({'a.cpp': 4.0}, startup=0.4)
+        self.assertAlmostEqual(history.files['a.cpp'], 3.0)
+        self.assertAlmostEqual(history.startup, 0.3)
+
+    def test_unknown_files_predicted_from_size(self):
+        timed = os.path.join(self.test_dir, 'timed.cpp')
+        new = os.path.join(self.test_dir, 'new.cpp')
+        Path(timed).write_text('x' * 100)
+        Path(new).write_text('x' * 300)
+        history = TimingHistory(self.path)
+        history.record({timed: 1.0})
+        predicted = history.predict([timed, new])
+        self.assertAlmostEqual(predicted[timed], 1.0)
+        self.assertAlmostEqual(predicted[new], 3.0)
+
+    def test_corrupt_history_is_ignored(self):
+        os.makedirs(os.path.dirname(self.path))
+        Path(self.path).write_text('{not json')
+        self.assertEqual(len(TimingHistory(self.path)), 0)
+
+
+class TestScheduledRun(unittest.TestCase):
+    """Test that a second run is scheduled from the first run's timings"""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        for n in range(4):
+            delay = '// SLOW:0.3' if n == 0 else ''
+            Path(self.test_dir, f'f{n}.cpp').write_text(f'int f{n}; // BUG:issue{n} {delay}\n')
+        self.units = find_translation_units(self.test_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_second_run_uses_history(self):
+        history = TimingHistory(os.path.join(self.test_dir, 'timings.json'))
+        work = os.path.join(self.test_dir, 'work')
+        first = run_analysis(self.units, [], work, 2, cppcheck=FAKE_CPPCHECK, history=history)
+        self.assertIsNone(first.predicted)
+        self.assertEqual(sorted(history.files), self.units)
+        self.assertGreater(history.files[self.units[0]], 0.25)
+
+        second = run_analysis(self.units, [], work, 2, cppcheck=FAKE_CPPCHECK, history=history)
+        self.assertEqual(len(second.shards), 2)
+        # the slow file gets a process to itself
+        self.assertIn([self.units[0]], [shard.units for shard in second.shards])
+        self.assertGreater(second.predicted_makespan, 0.25)
+        self.assertEqual(first.issues, second.issues)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Tests for the trigram search index
+"""
+
+import unittest
+import base64
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'generate'))
+
+from search_index import TrigramIndex, decode_postings, encode_postings, trigrams
+
+
+class TestPostingEncoding(unittest.TestCase):
+    """Test delta + varint posting lists"""
+
+    def test_round_trip(self):
+        rows = [0, 1, 5, 127, 128, 300, 16384, 2 ** 21 + 7]
+        self.assertEqual(decode_postings(encode_postings(rows)), rows)
+
+    def test_small_gaps_take_one_byte(self):
+        self.assertEqual(len(encode_postings(list(range(100)))), 100)
+
+
+class TestTrigramIndex(unittest.TestCase):
+    """Test candidate lookup and serialization"""
+
+    def setUp(self):
+        self.issues = [
+            {"id": "uninitvar", "severity": "error", "file": "src/Agent.cpp", "line": 1,
+             "message": "Uninitialized variable: x"},
+            {"id": "shadowVariable", "severity": "style", "file": "src/matrix.h", "line": 2,
+             "message": "Local variable 'tmp' shadows outer variable"},
+            {"id": "constParameter", "severity": "style", "file": "lib/io.cpp", "line": 3,
+             "message": "Parameter 'buf' can be declared as pointer to const"},
+        ]
+
+    def test_trigrams(self):
+        self.assertEqual(trigrams('AbCd'), {'abc', 'bcd'})
+        self.assertEqual(trigrams('ab'), set())
+
+    def test_candidates_cover_matches(self):
+        index = TrigramIndex(self.issues, max_df=1.0)
+        self.assertEqual(index.candidates('agent'), [0])
+        self.assertEqual(index.candidates('SHADOW'), [1])
+        self.assertEqual(index.candidates("'buf'"), [2])
+        self.assertEqual(index.candidates('variable'), [0, 1])
+        self.assertEqual(index.candidates('nothing here'), [])
+        self.assertIsNone(index.candidates('ab'))
+
+    def test_common_grams_are_skipped(self):
+        index = TrigramIndex(self.issues, max_df=0.5)
+        self.assertIn('var', index.common)
+        self.assertNotIn('var', index.postings)
+        self.assertEqual(index.candidates('shadows'), [1])
+
+    def test_to_json(self):
+        data = TrigramIndex(self.issues, max_df=1.0).to_json()
+        postings = base64.b64decode(data['postings'])
+        self.assertEqual(len(data['offsets']), len(data['grams']) + 1)
+        gram = data['grams'].index('age')
+        self.assertEqual(decode_postings(postings[data['offsets'][gram]:data['offsets'][gram + 1]]), [0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Tests for the dashboard development server
+"""
+
+import unittest
+import importlib.util
+import gzip
+import json
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+SERVER_PATH = Path(__file__).parent.parent / 'legacy' / 'scripts' / 'python' / 'serve-dashboard.py'
+spec = importlib.util.spec_from_file_location('serve_dashboard', SERVER_PATH)
+serve_dashboard = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(serve_dashboard)
+
+
+class TestParseRange(unittest.TestCase):
+    """Test Range header parsing"""
+
+    def test_ranges(self):
+        self.assertIsNone(serve_dashboard.parse_range(None, 100))
+        self.assertIsNone(serve_dashboard.parse_range('bytes=0-1,5-6', 100))
+        self.assertEqual(serve_dashboard.parse_range('bytes=10-19', 100), (10, 19))
+        self.assertEqual(serve_dashboard.parse_range('bytes=90-', 100), (90, 99))
+        self.assertEqual(serve_dashboard.parse_range('bytes=90-500', 100), (90, 99))
+        self.assertEqual(serve_dashboard.parse_range('bytes=-5', 100), (95, 99))
+
+    def test_unsatisfiable(self):
+        for header in ('bytes=100-', 'bytes=20-10', 'bytes=-0'):
+            with self.assertRaises(ValueError):
+                serve_dashboard.parse_range(header, 100)
+
+
+class QuietHandler(serve_dashboard.CORSRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class TestJsonlRangeRequests(unittest.TestCase):
+    """Test serving byte ranges of JSONL files"""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.lines = [json.dumps({'row': i, 'code_context': {'line': f'int x{i};'}}) + '\n' for i in range(5)]
+        Path(self.test_dir, 'code_context.jsonl').write_text(''.join(self.lines))
+
+        self.httpd = serve_dashboard.make_server(0, self.test_dir, QuietHandler)
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        self.url = f'http://127.0.0.1:{self.httpd.server_address[1]}/code_context.jsonl'
+
+    def tearDown(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        shutil.rmtree(self.test_dir)
+
+    def fetch(self, url, range_header=None, headers=None, method='GET'):
+        request = urllib.request.Request(url, headers=headers or {}, method=method)
+        if range_header:
+            request.add_header('Range', range_header)
+        with urllib.request.urlopen(request) as response:
+            return response.status, dict(response.headers), response.read()
+
+    def test_full_file(self):
+        status, headers, body = self.fetch(self.url)
+        self.assertEqual(status, 200)
+        self.assertEqual(headers['Accept-Ranges'], 'bytes')
+        self.assertEqual(body.decode(), ''.join(self.lines))
+
+    def test_single_line_range(self):
+        start = len(''.join(self.lines[:2]))
+        end = start + len(self.lines[2]) - 1
+        status, headers, body = self.fetch(self.url, f'bytes={start}-{end}')
+        self.assertEqual(status, 206)
+        self.assertEqual(headers['Content-Range'], f'bytes {start}-{end}/{len("".join(self.lines))}')
+        self.assertEqual(json.loads(body)['row'], 2)
+
+    def test_unsatisfiable_range(self):
+        with self.assertRaises(urllib.error.HTTPError) as ctx:
+            self.fetch(self.url, 'bytes=100000-')
+        self.assertEqual(ctx.exception.code, 416)
+
+    def test_cache_headers(self):
+        Path(self.test_dir, 'views.0123456789.json').write_text('{}')
+        _, headers, _ = self.fetch(self.url.replace('code_context.jsonl', 'views.0123456789.json'))
+        self.assertIn('immutable', headers['Cache-Control'])
+        _, headers, _ = self.fetch(self.url)
+        self.assertEqual(headers['Cache-Control'], 'no-cache')
+
+    def test_revalidation(self):
+        _, headers, _ = self.fetch(self.url)
+        self.assertIn('Last-Modified', headers)
+        with self.assertRaises(urllib.error.HTTPError) as ctx:
+            self.fetch(self.url, headers={'If-None-Match': headers['ETag']})
+        self.assertEqual(ctx.exception.code, 304)
+        with self.assertRaises(urllib.error.HTTPError) as ctx:
+            self.fetch(self.url, headers={'If-Modified-Since': headers['Last-Modified']})
+        self.assertEqual(ctx.exception.code, 304)
+        status, _, _ = self.fetch(self.url, headers={'If-None-Match': '"stale"'})
+        self.assertEqual(status, 200)
+
+    def test_if_range_mismatch_sends_whole_file(self):
+        status, _, body = self.fetch(self.url, 'bytes=0-9', headers={'If-Range': '"stale"'})
+        self.assertEqual(status, 200)
+        self.assertEqual(body.decode(), ''.join(self.lines))
+
+    def test_precompressed_sibling(self):
+        path = Path(self.test_dir, 'code_context.jsonl')
+        Path(self.test_dir, 'code_context.jsonl.gz').write_bytes(gzip.compress(path.read_bytes()))
+
+        status, headers, body = self.fetch(self.url, headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(headers['Content-Encoding'], 'gzip')
+        self.assertEqual(headers['Content-type'], 'application/x-ndjson')
+        self.assertEqual(gzip.decompress(body).decode(), ''.join(self.lines))
+
+        _, headers, body = self.fetch(self.url, 'bytes=0-9', headers={'Accept-Encoding': 'gzip'})
+        self.assertNotIn('Content-Encoding', headers)
+        self.assertEqual(len(body), 10)
+
+        _, headers, _ = self.fetch(self.url, headers={'Accept-Encoding': 'gzip;q=0'})
+        self.assertNotIn('Content-Encoding', headers)
+
+    def test_stale_precompressed_sibling_is_ignored(self):
+        gz_path = Path(self.test_dir, 'code_context.jsonl.gz')
+        gz_path.write_bytes(gzip.compress(b'old'))
+        os.utime(gz_path, (0, 0))
+        _, headers, _ = self.fetch(self.url, headers={'Accept-Encoding': 'gzip'})
+        self.assertNotIn('Content-Encoding', headers)
+
+    def test_head(self):
+        status, headers, body = self.fetch(self.url, method='HEAD')
+        self.assertEqual(status, 200)
+        self.assertEqual(int(headers['Content-Length']), len(''.join(self.lines)))
+        self.assertEqual(body, b'')
+
+    def test_stalled_client_does_not_block_others(self):
+        with socket.create_connection(('127.0.0.1', self.httpd.server_address[1])) as stalled:
+            stalled.sendall(b'GET /code_context.jsonl HTTP/1.1\r\n')
+            status, _, _ = self.fetch(self.url)
+        self.assertEqual(status, 200)
+
+    def test_missing_file(self):
+        with self.assertRaises(urllib.error.HTTPError) as ctx:
+            self.fetch(self.url.replace('code_context', 'missing'))
+        self.assertEqual(ctx.exception.code, 404)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Tests for service worker support in multi-file dashboards
+"""
+
+import unittest
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'generate'))
+
+from service_worker import hashed_name, service_worker_name, version_file, write_service_worker
+
+
+class TestVersionedNames(unittest.TestCase):
+    """Test content-hashed file names"""
+
+    def setUp(self):
+        self.test_dir = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_hashed_name(self):
+        name = hashed_name('issues.jsonl', b'data')
+        self.assertRegex(name, r'^issues\.[0-9a-f]{10}\.jsonl$')
+        self.assertEqual(name, hashed_name('issues.jsonl', b'data'))
+        self.assertNotEqual(name, hashed_name('issues.jsonl', b'other'))
+        self.assertRegex(hashed_name('README', b''), r'^README\.[0-9a-f]{10}$')
+
+    def test_version_file_replaces_older_versions(self):
+        path = self.test_dir / 'views.json'
+        path.write_text('{"v": 1}')
+        first = version_file(path)
+        path.write_text('{"v": 2}')
+        second = version_file(path)
+
+        self.assertNotEqual(first, second)
+        self.assertFalse(path.exists())
+        self.assertFalse(first.exists())
+        self.assertEqual(second.read_text(), '{"v": 2}')
+
+    def test_version_file_keeps_other_files(self):
+        other = self.test_dir / 'views.extra.json'
+        other.write_text('{}')
+        path = self.test_dir / 'views.json'
+        path.write_text('{}')
+        version_file(path)
+        self.assertTrue(other.exists())
+
+
+class TestServiceWorker(unittest.TestCase):
+    """Test the generated service worker"""
+
+    def setUp(self):
+        self.test_dir = Path(tempfile.mkdtemp())
+        self.html = self.test_dir / 'dashboard.html'
+        self.html.write_text('<html></html>')
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_precache_list(self):
+        worker = write_service_worker(self.html, ['data/issues.0123456789.jsonl'])
+        self.assertEqual(worker.name, service_worker_name(self.html))
+        source = worker.read_text()
+        self.assertIn('"dashboard.html"', source)
+        self.assertIn('"data/issues.0123456789.jsonl"', source)
+
+    def test_cache_name_follows_shell(self):
+        before = write_service_worker(self.html, []).read_text()
+        self.html.write_text('<html>changed</html>')
+        after = write_service_worker(self.html, []).read_text()
+        self.assertNotEqual(before, after)
+
+
+if __name__ == '__main__':
+    unittest.main()